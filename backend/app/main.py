@@ -1,17 +1,29 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse
 from pathlib import Path
-from backend.app.routers import password
+from backend.app.routers import password, admin
+from backend.app.services.password_services import start_model_watcher, start_password_pool
 
 # --- CONFIGURATION CHEMINS ---
 BASE_DIR = Path(__file__).resolve().parents[2]
 STATIC_DIR = BASE_DIR / "frontend" / "static"
 TEMPLATES_DIR = BASE_DIR / "frontend" / "templates"
 
+# --- CYCLE DE VIE ---
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Rechargement à chaud des modèles si MODEL_WATCH_INTERVAL > 0
+    start_model_watcher()
+    # Réserve de mots de passe pré-validés pour /generate-password (PASSWORD_POOL_SIZE=0 pour désactiver)
+    start_password_pool()
+    yield
+
+
 # --- INITIALISATION API ---
-app = FastAPI(title="Cyber Sentry AI - Password Analyzer")
+app = FastAPI(title="Cyber Sentry AI - Password Analyzer", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -28,4 +40,5 @@ app.mount("/static", StaticFiles(directory=STATIC_DIR), name="static")
 def serve_index():
     return FileResponse(TEMPLATES_DIR / "index.html")
 
-app.include_router(password.router)
\ No newline at end of file
+app.include_router(password.router)
+app.include_router(admin.router)
\ No newline at end of file
@@ -1,5 +1,38 @@
-from pydantic import BaseModel
+from datetime import date
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
 
 class PasswordRequest(BaseModel):
     password: str
-    model_type: str = "rf"
\ No newline at end of file
+    model_type: str = "rf"
+    # False : score IA seul (zxcvbn n'est pas calculé)
+    include_zxcvbn: bool = True
+    # Budget (ms) accordé à zxcvbn ; au-delà le résultat est marqué "timeout". None = défaut serveur
+    zxcvbn_budget_ms: Optional[float] = Field(None, ge=0)
+
+
+class CompareRequest(BaseModel):
+    # Mêmes mots de passe évalués par plusieurs modèles : features, zxcvbn et entrée DL calculés une seule fois
+    passwords: List[str] = Field(..., min_length=1, max_length=64)
+    model_types: List[str] = Field(["rf"], min_length=1, max_length=8)
+    include_zxcvbn: bool = True
+    zxcvbn_budget_ms: Optional[float] = Field(None, ge=0)
+
+
+class TargetProfile(BaseModel):
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+    birth_date: Optional[date] = None
+    keyword: Optional[str] = None
+    zip_birth: Optional[str] = None
+    zip_home: Optional[str] = None
+    extra_tokens: List[str] = []
+
+
+class TargetedRequest(BaseModel):
+    profile: TargetProfile
+    # Un mot de passe ou une liste de candidats (évalués en un seul lot, 64 au plus comme /compare)
+    password: Optional[str] = None
+    passwords: List[str] = Field([], max_length=64)
+    model_type: str = "rf"
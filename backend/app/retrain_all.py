@@ -1,4 +1,4 @@
-import subprocess
+import argparse
 import sys
 import time
 from pathlib import Path
@@ -6,6 +6,13 @@ from pathlib import Path
 # --- CONFIGURATION DES CHEMINS ---
 # Ce script se trouve dans backend/app/
 APP_DIR = Path(__file__).resolve().parent
+sys.path.append(str(APP_DIR.parents[1]))
+
+from backend.app.utils.pipeline_profiler import (
+    DEFAULT_THRESHOLD, compare_runs, load_history, new_run_report, print_regressions, print_stage, run_stage,
+    save_run_report
+)
+
 UTILS_DIR = APP_DIR / "utils"
 SERVICES_DIR = APP_DIR / "services"
 
@@ -17,16 +24,21 @@ PIPELINE = [
     ("4. Entraînement ML Classique", SERVICES_DIR / "train_model.py"),
     ("5. Entraînement Deep Learning", SERVICES_DIR / "train_dl_models.py"),
     ("6. Entraînement Modèle Hybride", SERVICES_DIR / "train_hybrid.py"),
-    ("7. Audit Final", UTILS_DIR / "audit_datasets.py")
+    ("7. Estimateur d'Essais (PCFG)", SERVICES_DIR / "guess_estimator.py"),
+    ("8. Audit Final", UTILS_DIR / "audit_datasets.py"),
+    ("9. Publication dans le Registre", SERVICES_DIR / "model_registry.py")
 ]
 
 
-def run_pipeline():
+def run_pipeline(tracemalloc_enabled=False, threshold=DEFAULT_THRESHOLD):
     print("=" * 60)
     print(" 🚀 LANCEMENT DU PIPELINE D'ENTRAÎNEMENT COMPLET")
     print("=" * 60)
 
     start_time_global = time.time()
+    # Mesures de chaque étape (durée, CPU, pic RSS, sous-étapes), comparées au run précédent
+    previous = load_history()
+    report = new_run_report()
 
     for step_name, script_path in PIPELINE:
         print(f"\n⏳ ÉTAPE : {step_name}")
@@ -37,20 +49,27 @@ def run_pipeline():
             print(f"❌ ERREUR : Fichier introuvable ({script_path})")
             sys.exit(1)
 
-        start_time_step = time.time()
-
         # Exécution du script dans un sous-processus
-        result = subprocess.run([sys.executable, str(script_path)])
+        stage = run_stage(step_name, script_path, tracemalloc_enabled)
+        report["stages"].append(stage)
 
-        if result.returncode != 0:
+        if stage["returncode"] != 0:
             print(f"\n❌ ERREUR FATALE lors de l'étape : {step_name}")
             print("Arrêt du pipeline.")
-            sys.exit(result.returncode)
+            report["status"] = "failed"
+            save_run_report(report)
+            sys.exit(stage["returncode"])
 
-        step_duration = time.time() - start_time_step
-        print(f"✅ ÉTAPE TERMINÉE en {step_duration:.2f}s")
+        print(f"✅ ÉTAPE TERMINÉE en {stage['wall_seconds']:.2f}s")
+        print_stage(stage)
 
     total_duration = time.time() - start_time_global
+    report["status"] = "ok"
+    report["wall_seconds"] = round(total_duration, 3)
+    save_run_report(report)
+    last_ok = next((r for r in reversed(previous) if r.get("status") == "ok"), None)
+    if last_ok:
+        print_regressions(compare_runs(report, last_ok, threshold), threshold)
     print("\n" + "=" * 60)
     print(f" 🎉 PIPELINE TERMINÉ AVEC SUCCÈS EN {total_duration:.2f}s !")
     print(" Les modèles sont prêts dans backend/app/models/")
@@ -58,4 +77,10 @@ def run_pipeline():
 
 
 if __name__ == "__main__":
-    run_pipeline()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Pipeline d'entraînement complet (mesures dans benchmarks/pipeline/)")
+    parser.add_argument("--tracemalloc", action="store_true",
+                        help="Pic d'allocations Python par sous-étape (ralentit les étapes en Python pur)")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Écart toléré avec le run précédent avant de signaler une régression")
+    args = parser.parse_args()
+    run_pipeline(args.tracemalloc, args.threshold)
\ No newline at end of file
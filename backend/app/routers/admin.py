@@ -0,0 +1,78 @@
+import os
+import secrets
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Request
+from pydantic import BaseModel
+
+from backend.app.services import admission, password_services, profiling
+from backend.app.services.model_registry import list_versions, active_version
+
+# Jeton d'administration. S'il n'est pas défini, seules les requêtes locales sont acceptées.
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
+LOCAL_HOSTS = {"127.0.0.1", "::1", "localhost"}
+# Posés par un reverse proxy : derrière lui, tous les clients semblent venir de 127.0.0.1
+PROXY_HEADERS = ["x-forwarded-for", "forwarded", "x-real-ip"]
+
+
+def admin_error(request: Request, x_admin_token: Optional[str]):
+    """Motif du refus, ou None si la requête vient d'un administrateur."""
+    if ADMIN_TOKEN:
+        if not x_admin_token or not secrets.compare_digest(x_admin_token, ADMIN_TOKEN):
+            return "Jeton d'administration invalide"
+    elif not request.client or request.client.host not in LOCAL_HOSTS:
+        return "Administration réservée aux accès locaux"
+    elif any(h in request.headers for h in PROXY_HEADERS):
+        return "Requête relayée par un proxy : définir ADMIN_TOKEN"
+    return None
+
+
+def is_admin(request: Request, x_admin_token: Optional[str] = None):
+    return admin_error(request, x_admin_token) is None
+
+
+def require_admin(request: Request, x_admin_token: Optional[str] = Header(None)):
+    error = admin_error(request, x_admin_token)
+    if error:
+        raise HTTPException(status_code=403, detail=error)
+
+
+router = APIRouter(prefix="/admin", dependencies=[Depends(require_admin)])
+
+
+class ReloadRequest(BaseModel):
+    version: Optional[str] = None
+
+
+@router.get("/models")
+async def get_models():
+    return {
+        "active_version": password_services.active_bundle.version,
+        "registry_active": active_version(),
+        "versions": list_versions(),
+        "reload": password_services.reload_status,
+        "password_pool": password_services.password_pool.status(),
+        "zxcvbn": password_services.zxcvbn_guard.status(),
+        "compare": password_services.compare_flights.status(),
+        "admission": admission.controller.status(),
+        "model_pool": password_services.active_bundle.pool.status(),
+    }
+
+
+@router.get("/profiles")
+async def get_profiles():
+    return profiling.status() | {"profiles": profiling.list_profiles()}
+
+
+@router.get("/memory")
+async def get_memory():
+    return password_services.memory_report()
+
+
+@router.post("/models/reload", status_code=202)
+async def reload_models(data: ReloadRequest):
+    if data.version and data.version not in list_versions():
+        raise HTTPException(status_code=404, detail=f"Version inconnue : {data.version}")
+    if not password_services.reload_models_async(data.version):
+        raise HTTPException(status_code=409, detail="Un rechargement est déjà en cours")
+    return {"status": "loading", "target": data.version or active_version()}
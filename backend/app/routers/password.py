@@ -1,12 +1,137 @@
-from fastapi import APIRouter, Query
-from backend.app.models.password_models import PasswordRequest
+import asyncio
+import json
+import traceback
+from typing import Optional
+
+from fastapi import APIRouter, Header, HTTPException, Query, Request, Response, WebSocket, WebSocketDisconnect
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import PlainTextResponse
+from backend.app.models.password_models import CompareRequest, PasswordRequest, TargetedRequest
+from backend.app.routers.admin import is_admin
+from backend.app.services import password_services, profiling
+from backend.app.services.admission import Overloaded, controller as admission
 from backend.app.services.password_services import analyse_password, generate_secure_password
+from backend.app.services.osint_services import analyse_targeted
+from backend.app.services.live_scoring import LiveSession, score_snapshot, settled
 
 router = APIRouter()
 
+def overloaded(e):
+    return HTTPException(status_code=503, detail="Serveur surchargé, réessayez plus tard",
+                         headers={"Retry-After": str(e.retry_after)})
+
 @router.post("/test-password")
-async def test_password(data: PasswordRequest):
-    return analyse_password(data.password, data.model_type)
+async def test_password(data: PasswordRequest, request: Request, response: Response,
+                        x_profile: Optional[str] = Header(None), x_admin_token: Optional[str] = Header(None)):
+    # Profilage sur demande (en-tête X-Profile d'un admin) ou par tirage (PROFILE_SAMPLE_RATE)
+    profile_id = profiling.request_profile(bool(x_profile) and is_admin(request, x_admin_token), data.model_type)
+    # File bornée : sous pression le modèle est dégradé (hybrid -> rf -> math), file pleine -> 503 immédiat
+    try:
+        async with admission.admit(data.model_type) as model_type:
+            result = await run_in_threadpool(profiling.run, profile_id, analyse_password, data.password, model_type,
+                                             data.include_zxcvbn, data.zxcvbn_budget_ms)
+    except Overloaded as e:
+        raise overloaded(e)
+    if profile_id:
+        response.headers["X-Profile-Id"] = profile_id
+    # model_used = modèle effectivement utilisé ; model_requested permet de repérer une dégradation
+    return dict(result, model_requested=data.model_type)
+
+@router.post("/compare")
+async def compare_models(data: CompareRequest):
+    # Scores de chaque modèle côte à côte ; le calcul commun n'est fait qu'une fois par mot de passe
+    model_types = list(dict.fromkeys(data.model_types))
+    key = (tuple(data.passwords), tuple(model_types), data.include_zxcvbn, data.zxcvbn_budget_ms,
+           password_services.active_bundle.version)
+    # Pas de dégradation (la comparaison porte sur les modèles demandés), mais la file reste bornée
+    try:
+        async with admission.admit(model_types[0], degrade=False):
+            results = await password_services.compare_flights.run(key, password_services.analyse_models, data.passwords, model_types,
+                                                data.include_zxcvbn, data.zxcvbn_budget_ms)
+    except Overloaded as e:
+        raise overloaded(e)
+    return {"model_types": model_types, "results": results}
+
+@router.get("/range/{prefix5}", response_class=PlainTextResponse)
+async def breach_range(prefix5: str):
+    # k-anonymat (format HaveIBeenPwned) : le client n'envoie que 5 caractères du SHA-1 et compare lui-même
+    if len(prefix5) != 5 or any(c not in "0123456789abcdefABCDEF" for c in prefix5):
+        raise HTTPException(status_code=400, detail="Le préfixe doit contenir 5 caractères hexadécimaux")
+    index = password_services.breach_index
+    if index is None:
+        raise HTTPException(status_code=503, detail="Index des fuites non construit")
+    return "\r\n".join(f"{suffix}:{count}" for suffix, count in index.range(prefix5))
+
+@router.websocket("/ws/live-score")
+async def live_score(websocket: WebSocket):
+    # Messages client : {"value": "...", "seq": 12, "model_type": "rf"} (saisie complète, le serveur calcule le diff)
+    await websocket.accept()
+    session = LiveSession()
+    received = asyncio.Event()
+
+    async def scorer():
+        while True:
+            await received.wait()
+            received.clear()
+            if not session.apply_latest():
+                continue
+            await websocket.send_json(session.instant())
+            # On attend que la frappe se stabilise ; une nouvelle frappe relance la boucle
+            if not await settled(received):
+                continue
+            snapshot = session.snapshot()
+            if snapshot is None:
+                continue
+            result = await run_in_threadpool(score_snapshot, snapshot)
+            # Saisie modifiée pendant l'inférence : ce score est déjà périmé
+            if not received.is_set():
+                await websocket.send_json(result)
+
+    async def guarded_scorer():
+        # Sans ce garde-fou, une erreur tuerait la tâche en silence : le socket resterait ouvert sans plus rien noter
+        try:
+            await scorer()
+        except (asyncio.CancelledError, WebSocketDisconnect):
+            raise
+        except Exception:
+            traceback.print_exc()
+            try:
+                await websocket.send_json({"type": "error", "seq": session.seq,
+                                           "detail": "Erreur interne du score en direct"})
+                await websocket.close(code=1011)
+            except Exception:
+                pass
+
+    task = asyncio.create_task(guarded_scorer())
+    try:
+        while True:
+            try:
+                message = json.loads(await websocket.receive_text())
+            except ValueError:
+                await websocket.send_json({"type": "error", "seq": session.seq, "detail": "Message JSON invalide"})
+                continue
+            if isinstance(message, dict):
+                session.latest = message
+                received.set()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        task.cancel()
+
+@router.post("/targeted-attack")
+async def targeted_attack(data: TargetedRequest):
+    # Profil de la cible + un ou plusieurs mots de passe candidats
+    passwords = ([data.password] if data.password else []) + data.passwords
+    if not passwords:
+        raise HTTPException(status_code=422, detail="Aucun mot de passe à évaluer")
+    # Inférence du lot hors de la boucle d'événements, dans la file bornée (durée d'un lot : pas de dégradation)
+    try:
+        async with admission.admit(data.model_type, degrade=False):
+            results = await run_in_threadpool(analyse_targeted, data.profile.model_dump(), passwords,
+                                              data.model_type)
+    except Overloaded as e:
+        raise overloaded(e)
+    return {"results": results}
 
 @router.get("/generate-password")
 async def get_generated_password(
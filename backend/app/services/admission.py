@@ -0,0 +1,133 @@
+import asyncio
+import math
+import os
+import time
+from contextlib import asynccontextmanager
+
+# --- CONFIGURATION ---
+# Inférences exécutées en parallèle (threads) ; au-delà, les requêtes attendent dans la file
+ADMISSION_WORKERS = int(os.getenv("ADMISSION_WORKERS", "4"))
+# Requêtes en attente au maximum : la suivante reçoit immédiatement un 503
+ADMISSION_QUEUE = int(os.getenv("ADMISSION_QUEUE", "32"))
+# Latence visée (ms) : si l'attente estimée + le temps de service la dépasse, le modèle est dégradé
+ADMISSION_TARGET_MS = float(os.getenv("ADMISSION_TARGET_MS", "500"))
+# Attente maximale dans la file (ms) avant abandon en 503
+ADMISSION_MAX_WAIT_MS = float(os.getenv("ADMISSION_MAX_WAIT_MS", "2000"))
+# Échelle de dégradation, du plus coûteux au moins coûteux ("math" = features maths seules, sans modèle)
+DEGRADATION_LADDER = [m.strip() for m in os.getenv("DEGRADATION_LADDER", "hybrid,rf,math").split(",") if m.strip()]
+# Poids de la dernière mesure dans la moyenne mobile exponentielle du temps de service
+EWMA_ALPHA = 0.2
+
+
+class Overloaded(Exception):
+    """File pleine ou attente trop longue : la requête est rejetée (503 + Retry-After)."""
+
+    def __init__(self, retry_after):
+        super().__init__("Serveur surchargé")
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """
+    Contrôle d'admission des inférences : ADMISSION_WORKERS exécutions simultanées, file bornée,
+    temps de service mesuré par modèle (EWMA). Sous pression, le modèle demandé descend l'échelle
+    de dégradation jusqu'au premier échelon dont la latence estimée tient dans la cible.
+    Utilisé depuis la boucle asyncio uniquement : les compteurs n'ont pas besoin de verrou.
+    """
+
+    def __init__(self, workers=ADMISSION_WORKERS, queue=ADMISSION_QUEUE, target_ms=ADMISSION_TARGET_MS,
+                 max_wait_ms=ADMISSION_MAX_WAIT_MS, ladder=DEGRADATION_LADDER):
+        self.workers = workers
+        self.queue = queue
+        self.target = target_ms / 1000.0
+        self.max_wait = max_wait_ms / 1000.0
+        self.ladder = list(ladder)
+        self.slots = None
+        self.active = 0
+        self.waiting = 0
+        self.service_time = {}  # model_type -> EWMA (s)
+        self.stats = {"admitted": 0, "degraded": 0, "rejected": 0, "timeouts": 0}
+
+    def _slots(self):
+        # Créé au premier appel, dans la boucle d'événements du serveur
+        if self.slots is None:
+            self.slots = asyncio.Semaphore(self.workers)
+        return self.slots
+
+    def candidates(self, model_type):
+        """Le modèle demandé puis ses replis. Un modèle hors échelle se replie sur les échelons après le premier."""
+        if model_type in self.ladder:
+            return self.ladder[self.ladder.index(model_type):]
+        return [model_type] + [m for m in self.ladder[1:] if m != model_type]
+
+    def estimate(self, model_type):
+        """Latence estimée (s) d'une nouvelle requête : attente dans la file + son propre temps de service."""
+        service = self.service_time.get(model_type)
+        if service is None:
+            return 0.0
+        ahead = max(0, self.active + self.waiting - self.workers + 1)
+        return service * (ahead / self.workers + 1)
+
+    def choose(self, model_type):
+        # Créneau libre : pas de file, le modèle demandé est servi même s'il est plus lent que la cible
+        if self.active + self.waiting < self.workers:
+            return model_type
+        options = self.candidates(model_type)
+        for option in options:
+            if self.estimate(option) <= self.target:
+                return option
+        return options[-1]
+
+    def record(self, model_type, seconds):
+        previous = self.service_time.get(model_type)
+        self.service_time[model_type] = seconds if previous is None else (1 - EWMA_ALPHA) * previous + EWMA_ALPHA * seconds
+
+    def retry_after(self):
+        """Secondes conseillées avant de réessayer : temps pour vider la file au rythme mesuré."""
+        service = max(self.service_time.values(), default=self.target)
+        return max(1, math.ceil((self.active + self.waiting) / self.workers * service))
+
+    @asynccontextmanager
+    async def admit(self, model_type, degrade=True):
+        """
+        Réserve un créneau d'inférence et fournit le modèle effectif (dégradé si besoin).
+        degrade=False : la file reste bornée mais le modèle demandé est conservé (comparaisons) ;
+        leur durée, multi-modèles, n'alimente pas le temps de service mesuré.
+        """
+        if self.active + self.waiting >= self.workers + self.queue:
+            self.stats["rejected"] += 1
+            raise Overloaded(self.retry_after())
+
+        effective = self.choose(model_type) if degrade else model_type
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self._slots().acquire(), self.max_wait)
+        except asyncio.TimeoutError:
+            self.stats["timeouts"] += 1
+            raise Overloaded(self.retry_after())
+        finally:
+            self.waiting -= 1
+
+        self.active += 1
+        self.stats["admitted"] += 1
+        if effective != model_type:
+            self.stats["degraded"] += 1
+        start = time.perf_counter()
+        try:
+            yield effective
+        finally:
+            if degrade:
+                self.record(effective, time.perf_counter() - start)
+            self.active -= 1
+            self.slots.release()
+
+    def status(self):
+        return {
+            "workers": self.workers, "queue": self.queue, "active": self.active, "waiting": self.waiting,
+            "target_ms": self.target * 1000, "ladder": self.ladder,
+            "service_time_ms": {m: round(t * 1000, 2) for m, t in self.service_time.items()},
+            **self.stats,
+        }
+
+
+controller = AdmissionController()
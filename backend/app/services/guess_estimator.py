@@ -0,0 +1,315 @@
+import bisect
+import math
+import random
+import string
+import sys
+import time
+from collections import Counter, defaultdict
+from pathlib import Path
+
+import joblib
+import numpy as np
+
+# --- CONFIGURATION DU CHEMIN (Pour trouver les modules) ---
+BASE_DIR = Path(__file__).resolve().parents[3]
+sys.path.append(str(BASE_DIR))
+
+from backend.app.utils.math_features import GPU_HASHRATE, format_crack_time
+from backend.app.utils.dataset_io import dataset_exists, read_dataset
+from backend.app.utils.pipeline_profiler import substep
+
+RAW_DIR = BASE_DIR / "datasets" / "raw"
+MODEL_DIR = BASE_DIR / "backend" / "app" / "models"
+GUESS_MODEL_FILE = "guess_model.pkl"
+
+# Taille de l'échantillon Monte Carlo (précision de la table probabilité -> rang)
+MC_SAMPLES = 100_000
+# Part de la force brute dans le mélange (mots de passe dont la structure n'a jamais été vue)
+BRUTE_FORCE_WEIGHT = 0.01
+# Lissage additif du modèle de Markov (lettres)
+MARKOV_ALPHA = 0.01
+MAX_LEN = 64
+# Plafond du nombre d'essais renvoyé (au-delà de 2^1023, un float déborde ; JSON n'accepte pas inf)
+MAX_LOG2_GUESSES = 1000.0
+
+LETTERS = string.ascii_lowercase
+DIGITS = string.digits
+SYMBOLS = string.punctuation + " "
+PRINTABLE = string.ascii_letters + DIGITS + SYMBOLS
+ALPHABET_SIZES = {'D': len(DIGITS), 'S': len(SYMBOLS)}
+ALPHABETS = {'D': DIGITS, 'S': SYMBOLS}
+START = len(LETTERS)  # Index du contexte "début de segment" dans la table de Markov
+CASE_PATTERNS = ['lower', 'upper', 'capital', 'mixed']
+
+
+def char_class(c):
+    if c in string.ascii_letters:
+        return 'L'
+    if c in DIGITS:
+        return 'D'
+    return 'S'
+
+
+def segments(password):
+    """Découpe en segments de même classe : "Thomas2024!" -> [('L', 'Thomas'), ('D', '2024'), ('S', '!')]."""
+    out = []
+    for c in password:
+        cls = char_class(c)
+        if out and out[-1][0] == cls:
+            out[-1][1].append(c)
+        else:
+            out.append((cls, [c]))
+    return [(cls, ''.join(chars)) for cls, chars in out]
+
+
+def structure_of(segs):
+    return ''.join(f"{cls}{len(text)}" for cls, text in segs)
+
+
+def case_pattern(text):
+    if text.islower():
+        return 'lower'
+    if text.isupper():
+        return 'upper'
+    if text[0].isupper() and (len(text) == 1 or text[1:].islower()):
+        return 'capital'
+    return 'mixed'
+
+
+def _logaddexp2(a, b):
+    if a == -math.inf:
+        return b
+    if b == -math.inf:
+        return a
+    return max(a, b) + math.log2(1 + 2 ** -abs(a - b))
+
+
+class GuessModel:
+    """
+    Grammaire probabiliste (PCFG) sur les structures (L6D4S1...) + Markov d'ordre 2 sur les lettres,
+    mélangée à une force brute pour les structures inconnues. Le nombre d'essais est estimé
+    par une table Monte Carlo (probabilité -> rang) précalculée.
+    """
+
+    def __init__(self):
+        self.structures = {}
+        self.terminals = {}
+        self.case_probs = {}
+        self.markov = None
+        self.length_probs = None
+        self.table_logp = []
+        self.table_rank = []
+
+    # --- ENTRAÎNEMENT ---
+    def fit(self, passwords):
+        passwords = [p for p in passwords if p and len(p) <= MAX_LEN and all(c in PRINTABLE for c in p)]
+        structures = Counter()
+        terminals = defaultdict(Counter)
+        cases = Counter()
+        transitions = np.zeros((START + 1, START + 1, len(LETTERS)))
+        lengths = np.ones(MAX_LEN + 1)
+        lengths[0] = 0
+
+        for pwd in passwords:
+            segs = segments(pwd)
+            structures[structure_of(segs)] += 1
+            lengths[len(pwd)] += 1
+            for cls, text in segs:
+                if cls == 'L':
+                    cases[case_pattern(text)] += 1
+                    a, b = START, START
+                    for c in text.lower():
+                        idx = LETTERS.index(c)
+                        transitions[a, b, idx] += 1
+                        a, b = b, idx
+                else:
+                    terminals[(cls, len(text))][text] += 1
+
+        total = sum(structures.values())
+        self.structures = {s: c / total for s, c in structures.items()}
+        self.terminals = {}
+        for key, counts in terminals.items():
+            n = sum(counts.values())
+            # Masse réservée aux chaînes jamais vues (estimation de Witten-Bell)
+            unseen = len(counts) / (n + len(counts))
+            self.terminals[key] = ({t: c / n for t, c in counts.items()}, unseen)
+        n_cases = sum(cases.values()) or 1
+        self.case_probs = {p: (cases[p] + 1) / (n_cases + len(CASE_PATTERNS)) for p in CASE_PATTERNS}
+        transitions += MARKOV_ALPHA
+        self.markov = np.log2(transitions / transitions.sum(axis=2, keepdims=True))
+        self.length_probs = lengths / lengths.sum()
+        return self
+
+    # --- PROBABILITÉ ---
+    def _segment_log2(self, cls, text):
+        n = len(text)
+        if cls == 'L':
+            pattern = case_pattern(text)
+            p_case = self.case_probs['mixed'] / 2 ** n
+            if pattern == 'lower':
+                p_case += self.case_probs['lower']
+            if text.isupper():
+                p_case += self.case_probs['upper']
+            if text[0].isupper() and (n == 1 or text[1:].islower()):
+                p_case += self.case_probs['capital']
+            logp = math.log2(p_case)
+            a, b = START, START
+            for c in text.lower():
+                idx = LETTERS.index(c)
+                logp += self.markov[a, b, idx]
+                a, b = b, idx
+            return logp
+
+        known, unseen = self.terminals.get((cls, n), ({}, 1.0))
+        return math.log2((1 - unseen) * known.get(text, 0.0) + unseen / ALPHABET_SIZES[cls] ** n)
+
+    def _brute_log2(self, password):
+        n = len(password)
+        p_len = self.length_probs[n] if n <= MAX_LEN else self.length_probs[-1]
+        return math.log2(p_len) - n * math.log2(len(PRINTABLE))
+
+    def log2_prob(self, password):
+        """log2 de la probabilité du mot de passe sous le modèle (mélange PCFG / force brute)."""
+        pcfg = -math.inf
+        if all(c in PRINTABLE for c in password):
+            segs = segments(password)
+            p_struct = self.structures.get(structure_of(segs))
+            if p_struct:
+                pcfg = math.log2(1 - BRUTE_FORCE_WEIGHT) + math.log2(p_struct) + sum(
+                    self._segment_log2(cls, text) for cls, text in segs)
+        return _logaddexp2(pcfg, math.log2(BRUTE_FORCE_WEIGHT) + self._brute_log2(password))
+
+    # --- ÉCHANTILLONNAGE (même distribution que log2_prob) ---
+    def sample(self, n, seed=42):
+        rng = random.Random(seed)
+        structs = list(self.structures)
+        struct_cum = list(np.cumsum([self.structures[s] for s in structs]))
+        length_cum = list(np.cumsum(self.length_probs))
+        case_cum = list(np.cumsum([self.case_probs[p] for p in CASE_PATTERNS]))
+        markov_cum = np.cumsum(2 ** self.markov, axis=2).tolist()
+        terminal_tables = {
+            key: (list(known), list(np.cumsum(list(known.values()))), unseen)
+            for key, (known, unseen) in self.terminals.items()
+        }
+
+        def pick(population, cum):
+            return population[min(bisect.bisect(cum, rng.random() * cum[-1]), len(population) - 1)]
+
+        out = []
+        for _ in range(n):
+            if rng.random() < BRUTE_FORCE_WEIGHT:
+                length = pick(range(MAX_LEN + 1), length_cum)
+                out.append(''.join(rng.choice(PRINTABLE) for _ in range(length)))
+                continue
+            pwd = []
+            for cls, length in _parse_structure(pick(structs, struct_cum)):
+                if cls == 'L':
+                    a, b, chars = START, START, []
+                    for _ in range(length):
+                        idx = min(bisect.bisect(markov_cum[a][b], rng.random() * markov_cum[a][b][-1]),
+                                  len(LETTERS) - 1)
+                        chars.append(LETTERS[idx])
+                        a, b = b, idx
+                    text = ''.join(chars)
+                    pattern = pick(CASE_PATTERNS, case_cum)
+                    if pattern == 'upper':
+                        text = text.upper()
+                    elif pattern == 'capital':
+                        text = text.capitalize()
+                    elif pattern == 'mixed':
+                        text = ''.join(c.upper() if rng.random() < 0.5 else c for c in text)
+                    pwd.append(text)
+                else:
+                    values, cum, unseen = terminal_tables[(cls, length)]
+                    if rng.random() < unseen:
+                        pwd.append(''.join(rng.choice(ALPHABETS[cls]) for _ in range(length)))
+                    else:
+                        pwd.append(pick(values, cum))
+            out.append(''.join(pwd))
+        return out
+
+    def build_rank_table(self, n=MC_SAMPLES, seed=42):
+        """
+        Estimateur Monte Carlo : rang(p) = somme des 1/(n * p_i) sur les échantillons plus probables que p.
+        La table stocke les log2 p_i triés (croissants) et les rangs cumulés correspondants.
+        """
+        logps = np.array([self.log2_prob(p) for p in self.sample(n, seed)])
+        desc = np.sort(logps)[::-1]
+        ranks = np.cumsum(2.0 ** -desc / n)
+        self.table_logp = desc[::-1].tolist()
+        self.table_rank = ranks.tolist()
+        return self
+
+    # --- SERVICE ---
+    def log2_guesses(self, password):
+        """log2 du nombre d'essais estimé (probabilité + recherche dichotomique), sans débordement."""
+        if not password:
+            return 0.0
+        logp = self.log2_prob(password)
+        above = len(self.table_logp) - bisect.bisect_right(self.table_logp, logp)
+        if above == 0:
+            return 0.0
+        log2_rank = math.log2(self.table_rank[above - 1])
+        if above == len(self.table_logp):
+            # Moins probable que tout l'échantillon : on extrapole avec 1/p (en log : 2^-logp déborde vers 160 caractères)
+            log2_rank = max(log2_rank, -logp)
+        return _logaddexp2(0.0, log2_rank)
+
+    def guesses(self, password):
+        """Nombre d'essais estimé avant de trouver le mot de passe (plafonné à 2^MAX_LOG2_GUESSES)."""
+        return 2.0 ** min(self.log2_guesses(password), MAX_LOG2_GUESSES)
+
+    def estimate(self, password):
+        log2_guesses = min(self.log2_guesses(password), MAX_LOG2_GUESSES)
+        guesses = 2.0 ** log2_guesses
+        return {
+            "guesses": float(f"{guesses:.3g}"),
+            "log10_guesses": round(log2_guesses * math.log10(2), 2),
+            "crack_time_display": format_crack_time(guesses / GPU_HASHRATE),
+        }
+
+
+def _parse_structure(structure):
+    out, i = [], 0
+    while i < len(structure):
+        cls, j = structure[i], i + 1
+        while j < len(structure) and structure[j].isdigit():
+            j += 1
+        out.append((cls, int(structure[i + 1:j])))
+        i = j
+    return out
+
+
+def train_guess_model(filename="weak_passwords", samples=MC_SAMPLES):
+    print("--- 🎲 ENTRAÎNEMENT DE L'ESTIMATEUR D'ESSAIS (PCFG + MARKOV) ---")
+    path = RAW_DIR / filename
+    if not dataset_exists(path):
+        print(f"❌ {filename} introuvable : lancez d'abord dataset_loader.py")
+        return None
+    passwords = read_dataset(path, columns=['password'])['password'].astype(str).tolist()
+
+    start = time.time()
+    with substep("pcfg_markov"):
+        model = GuessModel().fit(passwords)
+    print(f"   -> {len(model.structures)} structures, {len(model.terminals)} tables de terminaux.")
+    print(f"   -> Table Monte Carlo ({samples} échantillons)...")
+    with substep("table_monte_carlo"):
+        model.build_rank_table(samples)
+    print(f"   Terminé en {time.time() - start:.1f}s")
+
+    for pwd in ["123456", "Thomas2024!", "azerty", "Hk9#mP2$zL"]:
+        est = model.estimate(pwd)
+        print(f"   {pwd:<14} ~10^{est['log10_guesses']:<6} essais -> {est['crack_time_display']}")
+
+    MODEL_DIR.mkdir(parents=True, exist_ok=True)
+    joblib.dump(model, MODEL_DIR / GUESS_MODEL_FILE)
+    print(f"💾 Modèle sauvegardé : {MODEL_DIR / GUESS_MODEL_FILE}")
+    return model
+
+
+if __name__ == "__main__":
+    # Lancé en script, ce fichier est le module __main__ : un modèle picklé d'ici référencerait
+    # __main__.GuessModel, introuvable pour le serveur. On entraîne depuis le vrai module du paquet.
+    from backend.app.services.guess_estimator import train_guess_model as train_from_package
+
+    train_from_package()
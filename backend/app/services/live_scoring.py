@@ -0,0 +1,122 @@
+import asyncio
+import os
+
+import pandas as pd
+
+from backend.app.utils.math_features import CLASS_POOL, calculate_bruteforce_time, char_classes, features_from_counts
+from backend.app.utils.pattern_engine import PatternScanner, pattern_features, pattern_feedback
+from backend.app.utils.keyboard_walk import keyboard_features
+from backend.app.services.password_services import FEATURE_COLUMNS, analyse_passwords, get_linguistic_features
+
+# --- CONFIGURATION ---
+# Délai (ms) sans nouvelle frappe avant de lancer l'inférence sur le préfixe stabilisé
+LIVE_DEBOUNCE_MS = float(os.getenv("LIVE_DEBOUNCE_MS", "150"))
+# Au-delà, la saisie est tronquée (le score en direct n'a pas vocation à évaluer des fichiers collés)
+LIVE_MAX_LENGTH = 256
+
+
+class CountingScanner(PatternScanner):
+    """Scanner de motifs qui tient aussi les compteurs de classes de caractères (push / pop / update hérités)."""
+
+    def __init__(self, password=""):
+        self.counts = dict.fromkeys(CLASS_POOL, 0)
+        super().__init__(password)
+
+    def push(self, c):
+        for cls in char_classes(c):
+            self.counts[cls] += 1
+        super().push(c)
+
+    def pop(self):
+        if not self.text:
+            return
+        for cls in char_classes(self.text[-1]):
+            self.counts[cls] -= 1
+        super().pop()
+
+
+class LiveSession:
+    """
+    État d'une connexion de score en direct. Les compteurs de classes et le scanner de motifs
+    sont mis à jour caractère par caractère : seule la partie modifiée de la saisie est retraitée.
+    """
+
+    def __init__(self, model_type="rf"):
+        self.model_type = model_type
+        self.include_zxcvbn = False
+        self.scanner = CountingScanner()
+        self.seq = 0
+        # Dernier message reçu, pas encore appliqué (les rafales sont fusionnées : seul le plus récent compte)
+        self.latest = None
+        self.scored = None
+
+    @property
+    def text(self):
+        return self.scanner.text
+
+    @property
+    def counts(self):
+        return self.scanner.counts
+
+    # --- MISE À JOUR INCRÉMENTALE ---
+    def update(self, value):
+        """Retour au plus long préfixe commun avec la saisie précédente, puis ajout des nouveaux caractères."""
+        self.scanner.update(str(value)[:LIVE_MAX_LENGTH])
+
+    def apply_latest(self):
+        """Applique le dernier message reçu. Renvoie False s'il n'y avait rien à appliquer."""
+        message, self.latest = self.latest, None
+        if message is None:
+            return False
+        self.seq = message.get("seq", self.seq + 1)
+        self.model_type = message.get("model_type") or self.model_type
+        self.include_zxcvbn = bool(message.get("include_zxcvbn", self.include_zxcvbn))
+        self.update(message.get("value", ""))
+        return True
+
+    def _features(self):
+        return features_from_counts(len(self.text), self.counts)
+
+    def instant(self):
+        """Retour immédiat (sans modèle) : tout est dérivé de l'état incrémental."""
+        features = self._features()
+        return {
+            "type": "instant",
+            "seq": self.seq,
+            "length": len(self.text),
+            "entropy_bits": int(features['entropy'] * 100),
+            "crack_time_display": calculate_bruteforce_time(self.text),
+            "feedback": pattern_feedback(self.scanner.patterns()),
+        }
+
+    # --- INFÉRENCE SUR LE PRÉFIXE STABILISÉ ---
+    def snapshot(self):
+        """
+        Copie (seq, mot de passe, features) de l'état courant, ou None si ce préfixe a déjà été noté.
+        Prise dans la boucle d'événements : l'inférence peut ensuite tourner dans un thread.
+        """
+        key = (self.text, self.model_type, self.include_zxcvbn)
+        if not self.text or key == self.scored:
+            return None
+        self.scored = key
+        row = self._features()
+        row.update(get_linguistic_features(self.text))
+        row.update(pattern_features(self.text, self.scanner.patterns()))
+        row.update(keyboard_features(self.text))
+        return self.seq, self.text, self.model_type, self.include_zxcvbn, pd.DataFrame([row], columns=FEATURE_COLUMNS)
+
+
+def score_snapshot(snapshot):
+    seq, password, model_type, include_zxcvbn, features_df = snapshot
+    result = analyse_passwords([password], model_type, include_zxcvbn, features_df=features_df)[0]
+    result.pop("password")
+    return dict(result, type="score", seq=seq)
+
+
+async def settled(event, delay_ms=LIVE_DEBOUNCE_MS):
+    """Anti-rebond : True si aucune nouvelle frappe n'est arrivée pendant delay_ms."""
+    try:
+        await asyncio.wait_for(event.wait(), delay_ms / 1000.0)
+        return False
+    except asyncio.TimeoutError:
+        return True
@@ -0,0 +1,163 @@
+import gc
+import os
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Mapping
+from concurrent.futures import Future
+
+# --- CONFIGURATION ---
+# Budget mémoire des experts chargés (Mo, 0 = illimité : tout est chargé au démarrage et reste en mémoire)
+MODEL_POOL_BUDGET_MB = float(os.getenv("MODEL_POOL_BUDGET_MB", "0"))
+# Experts jamais évincés, chargés dès l'activation d'une version (rf : modèle par défaut et repli de dégradation)
+MODEL_POOL_PINNED = [m.strip() for m in os.getenv("MODEL_POOL_PINNED", "rf").split(",") if m.strip()]
+
+
+class ModelPool:
+    """
+    Réserve d'experts sous budget mémoire : chaque modèle est mesuré à son chargement (MemoryLedger),
+    le moins récemment utilisé est évincé quand le budget est dépassé, puis rechargé à la demande.
+    Un seul chargement par modèle à la fois (les requêtes simultanées attendent le même chargement).
+    Les modèles épinglés ne sont jamais évincés. Un modèle plus gros que le budget est tout de même
+    servi : il évince tous les autres non épinglés.
+    Les chargements de modèles différents sont sérialisés : le delta RSS mesuré est celui de tout le processus,
+    deux chargements simultanés se compteraient l'un l'autre.
+    """
+
+    def __init__(self, loaders, ledger, budget_bytes=None, pinned=None):
+        self.loaders = dict(loaders)  # clé -> (kind, fonction de chargement sans argument)
+        self.ledger = ledger
+        self.budget = int(MODEL_POOL_BUDGET_MB * 1024 * 1024) if budget_bytes is None else int(budget_bytes)
+        self.pinned = set(MODEL_POOL_PINNED if pinned is None else pinned) & set(self.loaders)
+        self.resident = OrderedDict()  # clé -> (modèle, taille), du moins au plus récemment utilisé
+        self.in_flight = {}  # clé -> Future du chargement en cours
+        self.lock = threading.Lock()
+        self.load_lock = threading.Lock()  # Un seul chargement mesuré à la fois (delta RSS non contaminé)
+        self.stats = {"hits": 0, "misses": 0, "loads": 0, "load_errors": 0, "evictions": 0, "load_seconds": 0.0}
+
+    @property
+    def used_bytes(self):
+        return sum(size for _, size in self.resident.values())
+
+    def __contains__(self, key):
+        return key in self.loaders
+
+    def get(self, key):
+        """Le modèle demandé (chargé si besoin). Les erreurs de chargement remontent à tous les appelants."""
+        with self.lock:
+            entry = self.resident.get(key)
+            if entry is not None:
+                self.resident.move_to_end(key)
+                self.stats["hits"] += 1
+                return entry[0]
+            self.stats["misses"] += 1
+            future = self.in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = self.in_flight[key] = Future()
+        if not leader:
+            return future.result()
+
+        try:
+            model = self._load(key)
+        except BaseException as e:
+            with self.lock:
+                self.stats["load_errors"] += 1
+                del self.in_flight[key]
+            future.set_exception(e)
+            raise
+        future.set_result(model)
+        return model
+
+    def _load(self, key):
+        kind, loader = self.loaders[key]
+        start = time.perf_counter()
+        with self.load_lock:
+            with self.ledger.track(key, kind):
+                model = loader()
+            rss_delta = self.ledger.entry(key)["rss_delta_bytes"]
+        # Taille profonde (poids Keras, arbres sklearn) ; à défaut, delta RSS du chargement
+        size = self.ledger.measure(key, model) or rss_delta or 0
+        with self.lock:
+            self.resident[key] = (model, size)
+            del self.in_flight[key]
+            self.stats["loads"] += 1
+            self.stats["load_seconds"] += time.perf_counter() - start
+            evicted = self._evict(keep=key)
+        if evicted:
+            # Les requêtes en cours gardent leur référence : la mémoire est rendue à leur fin
+            gc.collect()
+            print(f"♻️ Pool de modèles : {', '.join(evicted)} évincé(s) pour charger {key}.")
+        return model
+
+    def _evict(self, keep):
+        """Évince les moins récemment utilisés (hors épinglés et hors keep) jusqu'à tenir dans le budget."""
+        evicted = []
+        if self.budget <= 0:
+            return evicted
+        for key in list(self.resident):
+            if self.used_bytes <= self.budget:
+                break
+            if key == keep or key in self.pinned:
+                continue
+            del self.resident[key]
+            self.ledger.forget(key)
+            self.stats["evictions"] += 1
+            evicted.append(key)
+        return evicted
+
+    def preload(self, keys=None):
+        """Charge les modèles donnés (par défaut : les épinglés, ou tous sans budget). Renvoie ceux en échec."""
+        if keys is None:
+            keys = list(self.loaders) if self.budget <= 0 else [k for k in self.loaders if k in self.pinned]
+        failed = []
+        for key in keys:
+            try:
+                self.get(key)
+            except Exception:
+                failed.append(key)
+        return failed
+
+    def discard(self, key):
+        """Retire un modèle inutilisable (ex : fichier corrompu au démarrage) : il devient indisponible."""
+        with self.lock:
+            self.loaders.pop(key, None)
+            self.pinned.discard(key)
+            self.resident.pop(key, None)
+
+    def status(self):
+        with self.lock:
+            return {
+                "budget_bytes": self.budget or None,
+                "used_bytes": self.used_bytes,
+                "pinned": sorted(self.pinned),
+                "resident": {k: size for k, (_, size) in self.resident.items()},
+                "available": list(self.loaders),
+                **self.stats,
+                "load_seconds": round(self.stats["load_seconds"], 3),
+            }
+
+
+class PooledModels(Mapping):
+    """
+    Vue dictionnaire d'une partie des experts du pool (ML ou DL) : `key in models` teste la disponibilité,
+    `models[key]` charge au besoin. Remplace les dictionnaires bundle.ml_models / bundle.dl_models.
+    """
+
+    def __init__(self, pool, keys):
+        self.pool = pool
+        self.keys_ = list(keys)
+
+    def __getitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        return self.pool.get(key)
+
+    def __contains__(self, key):
+        return key in self.keys_ and key in self.pool
+
+    def __iter__(self):
+        return (k for k in self.keys_ if k in self.pool)
+
+    def __len__(self):
+        return sum(1 for _ in self)
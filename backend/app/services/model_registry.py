@@ -0,0 +1,286 @@
+import hashlib
+import json
+import shutil
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import joblib
+import pickle
+
+# --- CONFIGURATION DU CHEMIN (étape du pipeline et CLI lancées en script) ---
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+
+from backend.app.utils.pattern_engine import PATTERN_FEATURES
+from backend.app.utils.keyboard_walk import KEYBOARD_FEATURES
+
+from backend.app.utils.memory_accounting import MemoryLedger
+from backend.app.services.model_pool import ModelPool, PooledModels
+
+# --- GESTION DES DÉPENDANCES LOURDES ---
+try:
+    import tensorflow as tf
+
+    HAS_TF = True
+except ImportError:
+    HAS_TF = False
+
+# --- CONFIGURATION ---
+BASE_DIR = Path(__file__).resolve().parents[3]
+MODEL_DIR = BASE_DIR / "backend" / "app" / "models"
+DL_DATA_DIR = BASE_DIR / "datasets" / "deep_learning_data"
+REGISTRY_DIR = MODEL_DIR / "registry"
+# Fichier pointeur : contient le nom de la version active
+ACTIVE_FILE = REGISTRY_DIR / "ACTIVE"
+
+ML_FILES = {"rf": "random_forest.pkl", "xgb": "xgboost.pkl", "log": "logistic_regression.pkl"}
+META_FILE = "hybrid_meta.pkl"
+GUESS_FILE = "guess_model.pkl"
+DL_FILES = {"cnn": "cnn_scanner.keras", "lstm": "lstm_reader.keras", "dnn": "dnn_simple.keras"}
+TOKENIZER_FILES = ["tokenizer.pickle", "config.pickle"]
+
+FEATURE_SCHEMA = ['length_norm', 'diversity', 'entropy', 'is_weak_exact', 'has_word', 'has_name', 'has_place',
+                  'has_leetspeak'] + PATTERN_FEATURES + KEYBOARD_FEATURES
+STACK_SCHEMA = ['rf', 'xgb', 'log', 'cnn', 'lstm', 'dnn']
+
+
+def sha256_of(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+# --- REGISTRE ---
+def list_versions():
+    if not REGISTRY_DIR.exists():
+        return []
+    return sorted(d.name for d in REGISTRY_DIR.iterdir() if (d / "manifest.json").exists())
+
+
+def read_manifest(version):
+    with open(REGISTRY_DIR / version / "manifest.json", "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def active_version():
+    """Version pointée par le fichier ACTIVE (None si le registre n'est pas utilisé)."""
+    try:
+        version = ACTIVE_FILE.read_text(encoding="utf-8").strip()
+    except FileNotFoundError:
+        return None
+    return version if version in list_versions() else None
+
+
+def set_active(version):
+    if version not in list_versions():
+        raise ValueError(f"Version inconnue : {version}")
+    check_schema(read_manifest(version))
+    # Écriture atomique du pointeur (un watcher ne lit jamais un fichier à moitié écrit)
+    tmp = ACTIVE_FILE.with_suffix(".tmp")
+    tmp.write_text(version, encoding="utf-8")
+    tmp.replace(ACTIVE_FILE)
+
+
+# --- SCHÉMAS D'ENTRÉE ---
+def trained_schemas(model_dir):
+    """
+    Colonnes réellement vues à l'entraînement (feature_names_in_) : {expert ML: colonnes}
+    et colonnes du Juge (None si absent). Un modèle illisible ici (ex : xgboost absent) n'est pas décrit.
+    """
+    features = {}
+    for key, fname in ML_FILES.items():
+        try:
+            model = joblib.load(model_dir / fname)
+        except Exception:
+            continue
+        if hasattr(model, "feature_names_in_"):
+            features[key] = [str(c) for c in model.feature_names_in_]
+    stack = None
+    try:
+        meta = joblib.load(model_dir / META_FILE)
+        if hasattr(meta, "feature_names_in_"):
+            stack = [str(c) for c in meta.feature_names_in_]
+    except Exception:
+        pass
+    return features, stack
+
+
+def check_schema(manifest):
+    """
+    Refuse une version dont les modèles attendent des colonnes que le code servi ne calcule pas
+    (un expert entraîné sur un sous-ensemble de FEATURE_SCHEMA reste servi : il reçoit ses propres colonnes),
+    ou dont le Juge n'attend pas les votes dans l'ordre de STACK_SCHEMA.
+    """
+    for key, columns in manifest.get("model_features", {}).items():
+        missing = [c for c in columns if c not in FEATURE_SCHEMA]
+        if missing:
+            raise ValueError(f"Schéma incompatible ({key}) : colonnes inconnues du code servi {missing}")
+    stack = manifest.get("stack_schema")
+    if stack is not None and list(stack) != STACK_SCHEMA:
+        raise ValueError(f"Schéma du Juge incompatible : {stack} au lieu de {STACK_SCHEMA}")
+
+
+def publish_version(version=None, activate=True):
+    """
+    Copie les artefacts actuels (modèles + tokenizer) dans une nouvelle version du registre
+    et écrit son manifeste (empreintes, schéma de features, version du tokenizer).
+    """
+    version = version or datetime.now().strftime("v%Y%m%d-%H%M%S")
+    target = REGISTRY_DIR / version
+    if target.exists():
+        raise ValueError(f"La version {version} existe déjà.")
+    target.mkdir(parents=True)
+
+    sources = [MODEL_DIR / f for f in list(ML_FILES.values()) + [META_FILE, GUESS_FILE] + list(DL_FILES.values())]
+    sources += [DL_DATA_DIR / f for f in TOKENIZER_FILES]
+    files = {}
+    for src in sources:
+        if src.exists():
+            shutil.copy2(src, target / src.name)
+            files[src.name] = sha256_of(target / src.name)
+
+    model_features, stack_schema = trained_schemas(target)
+    manifest = {
+        "version": version,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "files": files,
+        # Colonnes des modèles entraînés (et non la constante du code au moment de la publication)
+        "feature_schema": list(dict.fromkeys(c for cols in model_features.values() for c in cols)),
+        "model_features": model_features,
+        "stack_schema": stack_schema,
+        "tokenizer_version": files.get("tokenizer.pickle", "")[:12] or None,
+    }
+    with open(target / "manifest.json", "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+
+    if activate:
+        # Une version incompatible reste publiée (pour diagnostic) mais n'est pas activée
+        set_active(version)
+    print(f"✅ Version {version} publiée ({len(files)} artefacts){' et activée' if activate else ''}.")
+    return version
+
+
+def verify_version(version):
+    """Vérifie que les fichiers d'une version correspondent aux empreintes du manifeste."""
+    manifest = read_manifest(version)
+    for name, digest in manifest["files"].items():
+        if sha256_of(REGISTRY_DIR / version / name) != digest:
+            raise ValueError(f"Empreinte invalide pour {name} (version {version})")
+    return manifest
+
+
+# --- CHARGEMENT ---
+class ModelBundle:
+    """Ensemble cohérent de modèles chargés (une version). Remplacé d'un bloc lors d'un rechargement."""
+
+    def __init__(self, version, manifest=None):
+        self.version = version
+        self.manifest = manifest or {}
+        # Experts ML et DL : chargés par le pool, sous budget mémoire (cf. model_pool.py)
+        self.pool = None
+        self.ml_models = {}
+        self.dl_models = {}
+        self.meta_model = None
+        self.guess_model = None
+        self.tokenizer = None
+        self.dl_config = None
+        self.loaded_at = time.time()
+        # Mémoire de chaque artefact de la version (delta RSS au chargement + taille profonde)
+        self.memory = MemoryLedger()
+
+    @property
+    def feature_schema(self):
+        return self.manifest.get("feature_schema", FEATURE_SCHEMA)
+
+
+def load_bundle(version=None):
+    """
+    Charge une version du registre (par défaut : la version active).
+    Sans registre, on retombe sur les fichiers de backend/app/models/ (version "local").
+    """
+    version = version or active_version()
+    if version:
+        manifest = verify_version(version)
+        check_schema(manifest)
+        model_dir = dl_dir = REGISTRY_DIR / version
+    else:
+        manifest = None
+        model_dir, dl_dir = MODEL_DIR, DL_DATA_DIR
+    bundle = ModelBundle(version or "local", manifest)
+
+    # Experts ML et DL : déclarés au pool, chargés maintenant (épinglés, ou tous sans budget) ou à la demande
+    loaders = {}
+    for key, fname in ML_FILES.items():
+        if (model_dir / fname).exists():
+            loaders[key] = ("ml", lambda path=model_dir / fname: joblib.load(path))
+    if HAS_TF:
+        for key, fname in DL_FILES.items():
+            if (model_dir / fname).exists():
+                loaders[key] = ("keras", lambda path=model_dir / fname: tf.keras.models.load_model(path))
+    bundle.pool = ModelPool(loaders, bundle.memory)
+    bundle.ml_models = PooledModels(bundle.pool, ML_FILES)
+    bundle.dl_models = PooledModels(bundle.pool, DL_FILES)
+
+    print(f"--- Chargement des experts (version {bundle.version}) ---")
+    failed = bundle.pool.preload()
+    for key in failed:
+        # Comme avant le pool : un expert illisible au démarrage est indisponible pour cette version
+        bundle.pool.discard(key)
+        print(f"❌ Erreur chargement {key.upper()}")
+    for key in bundle.pool.status()["resident"]:
+        print(f"✅ {'DL' if key in DL_FILES else 'ML'}: {key.upper()} chargé.")
+    lazy = [k for k in loaders if k not in failed and k not in bundle.pool.resident]
+    if lazy:
+        print(f"💤 Chargés à la demande (budget {bundle.pool.budget // (1024 * 1024)} Mo) : {', '.join(lazy)}")
+
+    # Hybride
+    if (model_dir / META_FILE).exists():
+        try:
+            with bundle.memory.track("hybrid", "ml"):
+                bundle.meta_model = joblib.load(model_dir / META_FILE)
+            bundle.memory.measure("hybrid", bundle.meta_model)
+            print("✅ HYBRIDE (Juge) chargé.")
+        except Exception:
+            print("❌ Erreur Hybride")
+
+    # Estimateur du nombre d'essais (PCFG + Markov)
+    if (model_dir / GUESS_FILE).exists():
+        try:
+            with bundle.memory.track("guess", "pcfg"):
+                bundle.guess_model = joblib.load(model_dir / GUESS_FILE)
+            bundle.memory.measure("guess", bundle.guess_model)
+            print("✅ Estimateur d'essais chargé.")
+        except Exception:
+            print("❌ Erreur Estimateur d'essais")
+
+    # Tokenizer DL
+    if HAS_TF:
+        try:
+            with bundle.memory.track("tokenizer", "tokenizer"):
+                with open(dl_dir / "tokenizer.pickle", "rb") as f:
+                    bundle.tokenizer = pickle.load(f)
+                with open(dl_dir / "config.pickle", "rb") as f:
+                    bundle.dl_config = pickle.load(f)
+            bundle.memory.measure("tokenizer", bundle.tokenizer)
+            print(f"✅ Tokenizer chargé.")
+        except Exception:
+            print("⚠️ Tokenizer introuvable.")
+
+    return bundle
+
+
+if __name__ == "__main__":
+    # python backend/app/services/model_registry.py [publish [version] | activate <version> | list]
+    args = sys.argv[1:] or ["publish"]
+    if args[0] == "publish":
+        publish_version(args[1] if len(args) > 1 else None)
+    elif args[0] == "activate":
+        set_active(args[1])
+        print(f"✅ Version active : {args[1]}")
+    else:
+        current = active_version()
+        for v in list_versions():
+            print(f"{'*' if v == current else ' '} {v}")
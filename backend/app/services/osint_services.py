@@ -0,0 +1,191 @@
+import itertools
+from collections import deque
+from datetime import date
+
+from backend.app.services.password_services import analyse_passwords
+
+# --- CONFIGURATION ---
+MIN_TOKEN_LEN = 2
+# Nombre maximum de variantes Leet générées par token (au-delà : substitutions simples + totale)
+MAX_LEET_VARIANTS = 128
+# Score maximum d'un mot de passe contenant une donnée personnelle forte (nom, date complète...)
+OSINT_MAX_SCORE = 10
+# Facteur appliqué au score si seules des données faibles (département, année) sont trouvées
+WEAK_MATCH_FACTOR = 0.5
+
+LEET_SUBSTITUTIONS = {
+    'a': ['4', '@'], 'e': ['3'], 'i': ['1', '!'], 'o': ['0'], 's': ['5', '$'], 't': ['7', '+'],
+    'l': ['1'], 'g': ['9'], 'b': ['8'],
+}
+DATE_SEPARATORS = ['', '/', '-', '.', '_']
+
+
+# --- VARIANTES DES DONNÉES PERSONNELLES ---
+def leet_variants(token):
+    """Variantes Leet d'un token (bornées : toutes les combinaisons si elles sont peu nombreuses)."""
+    options = [[c] + LEET_SUBSTITUTIONS.get(c, []) for c in token]
+    total = 1
+    for o in options:
+        total *= len(o)
+    if total <= MAX_LEET_VARIANTS:
+        return {''.join(p) for p in itertools.product(*options)} - {token}
+
+    variants = {''.join(o[-1] if len(o) > 1 else o[0] for o in options)}
+    for i, o in enumerate(options):
+        for sub in o[1:]:
+            variants.add(token[:i] + sub + token[i + 1:])
+    return variants - {token}
+
+
+def word_variants(label, value):
+    """(motif, label, forme) pour un mot : tel quel, inversé, Leet, Leet inversé. La casse est ignorée."""
+    token = str(value).strip().lower().replace(' ', '')
+    if len(token) < MIN_TOKEN_LEN:
+        return []
+    entries = [(token, label, 'exact'), (token[::-1], label, 'inversé')]
+    for v in leet_variants(token):
+        entries.append((v, label, 'leet'))
+        entries.append((v[::-1], label, 'leet inversé'))
+    return entries
+
+
+def date_variants(birth_date):
+    """Formats d'une date de naissance : JJMMAAAA, JJ/MM/AA, AAAA-MM-JJ, JJMM, année..."""
+    d, m, y = f"{birth_date.day:02d}", f"{birth_date.month:02d}", f"{birth_date.year:04d}"
+    dn, mn, yy = str(birth_date.day), str(birth_date.month), y[2:]
+    entries = []
+    for sep in DATE_SEPARATORS:
+        for day, month in {(d, m), (dn, mn)}:
+            entries += [
+                (sep.join([day, month, y]), "Date de naissance", 'date'),
+                (sep.join([day, month, yy]), "Date de naissance", 'date'),
+                (sep.join([month, day, y]), "Date de naissance", 'date US'),
+                (sep.join([y, month, day]), "Date de naissance", 'date ISO'),
+            ]
+    entries += [(d + m, "Anniversaire", 'jour+mois'), (y, "Année de naissance", 'année'),
+                (yy, "Année courte", 'année')]
+    return entries
+
+
+def zip_variants(label, value):
+    code = str(value).strip().replace(' ', '')
+    if len(code) < MIN_TOKEN_LEN:
+        return []
+    entries = [(code, label, 'exact'), (code[::-1], label, 'inversé')]
+    if len(code) > 2 and code[:2].isdigit():
+        entries.append((code[:2], f"Département {label.replace('CP ', '')}", 'département'))
+    return entries
+
+
+def profile_variants(profile):
+    """Toutes les variantes (motif, label, forme) des données personnelles du profil."""
+    entries = []
+    for label, key in [("Prénom", "first_name"), ("Nom", "last_name"), ("Mot-clé", "keyword")]:
+        if profile.get(key):
+            entries += word_variants(label, profile[key])
+    for extra in profile.get("extra_tokens") or []:
+        entries += word_variants("Mot-clé", extra)
+    for label, key in [("CP Naissance", "zip_birth"), ("CP Domicile", "zip_home")]:
+        if profile.get(key):
+            entries += zip_variants(label, profile[key])
+    if profile.get("birth_date"):
+        birth = profile["birth_date"]
+        entries += date_variants(birth if isinstance(birth, date) else date.fromisoformat(str(birth)))
+    return entries
+
+
+# --- AHO-CORASICK ---
+class TokenMatcher:
+    """Automate Aho-Corasick : tous les motifs sont cherchés en un seul passage sur le mot de passe."""
+
+    def __init__(self, entries):
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [[]]
+        for pattern, label, form in entries:
+            node = 0
+            for c in pattern:
+                if c not in self.goto[node]:
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append([])
+                    self.goto[node][c] = len(self.goto) - 1
+                node = self.goto[node][c]
+            if (pattern, label, form) not in self.output[node]:
+                self.output[node].append((pattern, label, form))
+
+        # Liens d'échec (parcours en largeur)
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for c, child in self.goto[node].items():
+                queue.append(child)
+                f = self.fail[node]
+                while f and c not in self.goto[f]:
+                    f = self.fail[f]
+                target = self.goto[f].get(c, 0)
+                self.fail[child] = target if target != child else 0
+                self.output[child] = self.output[child] + self.output[self.fail[child]]
+
+    def find(self, text):
+        """Occurrences {token, label, form, start, end} dans text (insensible à la casse)."""
+        matches = []
+        node = 0
+        for i, c in enumerate(text.lower()):
+            while node and c not in self.goto[node]:
+                node = self.fail[node]
+            node = self.goto[node].get(c, 0)
+            for pattern, label, form in self.output[node]:
+                matches.append({"token": pattern, "label": label, "form": form,
+                                "start": i - len(pattern) + 1, "end": i + 1})
+        return matches
+
+
+# --- ÉVALUATION ---
+WEAK_FORMS = {'département', 'année'}
+
+
+def keep_relevant(matches):
+    """Ne garde pas une correspondance incluse dans une plus longue (ex : l'année dans la date complète)."""
+    kept = []
+    for m in sorted(matches, key=lambda m: m["start"] - m["end"]):
+        if not any(k["start"] <= m["start"] and m["end"] <= k["end"] for k in kept):
+            kept.append(m)
+    return sorted(kept, key=lambda m: m["start"])
+
+
+def combine(analysis, matches):
+    """Score du modèle plafonné selon les données personnelles trouvées."""
+    result = dict(analysis)
+    strong = [m for m in matches if m["form"] not in WEAK_FORMS]
+    if strong:
+        result["score"] = min(analysis["score"], OSINT_MAX_SCORE)
+    elif matches:
+        result["score"] = int(analysis["score"] * WEAK_MATCH_FACTOR)
+    result["is_strong"] = result["score"] > 50
+
+    labels = []
+    for m in matches:
+        item = f"{m['label']} ({m['token']})"
+        if item not in labels:
+            labels.append(item)
+    if strong:
+        result["feedback"] = [f"🚨 DANGER CRITIQUE : Ingénierie Sociale détectée ! Éléments trouvés : {', '.join(labels)}."] \
+            + analysis["feedback"]
+    elif labels:
+        result["feedback"] = [f"⚠️ Données personnelles partielles : {', '.join(labels)}."] + analysis["feedback"]
+    result["osint"] = {
+        "compromised": bool(strong),
+        "matches": [{k: m[k] for k in ("label", "form", "start", "end")} for m in matches],
+    }
+    return result
+
+
+def analyse_targeted(profile, passwords, model_type="rf"):
+    """
+    Attaque ciblée : un seul automate pour toutes les variantes du profil,
+    un seul passage par mot de passe, une seule inférence pour tout le lot.
+    """
+    matcher = TokenMatcher(profile_variants(profile))
+    analyses = analyse_passwords(passwords, model_type)
+    return [combine(a, keep_relevant(matcher.find(a["password"]))) for a in analyses]
@@ -0,0 +1,78 @@
+import threading
+import time
+from collections import deque
+
+
+class PasswordPool:
+    """
+    Réserve bornée de mots de passe pré-générés et pré-validés, par mode.
+    - Un thread producteur remplit les réserves par lots (un seul appel d'inférence par lot).
+    - pop() est en O(1) : deque.popleft est atomique, chaque entrée n'est donc servie qu'une fois.
+    - Rien n'est jamais écrit sur disque ni journalisé : les réserves vivent uniquement en mémoire.
+    """
+
+    def __init__(self, generate, score, modes, size=64, batch_size=16, low_watermark=0.5):
+        self.generate = generate  # mode -> mot de passe
+        self.score = score  # liste de mots de passe -> liste d'analyses
+        self.size = size
+        self.batch_size = batch_size
+        self.low = max(1, int(size * low_watermark))
+        self.pools = {mode: deque() for mode in modes}
+        self.wakeup = threading.Event()
+        self.thread = None
+        self.stats = {"hits": 0, "misses": 0, "produced": 0, "discarded": 0}
+
+    def pop(self, mode, version=None):
+        """Entrée prête pour ce mode (None si la réserve est vide). Les entrées d'une ancienne version sont jetées."""
+        pool = self.pools.get(mode)
+        if pool is None:
+            return None
+        entry = None
+        while True:
+            try:
+                candidate = pool.popleft()
+            except IndexError:
+                break
+            if version is None or candidate["model_version"] == version:
+                entry = candidate
+                break
+            self.stats["discarded"] += 1
+
+        self.stats["hits" if entry else "misses"] += 1
+        if len(pool) < self.low:
+            self.wakeup.set()
+        return entry
+
+    def refill(self, mode):
+        """Complète une réserve d'un lot. Renvoie le nombre d'entrées ajoutées."""
+        pool = self.pools[mode]
+        n = min(self.batch_size, self.size - len(pool))
+        if n <= 0:
+            return 0
+        passwords = [self.generate(mode) for _ in range(n)]
+        for analysis in self.score(passwords):
+            pool.append({**analysis, "mode": mode})
+        self.stats["produced"] += n
+        return n
+
+    def _run(self):
+        while True:
+            self.wakeup.wait(timeout=5)
+            self.wakeup.clear()
+            for mode in self.pools:
+                try:
+                    while self.refill(mode):
+                        # Laisse la main aux requêtes entre deux lots
+                        time.sleep(0)
+                except Exception as e:
+                    print(f"⚠️ Réserve '{mode}' non remplie : {e}")
+
+    def start(self):
+        if self.thread is None and self.size > 0:
+            self.thread = threading.Thread(target=self._run, daemon=True, name="password-pool")
+            self.thread.start()
+            self.wakeup.set()
+        return self.thread
+
+    def status(self):
+        return {"size": self.size, "levels": {m: len(p) for m, p in self.pools.items()}, **self.stats}
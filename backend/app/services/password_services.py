@@ -1,25 +1,28 @@
-import joblib
 import pandas as pd
 import re
 from pathlib import Path
 import numpy as np
 import traceback
-import pickle
 import secrets
 import string
+import threading
 import time
+import os
 
-# --- IMPORT ZXCVBN ---
-try:
-    from zxcvbn import zxcvbn
-except ImportError:
-    def zxcvbn(pwd):
-        return {'score': 0, 'crack_times_display': {'offline_slow_hashing_1e4_per_second': 'N/A'}}
+# --- IMPORT ZXCVBN (borné en longueur et en temps, résultats en cache) ---
+from backend.app.services import zxcvbn_guard
+from backend.app.services.zxcvbn_guard import zxcvbn
+
+from backend.app.utils.memory_accounting import MemoryLedger, log_report, rss_bytes
+
+# Mémoire des ressources communes à toutes les versions (runtimes, dictionnaires)
+RUNTIME_MEMORY = MemoryLedger()
 
 # --- GESTION DES DÉPENDANCES LOURDES ---
 try:
-    import tensorflow as tf
-    from tensorflow.keras.preprocessing.sequence import pad_sequences
+    with RUNTIME_MEMORY.track("tensorflow", "runtime"):
+        import tensorflow as tf
+        from tensorflow.keras.preprocessing.sequence import pad_sequences
 
     HAS_TF = True
 except ImportError:
@@ -27,7 +30,8 @@ except ImportError:
     print("⚠️ TensorFlow non trouvé. Les modèles Deep Learning (CNN, LSTM) seront indisponibles.")
 
 try:
-    import xgboost
+    with RUNTIME_MEMORY.track("xgboost", "runtime"):
+        import xgboost
 except ImportError:
     pass
 
@@ -35,20 +39,50 @@ except ImportError:
 from backend.app.utils.math_features import (
     compute_length_norm, compute_diversity, compute_entropy, calculate_bruteforce_time
 )
+from backend.app.utils.pattern_engine import PATTERN_FEATURES, find_patterns, pattern_features, pattern_feedback
+from backend.app.utils.keyboard_walk import KEYBOARD_FEATURES, find_walks, keyboard_features, walk_feedback
+from backend.app.utils.breach_index import BreachIndex
+from backend.app.utils.length_buckets import predict_bucketed
+from backend.app.services.model_registry import load_bundle, active_version
+from backend.app.services.password_pool import PasswordPool
+from backend.app.utils.single_flight import SingleFlight
 
 # --- CONFIGURATION ---
 BASE_DIR = Path(__file__).resolve().parents[3]
 MODEL_DIR = BASE_DIR / "backend" / "app" / "models"
 DL_DATA_DIR = BASE_DIR / "datasets" / "deep_learning_data"
 DICT_DIR = BASE_DIR / "datasets" / "Dictionnaries" / "processed"
+# Intervalle (s) de surveillance du registre pour le rechargement à chaud (0 = désactivé)
+MODEL_WATCH_INTERVAL = float(os.getenv("MODEL_WATCH_INTERVAL", "0"))
+# Taille de la réserve de mots de passe pré-générés par mode (0 = génération synchrone)
+PASSWORD_POOL_SIZE = int(os.getenv("PASSWORD_POOL_SIZE", "64"))
+GENERATION_MODES = ["chunked_password", "diceware"]
 
 # --- VARIABLES GLOBALES ---
+# active_bundle est LA référence lue par chaque requête : la remplacer est atomique.
+# Les autres variables sont des alias conservés pour les scripts existants.
+active_bundle = None
 loaded_ml_models = {}
 loaded_dl_models = {}
 meta_model = None
 tokenizer = None
 dl_config = None
 dictionaries = None
+# Index local des hashs de mots de passe fuités (None tant qu'il n'a pas été construit)
+breach_index = None
+
+reload_lock = threading.Lock()
+reload_status = {"state": "idle", "target": None, "error": None, "finished_at": None}
+
+# Colonnes des modèles entraînés avant l'ajout des features de motifs
+BASE_FEATURE_COLUMNS = ['length_norm', 'diversity', 'entropy', 'is_weak_exact', 'has_word', 'has_name', 'has_place',
+                        'has_leetspeak']
+FEATURE_COLUMNS = BASE_FEATURE_COLUMNS + PATTERN_FEATURES + KEYBOARD_FEATURES
+ML_EXPERTS = ['rf', 'xgb', 'log']
+DL_EXPERTS = ['cnn', 'lstm', 'dnn']
+STACK_COLUMNS = ['rf', 'xgb', 'log', 'cnn', 'lstm', 'dnn']
+# Dernier échelon de dégradation : score dérivé des features maths, sans aucun modèle
+MATH_MODEL = 'math'
 
 LEET_TRANS = str.maketrans({
     '4': 'a', '@': 'a',
@@ -60,63 +94,110 @@ LEET_TRANS = str.maketrans({
 })
 
 
+def activate_bundle(bundle):
+    """Bascule atomiquement vers un nouveau jeu de modèles (les requêtes en cours gardent l'ancien)."""
+    global active_bundle, loaded_ml_models, loaded_dl_models, meta_model, tokenizer, dl_config
+    active_bundle = bundle
+    loaded_ml_models, loaded_dl_models = bundle.ml_models, bundle.dl_models
+    meta_model, tokenizer, dl_config = bundle.meta_model, bundle.tokenizer, bundle.dl_config
+    print(f"🔁 Modèles actifs : version {bundle.version}")
+
+
 def load_resources():
-    global loaded_ml_models, loaded_dl_models, meta_model, tokenizer, dl_config, dictionaries
-
-    # ML
-    ml_map = {"rf": "random_forest.pkl", "xgb": "xgboost.pkl", "log": "logistic_regression.pkl"}
-    print("--- Chargement ML ---")
-    for key, fname in ml_map.items():
-        if (MODEL_DIR / fname).exists():
-            try:
-                loaded_ml_models[key] = joblib.load(MODEL_DIR / fname)
-                print(f"✅ ML: {key.upper()} chargé.")
-            except:
-                print(f"❌ Erreur {fname}")
-
-    # Hybride
-    if (MODEL_DIR / "hybrid_meta.pkl").exists():
-        try:
-            meta_model = joblib.load(MODEL_DIR / "hybrid_meta.pkl")
-            print("✅ HYBRIDE (Juge) chargé.")
-        except:
-            print("❌ Erreur Hybride")
-
-    # DL
-    if HAS_TF:
-        print("--- Chargement DL ---")
-        dl_files = {"cnn": "cnn_scanner.keras", "lstm": "lstm_reader.keras", "dnn": "dnn_simple.keras"}
-        for key, fname in dl_files.items():
-            if (MODEL_DIR / fname).exists():
-                try:
-                    loaded_dl_models[key] = tf.keras.models.load_model(MODEL_DIR / fname)
-                    print(f"✅ DL: {key.upper()} chargé.")
-                except:
-                    print(f"❌ Erreur chargement {fname}")
+    global dictionaries, breach_index
 
-        try:
-            with open(DL_DATA_DIR / "tokenizer.pickle", "rb") as f:
-                tokenizer = pickle.load(f)
-            with open(DL_DATA_DIR / "config.pickle", "rb") as f:
-                dl_config = pickle.load(f)
-            print(f"✅ Tokenizer chargé.")
-        except:
-            print("⚠️ Tokenizer introuvable.")
+    activate_bundle(load_bundle())
+
+    # Index des fuites (mmap : rien n'est chargé en RAM avant les consultations)
+    breach_index = BreachIndex.open_default()
+    if breach_index is not None:
+        print(f"✅ Index des fuites : {breach_index.n_records} hashs.")
 
     # Dico
     try:
         corpus = pd.read_csv(DICT_DIR / "linguistic_dictionary.csv")
         corpus['token'] = corpus['token'].astype(str).str.lower().str.strip()
-        dictionaries = {
-            'words': set(corpus[corpus['category'] == 'word']['token']),
-            'names': set(corpus[corpus['category'] == 'name']['token']),
-            'places': set(corpus[corpus['category'] == 'place']['token']),
-            'weak': set(corpus[corpus['category'] == 'weak_pwd']['token'])
-        }
+        loaded = {}
+        for key, category in [('words', 'word'), ('names', 'name'), ('places', 'place'), ('weak', 'weak_pwd')]:
+            with RUNTIME_MEMORY.track(f"dict_{key}", "dictionary"):
+                loaded[key] = set(corpus[corpus['category'] == category]['token'])
+            RUNTIME_MEMORY.measure(f"dict_{key}", loaded[key])
+        dictionaries = loaded
         print(f"✅ Dictionnaire chargé.")
     except:
         dictionaries = None
 
+    log_report(memory_report()["resources"])
+
+
+def memory_report():
+    """Mémoire par ressource chargée (runtimes, dictionnaires, artefacts de la version active)."""
+    bundle = active_bundle
+    resources = RUNTIME_MEMORY.report() + (bundle.memory.report() if bundle is not None else [])
+    resources.sort(key=lambda r: max(r["rss_delta_bytes"] or 0, r["deep_size_bytes"] or 0), reverse=True)
+    return {
+        "rss_bytes": rss_bytes(),
+        "model_version": bundle.version if bundle is not None else None,
+        "tracked_rss_bytes": sum(r["rss_delta_bytes"] or 0 for r in resources),
+        # Experts résidents, épinglés et budget (les experts évincés n'apparaissent plus dans resources)
+        "model_pool": bundle.pool.status() if bundle is not None else None,
+        "resources": resources,
+    }
+
+
+def reload_models(version=None):
+    """
+    Charge une version en arrière-plan du trafic puis bascule d'un coup.
+    Si le chargement échoue, la version active reste en place.
+    """
+    with reload_lock:
+        reload_status.update(state="loading", target=version or active_version(), error=None)
+        try:
+            bundle = load_bundle(version)
+            activate_bundle(bundle)
+            log_report(bundle.memory.report(), f"Mémoire de la version {bundle.version}")
+            reload_status.update(state="idle", target=bundle.version)
+            return bundle.version
+        except Exception as e:
+            reload_status.update(state="failed", error=str(e))
+            print(f"❌ Rechargement impossible : {e}")
+            raise
+        finally:
+            reload_status["finished_at"] = time.time()
+
+
+def reload_models_async(version=None):
+    """Lance reload_models dans un thread ; renvoie False si un rechargement est déjà en cours."""
+    if reload_lock.locked():
+        return False
+    threading.Thread(target=_safe_reload, args=(version,), daemon=True, name="model-reload").start()
+    return True
+
+
+def _safe_reload(version):
+    try:
+        reload_models(version)
+    except Exception:
+        pass
+
+
+def start_model_watcher(interval=MODEL_WATCH_INTERVAL):
+    """Surveille le pointeur ACTIVE du registre et recharge quand il change."""
+    if interval <= 0:
+        return None
+
+    def watch():
+        while True:
+            time.sleep(interval)
+            target = active_version()
+            if target and active_bundle is not None and target != active_bundle.version:
+                print(f"👀 Nouvelle version détectée : {target}")
+                _safe_reload(target)
+
+    thread = threading.Thread(target=watch, daemon=True, name="model-watcher")
+    thread.start()
+    return thread
+
 
 load_resources()
 
@@ -168,126 +249,224 @@ def get_linguistic_features(password):
 
 
 def check_patterns(password):
-    fb = []
-    if re.search(r'(19|20)\d{2}', password): fb.append("Contient une année")
-    if re.search(r'(.)\1{2,}', password): fb.append("Caractères répétés")
-    if re.search(r'123|234|345|321|432|543', password): fb.append("Suite logique")
-    return fb
+    return pattern_feedback(find_patterns(password))
 
 
-def prepare_dl_input(password):
-    if not tokenizer or not dl_config: return None
-    seq = tokenizer.texts_to_sequences([str(password)])
-    return pad_sequences(seq, maxlen=dl_config['max_len'], padding='post', truncating='post')
+def prepare_dl_input(password, bundle=None):
+    return prepare_dl_batch([password], bundle)
 
 
-# --- FONCTION D'ANALYSE ---
+def prepare_dl_batch(passwords, bundle=None):
+    bundle = bundle or active_bundle
+    if not bundle.tokenizer or not bundle.dl_config: return None
+    seq = bundle.tokenizer.texts_to_sequences([str(p) for p in passwords])
+    return pad_sequences(seq, maxlen=bundle.dl_config['max_len'], padding='post', truncating='post')
+
+
+# --- ÉTAPES DE L'INFÉRENCE (PAR LOTS) ---
 
-def analyse_password(password: str, model_type: str = "rf"):
-    entropy = compute_entropy(password)
-    length_norm = compute_length_norm(password)
-    diversity = compute_diversity(password)
-    linguistic = get_linguistic_features(password)
-    crack_time_maths = calculate_bruteforce_time(password)
-
-    zxcvbn_stats = zxcvbn(password)
-    zxcvbn_score = zxcvbn_stats['score']  # 0, 1, 2, 3, 4
-    zxcvbn_time = zxcvbn_stats['crack_times_display']['offline_slow_hashing_1e4_per_second']  # Temps estimé humain
-
-    features_df = pd.DataFrame([{
-        'length_norm': length_norm, 'diversity': diversity, 'entropy': entropy,
-        'is_weak_exact': linguistic['is_weak_exact'], 'has_word': linguistic['has_word'],
-        'has_name': linguistic['has_name'], 'has_place': linguistic['has_place'],
-        'has_leetspeak': linguistic['has_leetspeak']
-    }])
-    features_df = features_df[
-        ['length_norm', 'diversity', 'entropy', 'is_weak_exact', 'has_word', 'has_name', 'has_place', 'has_leetspeak']]
-
-    ai_prob = 0.0
-
-    if model_type == 'hybrid':
-        votes = {}
-        # ML
-        for m in ['rf', 'xgb', 'log']:
-            votes[m] = 0.0
-            if m in loaded_ml_models:
-                try:
-                    votes[m] = float(loaded_ml_models[m].predict_proba(features_df)[0][1])
-                except:
-                    pass
-        # DL
-        dl_in = prepare_dl_input(password)
-        for m in ['cnn', 'lstm', 'dnn']:
-            votes[m] = 0.0
-            if m in loaded_dl_models and dl_in is not None:
-                try:
-                    votes[m] = float(loaded_dl_models[m].predict(dl_in, verbose=0)[0][0])
-                except:
-                    pass
-        # Juge
-        if meta_model:
-            vote_df = pd.DataFrame(
-                [[votes['rf'], votes['xgb'], votes['log'], votes['cnn'], votes['lstm'], votes['dnn']]],
-                columns=['rf', 'xgb', 'log', 'cnn', 'lstm', 'dnn'])
-            try:
-                ai_prob = float(meta_model.predict_proba(vote_df)[0][1])
-            except:
-                ai_prob = votes['rf']
+def compute_features(passwords):
+    """Features maths + linguistiques d'un lot de mots de passe (une ligne par mot de passe)."""
+    rows = []
+    for password in passwords:
+        row = {
+            'length_norm': compute_length_norm(password),
+            'diversity': compute_diversity(password),
+            'entropy': compute_entropy(password),
+        }
+        row.update(get_linguistic_features(password))
+        row.update(pattern_features(password))
+        row.update(keyboard_features(password))
+        rows.append(row)
+    return pd.DataFrame(rows, columns=FEATURE_COLUMNS)
+
+
+def predict_expert(bundle, key, features_df, dl_in):
+    """Probabilités d'un expert sur le lot, ou None si l'expert est indisponible ou en erreur."""
+    try:
+        if key in ML_EXPERTS:
+            if key in bundle.ml_models:
+                model = bundle.ml_models[key]
+                # Chaque modèle reçoit les colonnes avec lesquelles il a été entraîné (anciennes versions comprises)
+                columns = list(getattr(model, 'feature_names_in_', BASE_FEATURE_COLUMNS))
+                return model.predict_proba(features_df[columns])[:, 1].astype(float)
+        elif key in bundle.dl_models and dl_in is not None:
+            # Lot regroupé par longueur : CNN et LSTM ne calculent pas sur tout le padding
+            return predict_bucketed(bundle.dl_models[key], dl_in).astype(float)
+    except:
+        pass
+    return None
+
+
+def predict_votes(bundle, features_df, dl_in):
+    """Votes des 6 experts (0.0 pour un expert absent, comme à l'entraînement du Juge)."""
+    n = len(features_df)
+    votes = {}
+    for key in ML_EXPERTS + DL_EXPERTS:
+        preds = predict_expert(bundle, key, features_df, dl_in)
+        votes[key] = preds if preds is not None else np.zeros(n)
+    return votes
+
+
+def predict_judge(bundle, votes):
+    if bundle.meta_model:
+        vote_df = pd.DataFrame({k: votes[k] for k in ML_EXPERTS + DL_EXPERTS})[STACK_COLUMNS]
+        try:
+            return bundle.meta_model.predict_proba(vote_df)[:, 1].astype(float)
+        except:
+            pass
+    return votes['rf']
+
+
+def math_proba(features_df):
+    """Probabilité "fort" sans modèle : moyenne longueur / diversité / entropie, nulle pour un mot de passe fuité."""
+    base = (features_df['length_norm'] + features_df['diversity'] + features_df['entropy']) / 3
+    return (base * (1 - features_df['is_weak_exact'].astype(float))).to_numpy(dtype=float)
+
+
+def predict_models(bundle, model_types, features_df, passwords, dl_in=None):
+    """
+    Probabilités "fort" de plusieurs model_type sur le même lot : l'entrée DL et la prédiction
+    de chaque expert sont calculées une seule fois (le Juge réutilise les votes déjà calculés).
+    """
+    n = len(features_df)
+    model_types = list(dict.fromkeys(model_types))
+    if dl_in is None and any(m == 'hybrid' or m in bundle.dl_models for m in model_types):
+        dl_in = prepare_dl_batch(passwords, bundle)
+
+    experts = {}
+
+    def expert(key):
+        if key not in experts:
+            preds = predict_expert(bundle, key, features_df, dl_in if key in DL_EXPERTS else None)
+            # 0.0 pour un expert absent, comme à l'entraînement du Juge
+            experts[key] = preds if preds is not None else np.zeros(n)
+        return experts[key]
+
+    probs = {}
+    for model_type in model_types:
+        if model_type == MATH_MODEL:
+            probs[model_type] = math_proba(features_df)
+        elif model_type == 'hybrid':
+            probs[model_type] = predict_judge(bundle, {k: expert(k) for k in ML_EXPERTS + DL_EXPERTS})
+        elif model_type in DL_EXPERTS:
+            probs[model_type] = expert(model_type)
         else:
-            ai_prob = votes['rf']
-
-    elif model_type in ['cnn', 'lstm', 'dnn']:
-        if model_type in loaded_dl_models:
-            dlin = prepare_dl_input(password)
-            if dlin is not None:
-                try:
-                    ai_prob = float(loaded_dl_models[model_type].predict(dlin, verbose=0)[0][0])
-                except:
-                    pass
-    else:
-        mod = loaded_ml_models.get(model_type, loaded_ml_models.get('rf'))
-        if mod:
-            try:
-                ai_prob = float(mod.predict_proba(features_df)[0][1])
-            except:
-                pass
+            probs[model_type] = expert(model_type if model_type in bundle.ml_models else 'rf')
+    return probs
+
+
+def predict_proba(bundle, model_type, features_df, passwords, dl_in=None):
+    """Probabilité "fort" du modèle demandé pour chaque mot de passe du lot."""
+    return predict_models(bundle, [model_type], features_df, passwords, dl_in)[model_type]
 
-    score_final = int(ai_prob * 100)
-    is_strong = score_final > 50
 
+def build_feedback(password, features, score_final, walks=None, breach_count=None):
     feedback = []
     if len(password) < 8: feedback.append("Trop court")
-    if diversity < 0.5: feedback.append("Manque de variété")
-    if linguistic['is_weak_exact']:
-        feedback.append("Ce mot de passe est connu des pirates (Leak)")
+    if features['diversity'] < 0.5: feedback.append("Manque de variété")
+    if features['is_weak_exact'] or breach_count:
+        leak = "Ce mot de passe est connu des pirates (Leak)"
+        feedback.append(f"{leak} : vu {breach_count} fois dans des fuites" if breach_count else leak)
     else:
-        if linguistic['has_name']: feedback.append("Contient un prénom/nom connu")
-        if linguistic['has_word']: feedback.append("Contient un mot du dictionnaire")
-        if linguistic['has_place']: feedback.append("Contient un nom de lieu")
-        if linguistic['has_leetspeak']: feedback.append("Détection Leet Speak (Mots déguisés)")
+        if features['has_name']: feedback.append("Contient un prénom/nom connu")
+        if features['has_word']: feedback.append("Contient un mot du dictionnaire")
+        if features['has_place']: feedback.append("Contient un nom de lieu")
+        if features['has_leetspeak']: feedback.append("Détection Leet Speak (Mots déguisés)")
 
     feedback.extend(check_patterns(password))
+    feedback.extend(walk_feedback(find_walks(password) if walks is None else walks))
 
-    if score_final < 20 and (int(entropy * 100) > 50) and not feedback:
+    if score_final < 20 and (int(features['entropy'] * 100) > 50) and not feedback:
         feedback.append("⚠️ Structure linguistique suspecte détectée par l'IA (Pattern humain implicite)")
 
     if score_final > 80 and not feedback: feedback.append("Mot de passe excellent !")
+    return feedback
 
+
+# --- FONCTION D'ANALYSE ---
+
+def analyse_models(passwords, model_types, include_zxcvbn=True, zxcvbn_budget_ms=None, features_df=None):
+    """
+    Analyse d'un lot par plusieurs modèles : features, zxcvbn, entrée DL, estimation d'essais et fuites
+    sont calculés une seule fois par mot de passe ; seuls le score et les conseils dépendent du modèle.
+    include_zxcvbn=False saute zxcvbn (score IA seul) ; zxcvbn_budget_ms borne son temps sur le lot.
+    features_df permet de fournir des features déjà calculées (ex : calcul incrémental du score en direct).
+    """
+    # Une seule lecture de la version active : un rechargement pendant la requête ne la perturbe pas
+    bundle = active_bundle
+    index = breach_index
+    passwords = list(passwords)
+    if not passwords:
+        return []
+
+    if features_df is None:
+        features_df = compute_features(passwords)
+    probs = predict_models(bundle, model_types, features_df, passwords)
+    zxcvbn_results = zxcvbn_guard.evaluate_batch(passwords, include_zxcvbn, zxcvbn_budget_ms)
+
+    results = []
+    for i, (password, features, zx) in enumerate(zip(passwords, features_df.to_dict('records'), zxcvbn_results)):
+        walks = find_walks(password)
+        breach_count = index.count(password) if index is not None else None
+
+        models = {}
+        for model_type, model_probs in probs.items():
+            ai_prob = float(model_probs[i])
+            score_final = int(ai_prob * 100)
+            models[model_type] = {
+                "score": score_final,
+                "is_strong": score_final > 50,
+                "ai_probability": round(ai_prob, 4),
+                "feedback": build_feedback(password, features, score_final, walks, breach_count),
+            }
+
+        results.append({
+            "password": password,
+            "model_version": bundle.version,
+            "details": {
+                "entropy_bits": int(features['entropy'] * 100),
+                "crack_time_display": calculate_bruteforce_time(password),  # Ton calcul maths
+                "zxcvbn_score": zx["zxcvbn_score"],  # Score Zxcvbn (0-4), None si sauté ou hors budget
+                "zxcvbn_time": zx["zxcvbn_time"],  # Temps Zxcvbn
+                "zxcvbn_status": zx["zxcvbn_status"],  # ok / truncated / timeout / skipped / unavailable
+                # Nombre d'essais d'un attaquant (PCFG + Markov, table Monte Carlo) ; None sans modèle
+                "guess_estimate": bundle.guess_model.estimate(password) if bundle.guess_model else None,
+                # Occurrences dans l'index local des fuites ; None si l'index n'a pas été construit
+                "breach_count": breach_count,
+                "keyboard_walks": [
+                    {k: w[k] for k in ("layout", "start", "end", "turns", "shifted")} for w in walks
+                ]
+            },
+            "models": models,
+        })
+    return results
+
+
+def model_result(analysis, model_type):
+    """Résultat d'un seul modèle, au format de /test-password."""
+    model = analysis["models"][model_type]
     return {
-        "password": password,
-        "score": score_final,
-        "is_strong": is_strong,
+        "password": analysis["password"],
+        "score": model["score"],
+        "is_strong": model["is_strong"],
         "model_used": model_type,
-        "details": {
-            "entropy_bits": int(entropy * 100),
-            "crack_time_display": crack_time_maths,  # Ton calcul maths
-            "zxcvbn_score": zxcvbn_score,  # Score Zxcvbn (0-4)
-            "zxcvbn_time": zxcvbn_time,  # Temps Zxcvbn
-            "ai_probability": round(ai_prob, 4)
-        },
-        "feedback": feedback
+        "model_version": analysis["model_version"],
+        "details": dict(analysis["details"], ai_probability=model["ai_probability"]),
+        "feedback": model["feedback"],
     }
 
+
+def analyse_passwords(passwords, model_type: str = "rf", include_zxcvbn=True, zxcvbn_budget_ms=None,
+                      features_df=None):
+    """Analyse d'un lot par un modèle : features et inférence calculées une seule fois pour tout le lot."""
+    return [model_result(a, model_type)
+            for a in analyse_models(passwords, [model_type], include_zxcvbn, zxcvbn_budget_ms, features_df)]
+
+
+def analyse_password(password: str, model_type: str = "rf", include_zxcvbn=True, zxcvbn_budget_ms=None):
+    return analyse_passwords([password], model_type, include_zxcvbn, zxcvbn_budget_ms)[0]
+
 # --- GÉNÉRATEUR DE MOTS DE PASSE (APPLE & DICEWARE) ---
 
 def generate_apple_style_password(chunks=4, chunk_size=4):
@@ -308,16 +487,24 @@ def generate_apple_style_password(chunks=4, chunk_size=4):
     return "-".join(password_chunks)
 
 
+_diceware_cache = (None, [])
+
+
+def diceware_words():
+    """Mots mémorisables (4 à 8 lettres) du dictionnaire, filtrés une fois par dictionnaire chargé."""
+    global _diceware_cache
+    source, words = _diceware_cache
+    if source is not dictionaries:
+        words = [w for w in dictionaries['words'] if 4 <= len(w) <= 8] if dictionaries and 'words' in dictionaries else []
+        _diceware_cache = (dictionaries, words)
+    return words
+
+
 def generate_diceware_password(num_words=6, separator="-"):
     """Génère une passphrase Diceware à partir du dictionnaire chargé en mémoire."""
     sys_random = secrets.SystemRandom()
 
-    # Utilisation du dictionnaire global s'il est disponible
-    if dictionaries and 'words' in dictionaries:
-        # On filtre à la volée pour garder des mots mémorisables (4 à 8 lettres)
-        word_list = [w for w in dictionaries['words'] if 4 <= len(w) <= 8]
-    else:
-        word_list = []
+    word_list = diceware_words()
 
     # Fallback de sécurité si le dictionnaire est vide
     if len(word_list) < 100:
@@ -326,30 +513,56 @@ def generate_diceware_password(num_words=6, separator="-"):
     return separator.join(sys_random.choice(word_list) for _ in range(num_words))
 
 
+def _generate_raw(mode):
+    if mode == "diceware":
+        return generate_diceware_password(num_words=6)
+    return generate_apple_style_password(chunks=4, chunk_size=4)
+
+
+def _validation_model():
+    return 'hybrid' if active_bundle.meta_model else 'rf'
+
+
+def _score_batch(passwords):
+    """Validation IA d'un lot de mots de passe générés (une seule inférence pour le lot)."""
+    return [
+        {"password": a["password"], "ai_score": a["score"], "ai_feedback": a["feedback"],
+         "model_version": a["model_version"]}
+        for a in analyse_passwords(passwords, model_type=_validation_model(), include_zxcvbn=False)
+    ]
+
+
+password_pool = PasswordPool(_generate_raw, _score_batch, GENERATION_MODES, size=PASSWORD_POOL_SIZE)
+# Comparaisons multi-modèles identiques et simultanées (double clic, onglets) : une seule inférence
+compare_flights = SingleFlight()
+
+
+def start_password_pool():
+    return password_pool.start()
+
+
 def generate_secure_password(mode="chunked_password"):
     """
     Fonction principale appelée par l'API FastAPI.
     mode : "apple" (pour les sites) ou "diceware" (pour le master password)
+    Le mot de passe est pris dans la réserve pré-validée ; si elle est vide, il est généré et validé sur place.
     """
     start_time = time.time()
+    pool_mode = "diceware" if mode == "diceware" else "chunked_password"
 
-    if mode == "diceware":
-        pwd = generate_diceware_password(num_words=6)
-    else:
-        pwd = generate_apple_style_password(chunks=4, chunk_size=4)
-
-    # Validation par l'IA pour prouver au POC que le générateur fait du bon travail
-    model_check = 'hybrid' if meta_model else 'rf'
-    analysis = analyse_password(pwd, model_type=model_check)
+    entry = password_pool.pop(pool_mode, version=active_bundle.version)
+    if entry is None:
+        # Validation par l'IA pour prouver au POC que le générateur fait du bon travail
+        entry = _score_batch([_generate_raw(pool_mode)])[0]
 
     duration = time.time() - start_time
-    print(f"✅ Généré en {duration:.3f}s | Mode: {mode.upper()} | Score IA: {analysis['score']}/100")
+    print(f"✅ Généré en {duration:.3f}s | Mode: {mode.upper()} | Score IA: {entry['ai_score']}/100")
 
     # On retourne un dictionnaire propre pour l'API
     return {
-        "password": pwd,
+        "password": entry["password"],
         "mode": mode,
-        "ai_score": analysis['score'],
-        "ai_feedback": analysis['feedback'],
+        "ai_score": entry['ai_score'],
+        "ai_feedback": entry['ai_feedback'],
         "generation_time_sec": round(duration, 4)
-    }
\ No newline at end of file
+    }
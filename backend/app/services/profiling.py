@@ -0,0 +1,154 @@
+import os
+import random
+import re
+import secrets
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+# --- CONFIGURATION ---
+BASE_DIR = Path(__file__).resolve().parents[3]
+PROFILE_DIR = Path(os.getenv("PROFILE_DIR", BASE_DIR / "benchmarks" / "profiles"))
+# Fraction des requêtes profilées d'office (0 = seulement sur demande via l'en-tête X-Profile d'un admin)
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+# Intervalle d'échantillonnage des piles (ms)
+PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", "2"))
+# Nombre de fonctions listées dans le rapport texte
+PROFILE_TOP = 25
+
+
+def frame_label(code):
+    """Nom d'une fonction dans les piles : nom qualifié + fichier (relatif au projet) et ligne de définition."""
+    path = Path(code.co_filename)
+    try:
+        short = path.relative_to(BASE_DIR).as_posix()
+    except ValueError:
+        short = "/".join(path.parts[-2:])
+    return f"{getattr(code, 'co_qualname', code.co_name)} ({short}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """
+    Profileur statistique d'un thread : un thread d'échantillonnage relève sa pile Python
+    (sys._current_frames) toutes les PROFILE_INTERVAL_MS ms. Le code profilé n'est pas instrumenté.
+    Le temps passé dans le code natif (TensorFlow, scikit-learn) est attribué à la fonction Python appelante.
+    Le relevé a besoin du GIL : en code Python pur, la résolution réelle est celle de sys.getswitchinterval() (5 ms).
+    """
+
+    def __init__(self, interval_ms=PROFILE_INTERVAL_MS, thread_id=None):
+        self.interval = interval_ms / 1000.0
+        self.thread_id = thread_id
+        self.stacks = Counter()
+        self.labels = {}
+        self.samples = 0
+        self.duration = 0.0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _label(self, code):
+        label = self.labels.get(code)
+        if label is None:
+            label = self.labels[code] = frame_label(code)
+        return label
+
+    def _sample(self):
+        frame = sys._current_frames().get(self.thread_id)
+        stack = []
+        while frame is not None:
+            stack.append(frame.f_code)
+            frame = frame.f_back
+        if stack:
+            # Ordre racine -> feuille, comme le format "collapsed" de flamegraph.pl
+            self.stacks[tuple(reversed(stack))] += 1
+            self.samples += 1
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def __enter__(self):
+        self.thread_id = self.thread_id or threading.get_ident()
+        self._start = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, daemon=True, name="profiler")
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.duration = time.perf_counter() - self._start
+        return False
+
+    # --- RÉSULTATS ---
+    def collapsed(self):
+        """Lignes "racine;...;feuille N" (flamegraph.pl, speedscope, inferno)."""
+        return [f"{';'.join(self._label(c) for c in stack)} {n}" for stack, n in self.stacks.most_common()]
+
+    def hot_functions(self, top=PROFILE_TOP):
+        """[(fonction, échantillons propres, échantillons cumulés)] par temps propre décroissant."""
+        own, total = Counter(), Counter()
+        for stack, n in self.stacks.items():
+            own[stack[-1]] += n
+            for code in set(stack):
+                total[code] += n
+        return [(self._label(code), n, total[code]) for code, n in own.most_common(top)]
+
+    def report(self, title):
+        ms = self.interval * 1000
+        lines = [f"# {title}",
+                 f"# {self.samples} échantillons / {self.duration * 1000:.1f} ms (intervalle {ms:g} ms)",
+                 f"{'propre %':>9} {'cumulé %':>9}  fonction"]
+        if not self.samples:
+            lines.append("(appel plus court que l'intervalle : diminuer PROFILE_INTERVAL_MS)")
+        for label, own, total in self.hot_functions():
+            lines.append(f"{own / max(self.samples, 1) * 100:9.1f} {total / max(self.samples, 1) * 100:9.1f}  {label}")
+        return "\n".join(lines) + "\n"
+
+    def dump(self, profile_id, title="", directory=None):
+        """Écrit <id>.collapsed et <id>.txt (fonctions chaudes). Aucun mot de passe n'y figure."""
+        directory = Path(directory or PROFILE_DIR)
+        directory.mkdir(parents=True, exist_ok=True)
+        (directory / f"{profile_id}.collapsed").write_text("\n".join(self.collapsed()) + "\n", encoding="utf-8")
+        (directory / f"{profile_id}.txt").write_text(self.report(title or profile_id), encoding="utf-8")
+        return directory / f"{profile_id}.collapsed"
+
+
+# --- DÉCLENCHEMENT PAR REQUÊTE ---
+def new_profile_id(label):
+    # Le libellé (ex : model_type du client) est assaini : il sert de nom de fichier
+    label = re.sub(r"[^A-Za-z0-9_-]", "_", str(label))[:32]
+    return f"{time.strftime('%Y%m%d-%H%M%S')}-{label}-{secrets.token_hex(3)}"
+
+
+def request_profile(requested, label):
+    """
+    Identifiant de profil si cette requête doit être profilée (demande admin ou tirage PROFILE_SAMPLE_RATE),
+    sinon None. Désactivé : une comparaison, pas d'aléatoire tiré.
+    """
+    if requested or (PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE):
+        return new_profile_id(label)
+    return None
+
+
+def run(profile_id, fn, *args):
+    """fn(*args), profilé dans le thread courant si profile_id est fourni."""
+    if profile_id is None:
+        return fn(*args)
+    with SamplingProfiler() as profiler:
+        result = fn(*args)
+    profiler.dump(profile_id, f"{getattr(fn, '__name__', 'appel')} {profile_id}")
+    return result
+
+
+def list_profiles(limit=50):
+    if not PROFILE_DIR.exists():
+        return []
+    files = sorted(PROFILE_DIR.glob("*.collapsed"), key=lambda p: p.stat().st_mtime, reverse=True)
+    return [p.stem for p in files[:limit]]
+
+
+def status():
+    return {"directory": str(PROFILE_DIR), "sample_rate": PROFILE_SAMPLE_RATE, "interval_ms": PROFILE_INTERVAL_MS,
+            "recent": list_profiles(10)}
@@ -1,27 +1,45 @@
 import numpy as np
+import json
 import pickle
+import sys
 from pathlib import Path
 import tensorflow as tf
 from tensorflow.keras.models import Sequential
-from tensorflow.keras.layers import Embedding, Conv1D, GlobalMaxPooling1D, Dense, LSTM, Dropout, Flatten
+from tensorflow.keras.layers import Input, Embedding, Conv1D, GlobalMaxPooling1D, Dense, LSTM, Dropout, Flatten
 from sklearn.metrics import accuracy_score
 
 # --- CONFIGURATION DES CHEMINS ---
 BASE_DIR = Path(__file__).resolve().parents[3]
+sys.path.append(str(BASE_DIR))
+
+from backend.app.utils.length_buckets import bucket_bounds, bucketing_margin, predict_bucketed
+from backend.app.utils.pipeline_profiler import substep
+
 DL_DATA_DIR = BASE_DIR / "datasets" / "deep_learning_data"
+SHARDS_DIR = DL_DATA_DIR / "shards"
 MODEL_DIR = BASE_DIR / "backend" / "app" / "models"
 MODEL_DIR.mkdir(parents=True, exist_ok=True)
 
+# Pipeline en flux
+BATCH_SIZE = 128
+SHUFFLE_BUFFER = 100_000
+READ_BLOCK = 8192  # Lignes lues d'un coup dans un shard mmappé
+CYCLE_LENGTH = 4  # Shards lus en parallèle (entrelacés)
+
 
-def load_dl_data():
-    """Charge les matrices pré-calculées et la configuration."""
+def load_dl_data(mmap=False):
+    """
+    Charge les matrices pré-calculées et la configuration.
+    mmap=True : les .npy sont mappés en mémoire (lus à la demande, pas chargés en RAM).
+    """
+    mode = 'r' if mmap else None
     try:
-        X_train = np.load(DL_DATA_DIR / "X_train.npy")
-        y_train = np.load(DL_DATA_DIR / "y_train.npy")
-        X_val = np.load(DL_DATA_DIR / "X_val.npy")
-        y_val = np.load(DL_DATA_DIR / "y_val.npy")
-        X_test = np.load(DL_DATA_DIR / "X_test.npy")
-        y_test = np.load(DL_DATA_DIR / "y_test.npy")
+        X_train = np.load(DL_DATA_DIR / "X_train.npy", mmap_mode=mode)
+        y_train = np.load(DL_DATA_DIR / "y_train.npy", mmap_mode=mode)
+        X_val = np.load(DL_DATA_DIR / "X_val.npy", mmap_mode=mode)
+        y_val = np.load(DL_DATA_DIR / "y_val.npy", mmap_mode=mode)
+        X_test = np.load(DL_DATA_DIR / "X_test.npy", mmap_mode=mode)
+        y_test = np.load(DL_DATA_DIR / "y_test.npy", mmap_mode=mode)
 
         with open(DL_DATA_DIR / "config.pickle", "rb") as f:
             config = pickle.load(f)
@@ -34,10 +52,100 @@ def load_dl_data():
         exit()
 
 
+def load_dl_config():
+    with open(DL_DATA_DIR / "config.pickle", "rb") as f:
+        return pickle.load(f)
+
+
+def list_shards(split):
+    """Shards (X, y) d'un split : ceux de dl_data_loader --shards, sinon le .npy monolithique."""
+    manifest_path = SHARDS_DIR / "shards.json"
+    if manifest_path.exists():
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        return [(str(SHARDS_DIR / s["x"]), str(SHARDS_DIR / s["y"])) for s in manifest[split]]
+    return [(str(DL_DATA_DIR / f"X_{split}.npy"), str(DL_DATA_DIR / f"y_{split}.npy"))]
+
+
+def iter_shard_blocks(x_path, y_path, block=READ_BLOCK):
+    """Blocs (X, y) d'un shard mappé en mémoire : seul le bloc courant est lu depuis le disque."""
+    if isinstance(x_path, bytes):
+        x_path, y_path = x_path.decode(), y_path.decode()
+    X = np.load(x_path, mmap_mode='r')
+    y = np.load(y_path, mmap_mode='r')
+    for start in range(0, len(X), block):
+        yield np.asarray(X[start:start + block]), np.asarray(y[start:start + block], dtype=np.float32)
+
+
+def length_bucketed(ds, max_len, margin, batch_size=BATCH_SIZE):
+    """
+    Lots regroupés par longueur réelle : chaque lot n'est complété que jusqu'à la borne
+    de sa tranche (+ marge du modèle), exactement comme à l'inférence (predict_bucketed).
+    """
+    bounds = bucket_bounds(max_len)
+
+    def trim(x, y):
+        # Position du dernier caractère non nul + 1 (padding='post')
+        length = tf.reduce_sum(tf.cast(tf.cumsum(tf.cast(x != 0, tf.int32), reverse=True) > 0, tf.int32))
+        return x[:length], y
+
+    ds = ds.map(trim, num_parallel_calls=tf.data.AUTOTUNE)
+    ds = ds.bucket_by_sequence_length(
+        lambda x, y: tf.shape(x)[0],
+        bucket_boundaries=[b + 1 for b in bounds],
+        bucket_batch_sizes=[batch_size] * (len(bounds) + 1),
+        pad_to_bucket_boundary=True,
+    )
+    return ds.map(lambda x, y: (tf.pad(x, [[0, 0], [0, margin]])[:, :max_len], y))
+
+
+def make_dataset(split, max_len, batch_size=BATCH_SIZE, training=False, shuffle_buffer=SHUFFLE_BUFFER, margin=None):
+    """
+    Pipeline tf.data à mémoire constante :
+    shards entrelacés -> blocs mmappés -> (mélange par tampon) -> batch -> prefetch.
+    margin : lots regroupés par longueur (modèles à longueur variable), sinon lots complétés à max_len.
+    """
+    shards = list_shards(split)
+    x_paths = [x for x, _ in shards]
+    y_paths = [y for _, y in shards]
+    signature = (tf.TensorSpec(shape=(None, max_len), dtype=tf.int32),
+                 tf.TensorSpec(shape=(None,), dtype=tf.float32))
+
+    ds = tf.data.Dataset.from_tensor_slices((x_paths, y_paths))
+    if training:
+        ds = ds.shuffle(len(shards), reshuffle_each_iteration=True)
+    ds = ds.interleave(
+        lambda x, y: tf.data.Dataset.from_generator(
+            iter_shard_blocks, args=(x, y), output_signature=signature),
+        cycle_length=min(CYCLE_LENGTH, len(shards)),
+        num_parallel_calls=tf.data.AUTOTUNE,
+        deterministic=not training,
+    ).unbatch()
+    if training:
+        ds = ds.shuffle(shuffle_buffer, reshuffle_each_iteration=True)
+    ds = ds.batch(batch_size) if margin is None else length_bucketed(ds, max_len, margin, batch_size)
+    return ds.prefetch(tf.data.AUTOTUNE)
+
+
+def streaming_accuracy(model, split, max_len):
+    """Précision calculée shard par shard (sans charger le split de test en RAM)."""
+    correct = total = 0
+    for x_path, y_path in list_shards(split):
+        for X, y in iter_shard_blocks(x_path, y_path, block=65536):
+            y_pred = (predict_bucketed(model, X) > 0.5).astype("int32")
+            correct += int((y_pred == y.astype("int32")).sum())
+            total += len(y)
+    return correct / total if total else 0.0
+
+
 def build_cnn(vocab_size, max_len):
-    """CNN 1D : Excellent pour détecter des motifs spatiaux locaux (ex: '1234', 'qwerty')."""
+    """
+    CNN 1D : Excellent pour détecter des motifs spatiaux locaux (ex: '1234', 'qwerty').
+    Longueur d'entrée variable : le pooling global rend la sortie indépendante du padding au-delà du noyau.
+    """
     model = Sequential([
-        Embedding(input_dim=vocab_size, output_dim=32, input_length=max_len),
+        Input(shape=(None,)),
+        Embedding(input_dim=vocab_size, output_dim=32),
         Conv1D(filters=64, kernel_size=4, activation='relu'),
         GlobalMaxPooling1D(),
         Dense(32, activation='relu'),
@@ -49,9 +157,13 @@ def build_cnn(vocab_size, max_len):
 
 
 def build_lstm(vocab_size, max_len):
-    """LSTM : Excellent pour comprendre la séquence et l'ordre complexe (ex: structure humaine)."""
+    """
+    LSTM : Excellent pour comprendre la séquence et l'ordre complexe (ex: structure humaine).
+    Longueur d'entrée variable : mask_zero fait ignorer le padding (l'état final est celui du dernier caractère).
+    """
     model = Sequential([
-        Embedding(input_dim=vocab_size, output_dim=32, input_length=max_len),
+        Input(shape=(None,)),
+        Embedding(input_dim=vocab_size, output_dim=32, mask_zero=True),
         LSTM(64, return_sequences=False),
         Dense(32, activation='relu'),
         Dropout(0.5),
@@ -62,7 +174,7 @@ def build_lstm(vocab_size, max_len):
 
 
 def build_dnn(vocab_size, max_len):
-    """DNN Simple : Modèle de base pour comparaison."""
+    """DNN Simple : Modèle de base pour comparaison (Flatten : longueur fixe max_len)."""
     model = Sequential([
         Embedding(input_dim=vocab_size, output_dim=16, input_length=max_len),
         Flatten(),
@@ -74,18 +186,34 @@ def build_dnn(vocab_size, max_len):
     return model
 
 
-def train_dl():
+DL_MODELS = [
+    {"name": "CNN Scanner", "key": "cnn", "file": "cnn_scanner.keras", "builder": build_cnn},
+    {"name": "LSTM Reader", "key": "lstm", "file": "lstm_reader.keras", "builder": build_lstm},
+    {"name": "DNN Simple", "key": "dnn", "file": "dnn_simple.keras", "builder": build_dnn}
+]
+
+
+def train_dl(streaming=None):
+    """
+    streaming=None : mode en flux si les données ont été préparées en shards.
+    streaming=True : force le pipeline tf.data (aussi sur les .npy monolithiques, mappés en mémoire).
+    """
     print("--- 🚀 DÉBUT DE L'ENTRAÎNEMENT DEEP LEARNING ---")
 
-    X_train, y_train, X_val, y_val, X_test, y_test, config = load_dl_data()
+    config = load_dl_config()
+    if streaming is None:
+        streaming = config.get('sharded', False)
+
+    if streaming:
+        print("🌊 Mode flux : shards mmappés + tf.data (mémoire constante)")
+        X_train = y_train = X_val = y_val = X_test = y_test = None
+    else:
+        with substep("chargement"):
+            X_train, y_train, X_val, y_val, X_test, y_test, config = load_dl_data()
     vocab_size = config['vocab_size']
     max_len = config['max_len']
 
-    models_config = [
-        {"name": "CNN Scanner", "file": "cnn_scanner.keras", "builder": build_cnn},
-        {"name": "LSTM Reader", "file": "lstm_reader.keras", "builder": build_lstm},
-        {"name": "DNN Simple", "file": "dnn_simple.keras", "builder": build_dnn}
-    ]
+    models_config = DL_MODELS
 
     for m in models_config:
         print(f"\n⚡ Entraînement de : {m['name']}...")
@@ -96,18 +224,33 @@ def train_dl():
             monitor='val_loss', patience=3, restore_best_weights=True
         )
 
-        model.fit(
-            X_train, y_train,
-            validation_data=(X_val, y_val),
-            epochs=10,
-            batch_size=128,
-            callbacks=[early_stopping],
-            verbose=1
-        )
+        # LSTM : lots regroupés par longueur ; CNN / DNN : lots complétés à max_len (voir length_buckets.py)
+        margin = bucketing_margin(model)
+        with substep(f"fit_{m['name']}"):
+            if streaming or margin is not None:
+                model.fit(
+                    make_dataset("train", max_len, training=True, margin=margin),
+                    validation_data=make_dataset("val", max_len, margin=margin),
+                    epochs=10,
+                    callbacks=[early_stopping],
+                    verbose=1
+                )
+            else:
+                model.fit(
+                    X_train, y_train,
+                    validation_data=(X_val, y_val),
+                    epochs=10,
+                    batch_size=BATCH_SIZE,
+                    callbacks=[early_stopping],
+                    verbose=1
+                )
 
         # Évaluation
-        y_pred = (model.predict(X_test, verbose=0) > 0.5).astype("int32")
-        acc = accuracy_score(y_test, y_pred)
+        if streaming:
+            acc = streaming_accuracy(model, "test", max_len)
+        else:
+            y_pred = (predict_bucketed(model, X_test) > 0.5).astype("int32")
+            acc = accuracy_score(y_test, y_pred)
         print(f"   ✅ Précision Test : {acc:.4f}")
 
         # Sauvegarde (Format Keras recommandé)
@@ -119,4 +262,4 @@ def train_dl():
 
 
 if __name__ == "__main__":
-    train_dl()
\ No newline at end of file
+    train_dl(streaming=True if "--stream" in sys.argv else None)
\ No newline at end of file
@@ -1,19 +1,31 @@
 import pandas as pd
 import numpy as np
+import hashlib
 import joblib
+import json
+import multiprocessing
+import os
 import pickle
 import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 # IA Libs
 from sklearn.linear_model import LogisticRegression
-from sklearn.model_selection import train_test_split
+from sklearn.model_selection import train_test_split, StratifiedKFold, cross_val_predict
 from sklearn.metrics import accuracy_score
 import tensorflow as tf
 from tensorflow.keras.preprocessing.sequence import pad_sequences
 
 # Nos outils
 from backend.app.utils.math_features import compute_length_norm, compute_diversity, compute_entropy
+from backend.app.utils.pattern_engine import PATTERN_FEATURES, pattern_features_batch
+from backend.app.utils.keyboard_walk import KEYBOARD_FEATURES, keyboard_features_batch
+from backend.app.utils.length_buckets import bucketing_margin, predict_bucketed
+from backend.app.utils.dataset_io import read_dataset
+from backend.app.utils.pipeline_profiler import substep
+from backend.app.services.model_registry import sha256_of
 
 # --- CONFIGURATION ---
 BASE_DIR = Path(__file__).resolve().parents[3]
@@ -21,6 +33,14 @@ PROCESSED_DIR = BASE_DIR / "datasets" / "processed"
 MODEL_DIR = BASE_DIR / "backend" / "app" / "models"
 DL_DATA_DIR = BASE_DIR / "datasets" / "deep_learning_data"
 DICT_DIR = BASE_DIR / "datasets" / "Dictionnaries" / "processed"
+DICTIONARY_FILE = DICT_DIR / "linguistic_dictionary.csv"
+# Cache des prédictions out-of-fold des experts (un .npy par expert et par fold)
+OOF_DIR = PROCESSED_DIR / "oof_cache"
+
+EXPERTS = ['rf', 'xgb', 'log', 'cnn', 'lstm', 'dnn']
+ML_FEATURES = ['length_norm', 'diversity', 'entropy', 'is_weak_exact', 'has_word', 'has_name', 'has_place',
+               'has_leetspeak'] + PATTERN_FEATURES + KEYBOARD_FEATURES
+N_FOLDS = 5
 
 # --- TABLE DE TRADUCTION LEET SPEAK ---
 LEET_TRANS = str.maketrans({
@@ -77,7 +97,7 @@ def load_base_models():
 def get_ml_features(df):
     """Recalcule les features pour le ML (RF/XGB/LOG) - VERSION COMPLÈTE"""
     try:
-        corpus = pd.read_csv(DICT_DIR / "linguistic_dictionary.csv")
+        corpus = pd.read_csv(DICTIONARY_FILE)
         corpus['token'] = corpus['token'].astype(str).str.lower().str.strip()
         words = set(corpus[corpus['category'] == 'word']['token'])
         names = set(corpus[corpus['category'] == 'name']['token'])
@@ -135,7 +155,16 @@ def get_ml_features(df):
     ling_df = pd.DataFrame(ling_data, columns=['is_weak_exact', 'has_word', 'has_name', 'has_place', 'has_leetspeak'])
     ling_df.index = df.index  # Alignement index critique
 
-    return pd.concat([df[['length_norm', 'diversity', 'entropy']], ling_df], axis=1)
+    print("   -> Calcul features de motifs...")
+    patterns_df = pattern_features_batch(df['password'].astype(str))
+    keyboard_df = keyboard_features_batch(df['password'].astype(str))
+
+    return pd.concat([df[['length_norm', 'diversity', 'entropy']], ling_df, patterns_df, keyboard_df], axis=1)
+
+
+def ml_input(model, X_ml):
+    """Colonnes attendues par un modèle ML (celles de son entraînement)."""
+    return X_ml[list(getattr(model, 'feature_names_in_', ML_FEATURES))]
 
 
 def get_dl_input(passwords, tokenizer, max_len):
@@ -145,11 +174,25 @@ def get_dl_input(passwords, tokenizer, max_len):
     return pad_sequences(seq, maxlen=max_len, padding='post', truncating='post')
 
 
+def dl_data_sharded():
+    """True si les données DL ont été préparées en shards (dl_data_loader.py --shards)."""
+    try:
+        with open(DL_DATA_DIR / "config.pickle", "rb") as f:
+            return bool(pickle.load(f).get('sharded', False))
+    except FileNotFoundError:
+        return False
+
+
 def train_hybrid():
     print("--- 🧬 ENTRAÎNEMENT DU MODÈLE HYBRIDE (6 MODÈLES) ---")
+    if dl_data_sharded():
+        # Le test des shards n'est pas celui de train_test_split : le Juge serait évalué sur des lignes
+        # vues par les experts DL. Le mode out-of-fold réentraîne les experts sur ses propres folds.
+        print("❌ Données DL en shards : mode holdout impossible, utilisez --oof.")
+        return None
 
     # 1. Données
-    df = pd.read_csv(PROCESSED_DIR / "passwords_processed.csv")
+    df = read_dataset(PROCESSED_DIR / "passwords_processed")
     _, df_test = train_test_split(df, test_size=0.2, random_state=42)
 
     y_true = df_test['label'].values
@@ -162,19 +205,20 @@ def train_hybrid():
     preds = {}
 
     # ML (Calcul des 8 features)
-    X_ml = get_ml_features(df_test)
-    X_ml = X_ml[
-        ['length_norm', 'diversity', 'entropy', 'is_weak_exact', 'has_word', 'has_name', 'has_place', 'has_leetspeak']]
+    with substep("features_ml"):
+        X_ml = get_ml_features(df_test)
 
-    if 'rf' in models: preds['rf'] = models['rf'].predict_proba(X_ml)[:, 1]
-    if 'xgb' in models: preds['xgb'] = models['xgb'].predict_proba(X_ml)[:, 1]
-    if 'log' in models: preds['log'] = models['log'].predict_proba(X_ml)[:, 1]
+    with substep("votes_ml"):
+        if 'rf' in models: preds['rf'] = models['rf'].predict_proba(ml_input(models['rf'], X_ml))[:, 1]
+        if 'xgb' in models: preds['xgb'] = models['xgb'].predict_proba(ml_input(models['xgb'], X_ml))[:, 1]
+        if 'log' in models: preds['log'] = models['log'].predict_proba(ml_input(models['log'], X_ml))[:, 1]
 
     # DL
-    X_dl = get_dl_input(passwords, tokenizer, config['max_len'])
-    if 'cnn' in models: preds['cnn'] = models['cnn'].predict(X_dl, verbose=0).flatten()
-    if 'lstm' in models: preds['lstm'] = models['lstm'].predict(X_dl, verbose=0).flatten()
-    if 'dnn' in models: preds['dnn'] = models['dnn'].predict(X_dl, verbose=0).flatten()
+    with substep("votes_dl"):
+        X_dl = get_dl_input(passwords, tokenizer, config['max_len'])
+        if 'cnn' in models: preds['cnn'] = predict_bucketed(models['cnn'], X_dl)
+        if 'lstm' in models: preds['lstm'] = predict_bucketed(models['lstm'], X_dl)
+        if 'dnn' in models: preds['dnn'] = predict_bucketed(models['dnn'], X_dl)
 
     # 4. Dataset du Juge
     X_stack = pd.DataFrame(preds)
@@ -185,7 +229,8 @@ def train_hybrid():
     X_s_train, X_s_test, y_s_train, y_s_test = train_test_split(X_stack, y_true, test_size=0.2, random_state=42)
 
     meta_model = LogisticRegression()
-    meta_model.fit(X_s_train, y_s_train)
+    with substep("fit_juge"):
+        meta_model.fit(X_s_train, y_s_train)
 
     # 6. Évaluation
     y_pred_hybrid = meta_model.predict(X_s_test)
@@ -219,5 +264,185 @@ def train_hybrid():
     df_results.to_csv(results_path, index=False)
     print(f"✅ Fichier d'analyse généré : {results_path.name}")
 
+# ---------------------------------------------------------
+# MODE OUT-OF-FOLD (STACKING K-FOLD)
+# ---------------------------------------------------------
+def dataset_fingerprint(df, n_folds):
+    """
+    Identifie le dataset, le découpage et les entrées dérivées (dictionnaire -> X_ml, tokenizer/config -> X_dl) :
+    le cache n'est réutilisé que s'ils sont tous identiques.
+    """
+    h = hashlib.sha1(pd.util.hash_pandas_object(df[['password', 'label']], index=False).values.tobytes())
+    h.update(f"folds={n_folds};seed=42;features={','.join(ML_FEATURES)}".encode())
+    for path in [DICTIONARY_FILE, DL_DATA_DIR / "tokenizer.pickle", DL_DATA_DIR / "config.pickle"]:
+        h.update(f";{path.name}={sha256_of(path) if path.exists() else 'absent'}".encode())
+    return h.hexdigest()
+
+
+def _fold_path(expert, fold, oof_dir=None):
+    return Path(oof_dir or OOF_DIR) / f"{expert}_fold{fold}.npy"
+
+
+def _oof_fold_task(task):
+    """
+    Worker : entraîne UN expert sur K-1 folds et prédit le fold restant.
+    Les matrices sont relues en mmap depuis le cache (rien de lourd n'est sérialisé).
+    """
+    expert, fold, n_threads, oof_dir = task
+    oof_dir = Path(oof_dir)
+    y = np.load(oof_dir / "y.npy", mmap_mode='r')
+    folds = np.load(oof_dir / "folds.npy", mmap_mode='r')
+    train_idx, test_idx = np.flatnonzero(folds != fold), np.flatnonzero(folds == fold)
+
+    if expert in ['rf', 'xgb', 'log']:
+        from backend.app.services.train_model import build_ml_classifiers
+        X = np.load(oof_dir / "X_ml.npy", mmap_mode='r')
+        clf = next(m['clf'] for m in build_ml_classifiers() if m['key'] == expert)
+        if hasattr(clf, 'n_jobs'):
+            clf.set_params(n_jobs=n_threads)
+        clf.fit(pd.DataFrame(X[train_idx], columns=ML_FEATURES), y[train_idx])
+        preds = clf.predict_proba(pd.DataFrame(X[test_idx], columns=ML_FEATURES))[:, 1]
+    else:
+        tf.config.threading.set_intra_op_parallelism_threads(n_threads)
+        from backend.app.services.train_dl_models import DL_MODELS, BATCH_SIZE, length_bucketed
+        with open(oof_dir / "dl_config.json", "r", encoding="utf-8") as f:
+            config = json.load(f)
+        X = np.load(oof_dir / "X_dl.npy", mmap_mode='r')
+        builder = next(m['builder'] for m in DL_MODELS if m['key'] == expert)
+        model = builder(config['vocab_size'], config['max_len'])
+        X_fit, X_val, y_fit, y_val = train_test_split(
+            np.asarray(X[train_idx]), np.asarray(y[train_idx]), test_size=0.1, random_state=42)
+        callbacks = [tf.keras.callbacks.EarlyStopping(monitor='val_loss', patience=3, restore_best_weights=True)]
+        margin = bucketing_margin(model)
+        if margin is None:
+            model.fit(X_fit, y_fit, validation_data=(X_val, y_val), epochs=10, batch_size=BATCH_SIZE, verbose=0,
+                      callbacks=callbacks)
+        else:
+            # Lots regroupés par longueur, comme dans train_dl_models
+            def bucketed(X_part, y_part, training=False):
+                ds = tf.data.Dataset.from_tensor_slices((X_part.astype(np.int32), y_part.astype(np.float32)))
+                if training:
+                    ds = ds.shuffle(len(X_part), seed=42)
+                return length_bucketed(ds, config['max_len'], margin, BATCH_SIZE).prefetch(tf.data.AUTOTUNE)
+
+            model.fit(bucketed(X_fit, y_fit, training=True), validation_data=bucketed(X_val, y_val), epochs=10,
+                      verbose=0, callbacks=callbacks)
+        preds = predict_bucketed(model, np.asarray(X[test_idx]))
+
+    np.save(_fold_path(expert, fold, oof_dir), preds.astype(np.float32))
+    return expert, fold
+
+
+def compute_oof_predictions(n_folds=N_FOLDS, workers=None, refresh=False):
+    """
+    Prédictions out-of-fold des 6 experts sur TOUT le dataset.
+    Chaque couple (expert, fold) est une tâche indépendante exécutée dans un processus séparé ;
+    les résultats sont mis en cache et réutilisés tant que le dataset ne change pas.
+    """
+    df = read_dataset(PROCESSED_DIR / "passwords_processed")
+    OOF_DIR.mkdir(parents=True, exist_ok=True)
+    manifest_path = OOF_DIR / "manifest.json"
+    fingerprint = dataset_fingerprint(df, n_folds)
+
+    manifest = {}
+    if manifest_path.exists() and not refresh:
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    if manifest.get("fingerprint") != fingerprint:
+        print("♻️ Nouveau dataset : cache OOF réinitialisé.")
+        for old in OOF_DIR.glob("*.npy"):
+            old.unlink()
+        manifest = {"fingerprint": fingerprint, "n_folds": n_folds, "rows": len(df)}
+
+        # Entrées partagées par les workers (écrites une seule fois)
+        y = df['label'].values.astype(np.int8)
+        skf = StratifiedKFold(n_splits=n_folds, shuffle=True, random_state=42)
+        folds = np.empty(len(df), dtype=np.int8)
+        for k, (_, test_idx) in enumerate(skf.split(np.zeros(len(y)), y)):
+            folds[test_idx] = k
+        np.save(OOF_DIR / "y.npy", y)
+        np.save(OOF_DIR / "folds.npy", folds)
+        np.save(OOF_DIR / "X_ml.npy", get_ml_features(df)[ML_FEATURES].values.astype(np.float32))
+
+        with open(DL_DATA_DIR / "tokenizer.pickle", "rb") as f:
+            tokenizer = pickle.load(f)
+        with open(DL_DATA_DIR / "config.pickle", "rb") as f:
+            dl_config = pickle.load(f)
+        np.save(OOF_DIR / "X_dl.npy", get_dl_input(df['password'], tokenizer, dl_config['max_len']))
+        with open(OOF_DIR / "dl_config.json", "w", encoding="utf-8") as f:
+            json.dump({"vocab_size": dl_config['vocab_size'], "max_len": dl_config['max_len']}, f)
+        with open(manifest_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+
+    experts = [e for e in EXPERTS if e != 'xgb' or _has_xgb()]
+    todo = [(e, k) for e in experts for k in range(n_folds) if not _fold_path(e, k).exists()]
+    print(f"   -> {len(experts) * n_folds - len(todo)} prédictions en cache, {len(todo)} à calculer.")
+
+    if todo:
+        workers = min(workers or os.cpu_count() or 1, len(todo))
+        n_threads = max(1, (os.cpu_count() or 1) // workers)
+        # 'spawn' : TensorFlow ne supporte pas d'être dupliqué par fork une fois initialisé
+        ctx = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+            for expert, fold in pool.map(_oof_fold_task, [(e, k, n_threads, str(OOF_DIR)) for e, k in todo]):
+                print(f"   ✅ {expert.upper()} fold {fold + 1}/{n_folds}")
+
+    folds = np.load(OOF_DIR / "folds.npy")
+    oof = {}
+    for e in experts:
+        preds = np.empty(len(folds), dtype=np.float32)
+        for k in range(n_folds):
+            preds[folds == k] = np.load(_fold_path(e, k))
+        oof[e] = preds
+        np.save(OOF_DIR / f"{e}_oof.npy", preds)
+    # Même convention qu'à l'inférence : un expert absent vote 0.0
+    X_stack = pd.DataFrame({e: oof.get(e, np.zeros(len(folds), dtype=np.float32)) for e in EXPERTS})
+    return X_stack, np.load(OOF_DIR / "y.npy")
+
+
+def _has_xgb():
+    from backend.app.services.train_model import HAS_XGB
+    return HAS_XGB
+
+
+def fit_judge(X_stack, y_true, C=1.0):
+    """Entraîne le Juge sur les prédictions OOF (réglable sans relancer les experts)."""
+    meta_model = LogisticRegression(C=C)
+    cv = StratifiedKFold(n_splits=N_FOLDS, shuffle=True, random_state=42)
+    y_pred_hybrid = cross_val_predict(meta_model, X_stack, y_true, cv=cv)
+    final_acc = accuracy_score(y_true, y_pred_hybrid)
+    print(f"\n🏆 PERFORMANCE HYBRIDE (OOF, {N_FOLDS} folds) : {final_acc:.4f}")
+
+    meta_model.fit(X_stack, y_true)
+    print("   Poids accordés aux experts :")
+    weights = list(zip(X_stack.columns, meta_model.coef_[0]))
+    for name, coef in sorted(weights, key=lambda x: x[1], reverse=True):
+        print(f"   - {name.upper()}: {coef:.2f}")
+    return meta_model, y_pred_hybrid
+
+
+def train_hybrid_oof(n_folds=N_FOLDS, workers=None, refresh=False, C=1.0):
+    print(f"--- 🧬 ENTRAÎNEMENT DU MODÈLE HYBRIDE (STACKING OUT-OF-FOLD, {n_folds} FOLDS) ---")
+    X_stack, y_true = compute_oof_predictions(n_folds=n_folds, workers=workers, refresh=refresh)
+    print("\n📊 Aperçu des votes (5 lignes) :")
+    print(X_stack.head())
+
+    meta_model, y_pred_hybrid = fit_judge(X_stack, y_true, C=C)
+    joblib.dump(meta_model, MODEL_DIR / "hybrid_meta.pkl")
+    print(f"\n💾 Modèle Sauvegardé : {MODEL_DIR / 'hybrid_meta.pkl'}")
+
+    df_results = pd.DataFrame({
+        'y_true': y_true,
+        'y_pred_rf': X_stack['rf'].round().astype(int),
+        'y_pred_hybrid': y_pred_hybrid
+    })
+    results_path = PROCESSED_DIR / "test_results_hybrid.csv"
+    df_results.to_csv(results_path, index=False)
+    print(f"✅ Fichier d'analyse généré : {results_path.name}")
+
+
 if __name__ == "__main__":
-    train_hybrid()
\ No newline at end of file
+    if "--oof" in sys.argv or dl_data_sharded():
+        train_hybrid_oof(refresh="--refresh" in sys.argv)
+    else:
+        train_hybrid()
\ No newline at end of file
@@ -10,6 +10,11 @@ from sklearn.linear_model import LogisticRegression
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import accuracy_score
 
+from backend.app.utils.pattern_engine import pattern_features_batch
+from backend.app.utils.keyboard_walk import keyboard_features_batch
+from backend.app.utils.dataset_io import read_dataset
+from backend.app.utils.pipeline_profiler import substep
+
 # Gestion de XGBoost (si pas installé, on ne l'utilise pas)
 try:
     from xgboost import XGBClassifier
@@ -100,34 +105,18 @@ def load_dictionaries():
         print("ERREUR CRITIQUE : Dictionnaire introuvable.")
         exit()
 
-def train():
-    print("--- 🚀 DÉBUT DE L'ENTRAÎNEMENT MULTI-MODÈLES ---")
-
-    # 1. Chargement des données
-    df = pd.read_csv(PROCESSED_DIR / "passwords_processed.csv")
-    print(f"Dataset chargé : {len(df)} lignes")
-
-    # 2. Préparation des features
-    dicts = load_dictionaries()
-    print("Calcul des features linguistiques en cours...")
-    linguistic_df = df['password'].apply(lambda x: calculate_linguistic_features(x, dicts))
-
-    # Fusion (Maths + Linguistique)
-    X = pd.concat([df[['length_norm', 'diversity', 'entropy']], linguistic_df], axis=1)
-    y = df['label']
-
-    # 3. Split Train/Test
-    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
-
-    # 4. Liste des modèles à générer
+def build_ml_classifiers():
+    """Liste des modèles ML à générer (nom, clé API, fichier, classifieur non entraîné)."""
     models_config = [
         {
             "name": "RandomForest",
+            "key": "rf",
             "file": "random_forest.pkl",
             "clf": RandomForestClassifier(n_estimators=100, random_state=42, n_jobs=-1)
         },
         {
             "name": "LogisticRegression",
+            "key": "log",
             "file": "logistic_regression.pkl",
             # max_iter élevé pour être sûr que ça converge
             "clf": LogisticRegression(max_iter=1000, random_state=42)
@@ -138,9 +127,43 @@ def train():
     if HAS_XGB:
         models_config.append({
             "name": "XGBoost",
+            "key": "xgb",
             "file": "xgboost.pkl",
             "clf": XGBClassifier(eval_metric='logloss', random_state=42)
         })
+    return models_config
+
+
+def train():
+    print("--- 🚀 DÉBUT DE L'ENTRAÎNEMENT MULTI-MODÈLES ---")
+
+    # 1. Chargement des données
+    with substep("chargement"):
+        df = read_dataset(PROCESSED_DIR / "passwords_processed")
+        dicts = load_dictionaries()
+    print(f"Dataset chargé : {len(df)} lignes")
+
+    # 2. Préparation des features
+    print("Calcul des features linguistiques en cours...")
+    with substep("features_linguistiques"):
+        linguistic_df = df['password'].apply(lambda x: calculate_linguistic_features(x, dicts))
+
+    print("Détection des motifs (suites, répétitions, dates)...")
+    with substep("features_motifs"):
+        patterns_df = pattern_features_batch(df['password'].astype(str))
+    print("Détection des suites de touches (QWERTY, AZERTY, pavé numérique)...")
+    with substep("features_clavier"):
+        keyboard_df = keyboard_features_batch(df['password'].astype(str))
+
+    # Fusion (Maths + Linguistique + Motifs + Clavier)
+    X = pd.concat([df[['length_norm', 'diversity', 'entropy']], linguistic_df, patterns_df, keyboard_df], axis=1)
+    y = df['label']
+
+    # 3. Split Train/Test
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+
+    # 4. Liste des modèles à générer
+    models_config = build_ml_classifiers()
 
     # 5. Boucle d'entraînement
     print(f"\nPréparation de {len(models_config)} modèles...")
@@ -150,7 +173,8 @@ def train():
         clf = m['clf']
 
         # Entraînement
-        clf.fit(X_train, y_train)
+        with substep(f"fit_{m['name']}"):
+            clf.fit(X_train, y_train)
 
         # Vérification rapide
         acc = accuracy_score(y_test, clf.predict(X_test))
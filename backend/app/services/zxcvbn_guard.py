@@ -0,0 +1,164 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait
+
+# --- IMPORT ZXCVBN ---
+try:
+    from zxcvbn import zxcvbn
+
+    HAS_ZXCVBN = True
+except ImportError:
+    HAS_ZXCVBN = False
+
+    def zxcvbn(pwd):
+        return {'score': 0, 'crack_times_display': {'offline_slow_hashing_1e4_per_second': 'N/A'}}
+
+# --- CONFIGURATION ---
+# Au-delà de cette longueur, seul le début du mot de passe est évalué (le coût de zxcvbn explose avec la longueur)
+ZXCVBN_MAX_LENGTH = int(os.getenv("ZXCVBN_MAX_LENGTH", "64"))
+# Budget par défaut (ms) d'une requête ; 0 = pas de limite (évaluation directe, sans thread)
+ZXCVBN_BUDGET_MS = float(os.getenv("ZXCVBN_BUDGET_MS", "0"))
+ZXCVBN_CACHE_SIZE = int(os.getenv("ZXCVBN_CACHE_SIZE", "4096"))
+ZXCVBN_WORKERS = int(os.getenv("ZXCVBN_WORKERS", "2"))
+
+# Statuts renvoyés dans details["zxcvbn_status"]
+STATUS_OK = "ok"
+STATUS_TRUNCATED = "truncated"      # Évalué sur les ZXCVBN_MAX_LENGTH premiers caractères
+STATUS_TIMEOUT = "timeout"          # Budget dépassé : résultat dégradé (score et temps à None)
+STATUS_SKIPPED = "skipped"          # Le client n'a demandé que le score IA
+STATUS_UNAVAILABLE = "unavailable"  # Bibliothèque zxcvbn absente
+STATUS_ERROR = "error"
+
+
+class ResultCache:
+    """Cache LRU des résultats zxcvbn. Les clés sont des empreintes : aucun mot de passe en clair n'est conservé."""
+
+    def __init__(self, size=ZXCVBN_CACHE_SIZE):
+        self.size = size
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(password):
+        return hashlib.sha256(password.encode('utf-8', 'surrogatepass')).digest()
+
+    def get(self, key):
+        with self.lock:
+            result = self.entries.get(key)
+            if result is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return result
+
+    def put(self, key, result):
+        if self.size <= 0:
+            return
+        with self.lock:
+            self.entries[key] = result
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.size:
+                self.entries.popitem(last=False)
+
+    def status(self):
+        with self.lock:
+            return {"size": len(self.entries), "capacity": self.size, "hits": self.hits, "misses": self.misses}
+
+
+cache = ResultCache()
+_executor = None
+_executor_lock = threading.Lock()
+# Évaluations en cours (clé -> future) : un mot de passe déjà en calcul n'est pas relancé
+_pending = {}
+_pending_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=ZXCVBN_WORKERS, thread_name_prefix="zxcvbn")
+        return _executor
+
+
+def _run(password):
+    """Évaluation bornée en longueur. Renvoie le résultat réduit aux champs utilisés par l'API."""
+    truncated = len(password) > ZXCVBN_MAX_LENGTH
+    stats = zxcvbn(password[:ZXCVBN_MAX_LENGTH])
+    return {
+        "zxcvbn_score": stats['score'],  # 0, 1, 2, 3, 4
+        "zxcvbn_time": stats['crack_times_display']['offline_slow_hashing_1e4_per_second'],  # Temps estimé humain
+        "zxcvbn_status": STATUS_TRUNCATED if truncated else STATUS_OK,
+    }
+
+
+def _degraded(status):
+    return {"zxcvbn_score": None, "zxcvbn_time": None, "zxcvbn_status": status}
+
+
+def _submit(key, password):
+    with _pending_lock:
+        future = _pending.get(key)
+        if future is None:
+            future = _get_executor().submit(_run, password)
+            _pending[key] = future
+            # Même après un dépassement de budget, le résultat finit dans le cache pour les requêtes suivantes
+            future.add_done_callback(lambda f, k=key: _finish(k, f))
+        return future
+
+
+def _finish(key, future):
+    with _pending_lock:
+        _pending.pop(key, None)
+    if future.exception() is None:
+        cache.put(key, future.result())
+
+
+def evaluate_batch(passwords, enabled=True, budget_ms=None):
+    """
+    Résultats zxcvbn d'un lot (un dict par mot de passe, dans l'ordre).
+    budget_ms borne le temps total passé sur le lot ; les mots de passe non évalués à temps
+    reçoivent un résultat dégradé (statut "timeout").
+    """
+    if not enabled:
+        return [_degraded(STATUS_SKIPPED) for _ in passwords]
+    if not HAS_ZXCVBN:
+        return [dict(_run(p), zxcvbn_status=STATUS_UNAVAILABLE) for p in passwords]
+
+    budget_ms = ZXCVBN_BUDGET_MS if budget_ms is None else budget_ms
+    keys = [ResultCache.key(p) for p in passwords]
+    results = [cache.get(k) for k in keys]
+    missing = [i for i, r in enumerate(results) if r is None]
+    if not missing:
+        return results
+
+    if budget_ms <= 0:
+        for i in missing:
+            results[i] = _run(passwords[i])
+            cache.put(keys[i], results[i])
+        return results
+
+    futures = {i: _submit(keys[i], passwords[i]) for i in missing}
+    wait(futures.values(), timeout=budget_ms / 1000.0)
+    for i, future in futures.items():
+        if not future.done():
+            results[i] = _degraded(STATUS_TIMEOUT)
+        elif future.exception() is not None:
+            results[i] = _degraded(STATUS_ERROR)
+        else:
+            results[i] = future.result()
+    return results
+
+
+def evaluate(password, enabled=True, budget_ms=None):
+    return evaluate_batch([password], enabled, budget_ms)[0]
+
+
+def status():
+    return {"available": HAS_ZXCVBN, "max_length": ZXCVBN_MAX_LENGTH, "default_budget_ms": ZXCVBN_BUDGET_MS,
+            "cache": cache.status()}
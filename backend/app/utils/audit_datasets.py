@@ -1,13 +1,24 @@
 import pandas as pd
 import matplotlib.pyplot as plt
 from pathlib import Path
+import argparse
 import sys
 
 # --- CONFIGURATION DES CHEMINS ---
 BASE_DIR = Path(__file__).resolve().parents[3]
-PROCESSED_DATASET = BASE_DIR / "datasets" / "processed" / "passwords_processed.csv"
+sys.path.append(str(BASE_DIR))
+
+from backend.app.utils.dataset_io import dataset_exists, iter_dataset, read_dataset
+from backend.app.utils.leak_sampler import LEAK_PATTERNS, find_leak_files, iter_passwords
+from backend.app.utils.sketches import HeavyHitters, HyperLogLog, PasswordHistograms
+
+PROCESSED_DATASET = BASE_DIR / "datasets" / "processed" / "passwords_processed"
 LINGUISTIC_DICT = BASE_DIR / "datasets" / "Dictionnaries" / "processed" / "linguistic_dictionary.csv"
 
+# Mode flux (--stream) : lignes lues par morceau, mémoire bornée par les sketches
+STREAM_CHUNKSIZE = 500_000
+TOP_K = 20
+
 
 def print_header(title):
     print(f"\n{'=' * 60}")
@@ -18,17 +29,23 @@ def print_header(title):
 def audit_passwords():
     print_header("AUDIT 1 : DATASET D'ENTRAÎNEMENT (Passwords)")
 
-    if not PROCESSED_DATASET.exists():
-        print("❌ ERREUR : Le fichier passwords_processed.csv est introuvable.")
+    if not dataset_exists(PROCESSED_DATASET):
+        print("❌ ERREUR : Le fichier passwords_processed (.parquet / .csv) est introuvable.")
         return
 
-    df = pd.read_csv(PROCESSED_DATASET)
+    # Seules les colonnes auditées sont lues
+    df = read_dataset(PROCESSED_DATASET, columns=['password', 'label'])
     total = len(df)
     print(f"Total lignes : {total}")
 
     # 1. Équilibre des Classes (Fort vs Faible)
-    counts = df['label'].value_counts()
+    report_labels(df['label'].value_counts(), total)
+
+    # 2. Doublons
+    report_duplicates(df.duplicated(subset=['password']).sum())
 
+
+def report_labels(counts, total):
     # On gère le cas où il manquerait une classe
     nb_weak = counts.get(0, 0)
     nb_strong = counts.get(1, 0)
@@ -46,10 +63,11 @@ def audit_passwords():
     else:
         print("⚠️ DIAGNOSTIC : Déséquilibre détecté ! L'IA risque d'être biaisée.")
 
-    # 2. Doublons
-    duplicates = df.duplicated(subset=['password']).sum()
+
+def report_duplicates(duplicates, approx=False):
+    prefix = "~" if approx else ""
     if duplicates > 0:
-        print(f"\n⚠️ ATTENTION : Il y a {duplicates} doublons de mots de passe !")
+        print(f"\n⚠️ ATTENTION : Il y a {prefix}{duplicates} doublons de mots de passe !")
     else:
         print("\n✅ Aucun doublon détecté.")
 
@@ -66,8 +84,10 @@ def audit_dictionary():
     print(f"Total tokens : {total}")
 
     # Répartition par catégorie
-    counts = df['category'].value_counts()
+    report_categories(df['category'].value_counts(), total)
+
 
+def report_categories(counts, total):
     print(f"\n--- Répartition par Catégorie ---")
     for category, count in counts.items():
         pct = (count / total) * 100
@@ -89,10 +109,122 @@ def audit_dictionary():
         print("⚠️ Vocabulaire Anglais : Pauvre. Risque de rater des attaques par dictionnaire.")
 
 
+# --- MODE FLUX (CORPUS DE PLUSIEURS MILLIONS DE LIGNES) ---
+def is_leak_file(path):
+    return any(Path(path).match(pattern) for pattern in LEAK_PATTERNS)
+
+
+def iter_chunks(sources, chunksize=STREAM_CHUNKSIZE):
+    """Morceaux (DataFrame) des sources : fichiers de fuites bruts, dossiers de fuites ou datasets CSV/Parquet."""
+    for source in sources:
+        source = Path(source)
+        if source.is_dir():
+            yield from iter_chunks(find_leak_files(source), chunksize)
+        elif is_leak_file(source):
+            for passwords in iter_passwords(source):
+                yield pd.DataFrame({'password': [p.decode('latin-1') for p in passwords]})
+        else:
+            yield from iter_dataset(source, chunksize=chunksize)
+
+
+class StreamingPasswordAudit:
+    """Une seule passe, mémoire bornée : HyperLogLog (distincts), Count-Min (top), histogrammes, labels."""
+
+    def __init__(self, top_k=TOP_K):
+        self.total = 0
+        self.labels = pd.Series(dtype='int64')
+        self.distinct = HyperLogLog()
+        self.heavy = HeavyHitters(top_k)
+        self.histograms = PasswordHistograms()
+
+    def add(self, chunk):
+        passwords = chunk['password'].astype(str).to_numpy(dtype=object)
+        self.total += len(passwords)
+        if 'label' in chunk:
+            self.labels = self.labels.add(chunk['label'].value_counts(), fill_value=0).astype('int64')
+        self.distinct.add(passwords)
+        self.heavy.add(passwords)
+        self.histograms.add(passwords)
+
+    def report(self):
+        print(f"Total lignes : {self.total}")
+        if self.total == 0:
+            return
+        if len(self.labels):
+            report_labels(self.labels, self.total)
+        else:
+            print("\n--- Répartition des Labels ---")
+            print("ℹ️ Aucune colonne 'label' (corpus de fuites brut).")
+
+        distinct = min(self.distinct.count(), self.total)
+        print(f"\nMots de passe distincts : ~{distinct} (HyperLogLog)")
+        report_duplicates(self.total - distinct, approx=True)
+
+        print(f"\n--- Top {self.heavy.k} des mots de passe (Count-Min, surestimation possible) ---")
+        for rank, (password, count) in enumerate(self.heavy.top(), 1):
+            print(f"{rank:3d}. {password!r:<30} {count:10d} ({count / self.total * 100:.2f}%)")
+
+        hist = self.histograms
+        print("\n--- Longueurs ---")
+        for length in range(1, hist.max_length + 1):
+            if hist.lengths[length]:
+                label = f"{length}+" if length == hist.max_length else str(length)
+                print(f"- {label:>3} car. : {hist.lengths[length]:10d} ({hist.lengths[length] / self.total * 100:.2f}%)")
+
+        print("\n--- Classes de caractères ---")
+        for cls, count in hist.classes.items():
+            print(f"- {cls:<6} : {count:10d} ({count / self.total * 100:.2f}%)")
+        for n, count in enumerate(hist.n_classes):
+            print(f"- {n} classe(s) : {count:10d} ({count / self.total * 100:.2f}%)")
+
+
+def audit_passwords_stream(sources, chunksize=STREAM_CHUNKSIZE):
+    print_header("AUDIT 1 : DATASET D'ENTRAÎNEMENT (Passwords, flux)")
+    audit = StreamingPasswordAudit()
+    for chunk in iter_chunks(sources, chunksize):
+        audit.add(chunk)
+    audit.report()
+    return audit
+
+
+def audit_dictionary_stream(chunksize=STREAM_CHUNKSIZE):
+    print_header("AUDIT 2 : DICTIONNAIRE LINGUISTIQUE (flux)")
+
+    if not LINGUISTIC_DICT.exists():
+        print("❌ ERREUR : Le fichier linguistic_dictionary.csv est introuvable.")
+        return
+
+    total = 0
+    counts = pd.Series(dtype='int64')
+    distinct = HyperLogLog()
+    for chunk in iter_dataset(LINGUISTIC_DICT, columns=['token', 'category'], chunksize=chunksize):
+        total += len(chunk)
+        counts = counts.add(chunk['category'].value_counts(), fill_value=0).astype('int64')
+        distinct.add(chunk['token'].to_numpy(dtype=object))
+    print(f"Total tokens : {total} (~{min(distinct.count(), total)} distincts)")
+    report_categories(counts.sort_values(ascending=False), total)
+
+
 def main():
+    parser = argparse.ArgumentParser(description="Audit des datasets d'entraînement et du dictionnaire")
+    parser.add_argument("--stream", nargs="*", metavar="SOURCE",
+                        help="Audit en flux à mémoire bornée (défaut : dataset d'entraînement + dictionnaire ; "
+                             "sinon fichiers/dossiers de fuites ou datasets CSV/Parquet)")
+    parser.add_argument("--chunksize", type=int, default=STREAM_CHUNKSIZE)
+    args = parser.parse_args()
+
     try:
-        audit_passwords()
-        audit_dictionary()
+        if args.stream is None:
+            audit_passwords()
+            audit_dictionary()
+        elif args.stream:
+            audit_passwords_stream(args.stream, args.chunksize)
+        else:
+            if dataset_exists(PROCESSED_DATASET):
+                audit_passwords_stream([PROCESSED_DATASET], args.chunksize)
+            else:
+                print("❌ ERREUR : Le fichier passwords_processed (.parquet / .csv) est introuvable.")
+            audit_dictionary_stream(args.chunksize)
         print("\n=== AUDIT TERMINÉ ===")
     except Exception as e:
         print(f"\n❌ Une erreur est survenue pendant l'audit : {e}")
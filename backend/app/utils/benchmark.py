@@ -28,6 +28,7 @@ BASE_DIR = Path(__file__).resolve().parents[3]
 sys.path.append(str(BASE_DIR))
 
 from backend.app.utils.math_features import compute_length_norm, compute_diversity, compute_entropy
+from backend.app.utils.dataset_io import dataset_exists, read_dataset
 
 # --- CONFIGURATION ---
 PROCESSED_DIR = BASE_DIR / "datasets" / "processed"
@@ -37,10 +38,10 @@ OUTPUT_IMG_DIR = BASE_DIR  # Racine du projet
 
 def load_data_and_features():
     print("⏳ Chargement des données...")
-    if not (PROCESSED_DIR / "passwords_processed.csv").exists():
-        raise FileNotFoundError("passwords_processed.csv manquant.")
+    if not dataset_exists(PROCESSED_DIR / "passwords_processed"):
+        raise FileNotFoundError("passwords_processed (.parquet / .csv) manquant.")
 
-    df = pd.read_csv(PROCESSED_DIR / "passwords_processed.csv")
+    df = read_dataset(PROCESSED_DIR / "passwords_processed")
 
     print("⏳ Chargement du dictionnaire...")
     corpus = pd.read_csv(DICT_DIR / "linguistic_dictionary.csv")
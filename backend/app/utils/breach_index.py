@@ -0,0 +1,241 @@
+import argparse
+import csv
+import hashlib
+import mmap
+import os
+import shutil
+import struct
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+# --- CONFIGURATION DU CHEMIN (Pour trouver les modules) ---
+BASE_DIR = Path(__file__).resolve().parents[3]
+sys.path.append(str(BASE_DIR))
+
+from backend.app.utils.leak_sampler import find_leak_files, iter_passwords
+
+LEAKS_DIR = BASE_DIR / "datasets" / "raw" / "leaks"
+PROCESSED_DIR = BASE_DIR / "datasets" / "processed"
+# Sortie de external_dedup.py ("password","count") : utilisée en priorité si elle existe
+FREQUENCIES_FILE = PROCESSED_DIR / "leak_frequencies.csv"
+INDEX_FILE = Path(os.getenv("BREACH_INDEX_PATH", PROCESSED_DIR / "breach_index.bin"))
+
+# --- FORMAT DU FICHIER ---
+# En-tête | table de fan-out (2^20 + 1 positions uint64) | enregistrements triés (SHA-1 20 octets + compteur uint32)
+MAGIC = b"BRIX"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<4sIQI")  # magic, version, nombre d'enregistrements, bits de préfixe
+PREFIX_BITS = 20  # = 5 caractères hexadécimaux, comme l'API "range" de HaveIBeenPwned
+FANOUT_SIZE = (1 << PREFIX_BITS) + 1
+HASH_SIZE = 20
+RECORD = np.dtype([('hash', 'S20'), ('count', '<u4')])
+MAX_COUNT = np.iinfo(np.uint32).max
+
+# Le premier octet du hash sert de bucket : les buckets triés puis concaténés forment un fichier trié
+N_BUCKETS = 256
+FLUSH_RECORDS = 65536
+# Plafond de l'ensemble des tampons de la phase 1 (octets) : au-delà, tous les buckets sont écrits sur disque
+PARTITION_BUFFER_BYTES = 64 * 1024 * 1024
+
+
+# --- CONSTRUCTION ---
+def iter_counted_passwords(sources):
+    """(mot de passe bytes, nombre d'occurrences) depuis un CSV de fréquences ou des fichiers de fuites bruts."""
+    for path in sources:
+        path = Path(path)
+        if path.suffix == ".csv":
+            with open(path, "r", encoding="ascii", errors="ignore", newline="") as f:
+                reader = csv.reader(f)
+                next(reader, None)
+                for row in reader:
+                    if len(row) >= 2 and row[0]:
+                        yield row[0].encode("ascii"), int(row[1])
+        else:
+            for passwords in iter_passwords(path):
+                for pwd in passwords:
+                    yield pwd, 1
+
+
+def _partition(sources, work_dir, max_buffered=PARTITION_BUFFER_BYTES):
+    """
+    Phase 1 : chaque hash est écrit dans le bucket de son premier octet. Les enregistrements sont empaquetés
+    dans un bytearray par bucket (24 octets chacun, sans objet Python par enregistrement) ; un bucket est écrit
+    à FLUSH_RECORDS enregistrements, et tous le sont quand l'ensemble des tampons dépasse max_buffered.
+    """
+    buffers = [bytearray() for _ in range(N_BUCKETS)]
+    paths = [Path(work_dir) / f"bucket-{b:03d}.bin" for b in range(N_BUCKETS)]
+    flush_bytes = FLUSH_RECORDS * RECORD.itemsize
+    pack_count = struct.Struct("<I").pack
+    buffered = 0
+
+    def flush(b):
+        nonlocal buffered
+        if buffers[b]:
+            with open(paths[b], "ab") as f:
+                f.write(buffers[b])
+            buffered -= len(buffers[b])
+            buffers[b] = bytearray()
+
+    total = 0
+    for pwd, count in iter_counted_passwords(sources):
+        digest = hashlib.sha1(pwd).digest()
+        b = digest[0]
+        buffers[b] += digest
+        buffers[b] += pack_count(min(count, MAX_COUNT))
+        buffered += RECORD.itemsize
+        total += 1
+        if len(buffers[b]) >= flush_bytes:
+            flush(b)
+        if buffered >= max_buffered:
+            for other in range(N_BUCKETS):
+                flush(other)
+    for b in range(N_BUCKETS):
+        flush(b)
+    return paths, total
+
+
+def _sorted_bucket(path):
+    """Phase 2 : tri d'un bucket et fusion des doublons (compteurs additionnés, plafonnés à uint32)."""
+    if not path.exists():
+        return np.empty(0, dtype=RECORD)
+    records = np.fromfile(path, dtype=RECORD)
+    records = records[np.argsort(records['hash'], kind='stable')]
+    hashes, starts = np.unique(records['hash'], return_index=True)
+    counts = np.minimum(np.add.reduceat(records['count'].astype(np.uint64), starts), MAX_COUNT)
+    out = np.empty(len(hashes), dtype=RECORD)
+    out['hash'], out['count'] = hashes, counts
+    return out
+
+
+def _prefixes(records):
+    raw = records.view(np.uint8).reshape(-1, RECORD.itemsize)[:, :3].astype(np.uint32)
+    return ((raw[:, 0] << 16) | (raw[:, 1] << 8) | raw[:, 2]) >> (24 - PREFIX_BITS)
+
+
+def build_breach_index(sources, output_path=INDEX_FILE, tmp_dir=None):
+    """
+    Construit l'index trié des SHA-1 des mots de passe fuités.
+    Mémoire : au plus PARTITION_BUFFER_BYTES de tampons pendant le partitionnement, puis le plus gros
+    bucket (1/256 du corpus) pendant le tri, jamais le corpus entier.
+    Renvoie le nombre de hashs distincts.
+    """
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    work_dir = Path(tempfile.mkdtemp(prefix="breach-", dir=tmp_dir or output_path.parent))
+    tmp_output = output_path.with_suffix(".tmp")
+    try:
+        print(f"   -> Phase 1 : hachage et partitionnement en {N_BUCKETS} buckets...")
+        paths, total = _partition(sources, work_dir)
+
+        print(f"   -> Phase 2 : tri des buckets ({total} entrées)...")
+        fanout_counts = np.zeros(FANOUT_SIZE - 1, dtype=np.uint64)
+        n_records = 0
+        with open(tmp_output, "wb") as out:
+            out.write(b"\0" * (HEADER.size + FANOUT_SIZE * 8))
+            for path in paths:
+                records = _sorted_bucket(path)
+                if len(records):
+                    fanout_counts += np.bincount(_prefixes(records), minlength=FANOUT_SIZE - 1).astype(np.uint64)
+                    records.tofile(out)
+                    n_records += len(records)
+                path.unlink(missing_ok=True)
+
+            fanout = np.zeros(FANOUT_SIZE, dtype='<u8')
+            np.cumsum(fanout_counts, out=fanout[1:])
+            out.seek(0)
+            out.write(HEADER.pack(MAGIC, FORMAT_VERSION, n_records, PREFIX_BITS))
+            out.write(fanout.tobytes())
+        # Remplacement atomique : un serveur qui lit l'ancien index n'est pas perturbé
+        os.replace(tmp_output, output_path)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+        if tmp_output.exists():
+            tmp_output.unlink()
+
+    print(f"✅ {n_records} hashs distincts -> {output_path.name}")
+    return n_records
+
+
+# --- CONSULTATION ---
+class BreachIndex:
+    """
+    Index projeté en mémoire (mmap) : seules les pages consultées sont lues.
+    La table de fan-out donne la plage d'un préfixe de 5 caractères hex, puis recherche dichotomique dedans.
+    """
+
+    def __init__(self, path=INDEX_FILE):
+        self.path = Path(path)
+        self.file = open(self.path, "rb")
+        self.mm = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.n_records, prefix_bits = HEADER.unpack_from(self.mm, 0)
+        if magic != MAGIC or version != FORMAT_VERSION or prefix_bits != PREFIX_BITS:
+            self.close()
+            raise ValueError(f"Index de fuites invalide : {self.path}")
+        self.fanout = np.frombuffer(self.mm, dtype='<u8', count=FANOUT_SIZE, offset=HEADER.size)
+        self.data_offset = HEADER.size + FANOUT_SIZE * 8
+
+    @classmethod
+    def open_default(cls, path=INDEX_FILE):
+        """L'index s'il a été construit, sinon None (le service fonctionne sans)."""
+        try:
+            return cls(path) if Path(path).exists() else None
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Index de fuites ignoré : {e}")
+            return None
+
+    def close(self):
+        self.fanout = None
+        self.mm.close()
+        self.file.close()
+
+    def _hash_at(self, i):
+        pos = self.data_offset + i * RECORD.itemsize
+        return self.mm[pos:pos + HASH_SIZE]
+
+    def _count_at(self, i):
+        return struct.unpack_from("<I", self.mm, self.data_offset + i * RECORD.itemsize + HASH_SIZE)[0]
+
+    def _bounds(self, prefix):
+        return int(self.fanout[prefix]), int(self.fanout[prefix + 1])
+
+    def count_hash(self, digest):
+        """Nombre d'occurrences d'un SHA-1 (20 octets) dans les fuites, 0 s'il est absent."""
+        lo, hi = self._bounds(int.from_bytes(digest[:3], "big") >> (24 - PREFIX_BITS))
+        while lo < hi:
+            mid = (lo + hi) // 2
+            current = self._hash_at(mid)
+            if current < digest:
+                lo = mid + 1
+            elif current > digest:
+                hi = mid
+            else:
+                return self._count_at(mid)
+        return 0
+
+    def count(self, password):
+        return self.count_hash(hashlib.sha1(password.encode("utf-8")).digest())
+
+    def range(self, prefix5):
+        """Suffixes (35 caractères hex) et compteurs des hashs commençant par prefix5 (k-anonymat)."""
+        lo, hi = self._bounds(int(prefix5, 16))
+        start = self.data_offset + lo * RECORD.itemsize
+        records = np.frombuffer(self.mm, dtype=RECORD, count=hi - lo, offset=start) if hi > lo else []
+        return [(r['hash'].ljust(HASH_SIZE, b"\0").hex().upper()[5:], int(r['count'])) for r in records]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Index local (SHA-1 triés) des mots de passe fuités")
+    parser.add_argument("sources", nargs="*",
+                        help="Fichiers de fuites ou CSV de fréquences (défaut : leak_frequencies.csv, sinon leaks/)")
+    parser.add_argument("--output", default=str(INDEX_FILE))
+    args = parser.parse_args()
+
+    print("--- 🔐 CONSTRUCTION DE L'INDEX DES FUITES (SHA-1) ---")
+    sources = args.sources or ([FREQUENCIES_FILE] if FREQUENCIES_FILE.exists() else find_leak_files(LEAKS_DIR))
+    if not sources:
+        print(f"❌ Aucune fuite trouvée ({FREQUENCIES_FILE.name} ou {LEAKS_DIR})")
+        sys.exit(1)
+    build_breach_index(sources, args.output)
@@ -0,0 +1,150 @@
+import csv
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# --- IMPORT PYARROW (format colonnaire) ---
+try:
+    import pyarrow.parquet as pq
+
+    HAS_PARQUET = True
+except ImportError:
+    HAS_PARQUET = False
+
+# --- CONFIGURATION ---
+# Format d'échange entre les étapes du pipeline : "parquet" (colonnes typées, lecture par colonne, mmap) ou "csv"
+DATASET_FORMAT = os.getenv("DATASET_FORMAT", "parquet" if HAS_PARQUET else "csv")
+# "1" : une copie CSV (QUOTE_NONNUMERIC, l'ancien format) est exportée à côté de chaque Parquet
+DATASET_CSV_EXPORT = os.getenv("DATASET_CSV_EXPORT", "0") == "1"
+# Taille des groupes de lignes Parquet (unité de lecture de iter_dataset)
+ROW_GROUP_SIZE = 500_000
+
+# Types compacts : features en float32, labels et indicateurs 0/1 en int8
+LABEL_COLUMNS = {'label'}
+TEXT_COLUMNS = {'password', 'token', 'category'}
+
+
+def compact_dtypes(df):
+    """float64 -> float32, entiers -> plus petit type signé suffisant (int8 pour labels et indicateurs)."""
+    df = df.copy()
+    for col in df.columns:
+        series = df[col]
+        if col in TEXT_COLUMNS:
+            df[col] = series.astype(str)
+        elif col in LABEL_COLUMNS:
+            df[col] = series.astype(np.int8)
+        elif pd.api.types.is_float_dtype(series):
+            df[col] = series.astype(np.float32)
+        elif pd.api.types.is_bool_dtype(series):
+            df[col] = series.astype(np.int8)
+        elif pd.api.types.is_integer_dtype(series) and len(series):
+            df[col] = pd.to_numeric(series, downcast='integer')
+    return df
+
+
+def _candidates(path):
+    path = Path(path)
+    return path.with_suffix(".parquet"), path.with_suffix(".csv")
+
+
+def dataset_path(path):
+    """
+    Fichier réel d'un dataset ("passwords_processed", avec ou sans extension) : le Parquet s'il existe
+    et que pyarrow est installé, sinon le CSV. Si aucun n'existe, le chemin du format configuré.
+    """
+    parquet, csv_path = _candidates(path)
+    if HAS_PARQUET and parquet.exists():
+        return parquet
+    if csv_path.exists():
+        return csv_path
+    return parquet if DATASET_FORMAT == "parquet" and HAS_PARQUET else csv_path
+
+
+def dataset_exists(path):
+    return dataset_path(path).exists()
+
+
+def read_dataset(path, columns=None):
+    """
+    Lecture d'un dataset (seulement les colonnes demandées). Le Parquet est projeté en mémoire (mmap) ;
+    le CSV est lu sans conversion des mots de passe "null", "NaN"... en valeurs manquantes.
+    """
+    path = dataset_path(path)
+    if path.suffix == ".parquet":
+        return pd.read_parquet(path, columns=columns, memory_map=True)
+    dtypes = {c: str for c in TEXT_COLUMNS}
+    return compact_dtypes(pd.read_csv(path, usecols=columns, keep_default_na=False, na_values=[], dtype=dtypes))
+
+
+def iter_dataset(path, columns=None, chunksize=ROW_GROUP_SIZE):
+    """Lecture en flux, par morceaux d'au plus chunksize lignes (mémoire constante)."""
+    path = dataset_path(path)
+    if path.suffix == ".parquet":
+        parquet_file = pq.ParquetFile(path, memory_map=True)
+        for batch in parquet_file.iter_batches(batch_size=chunksize, columns=columns):
+            yield batch.to_pandas()
+        return
+    dtypes = {c: str for c in TEXT_COLUMNS}
+    for chunk in pd.read_csv(path, usecols=columns, chunksize=chunksize, keep_default_na=False, na_values=[],
+                             dtype=dtypes):
+        yield compact_dtypes(chunk)
+
+
+def export_csv(df, path):
+    """Export CSV de l'ancien format (QUOTE_NONNUMERIC) : pour les outils externes, plus pour le pipeline."""
+    path = Path(path).with_suffix(".csv")
+    df.to_csv(path, index=False, sep=',', quoting=csv.QUOTE_NONNUMERIC)
+    return path
+
+
+def write_dataset(df, path, fmt=None, csv_export=None):
+    """
+    Écrit un dataset au format configuré avec des types compacts. L'écriture passe par un fichier
+    temporaire remplacé atomiquement. L'autre format éventuellement présent est supprimé
+    (pas de CSV périmé lu à la place du Parquet). Renvoie le chemin écrit.
+    """
+    fmt = fmt or DATASET_FORMAT
+    csv_export = DATASET_CSV_EXPORT if csv_export is None else csv_export
+    if fmt == "parquet" and not HAS_PARQUET:
+        print("⚠️ pyarrow absent : dataset écrit en CSV.")
+        fmt = "csv"
+
+    parquet, csv_path = _candidates(path)
+    df = compact_dtypes(df)
+    target = parquet if fmt == "parquet" else csv_path
+    tmp = target.with_name(target.name + ".tmp")
+    if fmt == "parquet":
+        df.to_parquet(tmp, index=False, row_group_size=ROW_GROUP_SIZE)
+    else:
+        df.to_csv(tmp, index=False, sep=',', quoting=csv.QUOTE_NONNUMERIC)
+    os.replace(tmp, target)
+
+    if fmt == "parquet" and csv_export:
+        export_csv(df, csv_path)
+    elif fmt == "parquet" and csv_path.exists():
+        csv_path.unlink()
+    elif fmt == "csv" and parquet.exists():
+        parquet.unlink()
+    return target
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description="Conversion d'un dataset entre CSV et Parquet")
+    parser.add_argument("path", help="Dataset (ex : datasets/processed/passwords_processed)")
+    parser.add_argument("--to", choices=["parquet", "csv"], default="parquet")
+    args = parser.parse_args()
+
+    source = dataset_path(args.path)
+    if not source.exists():
+        print(f"❌ Dataset introuvable : {args.path}")
+        sys.exit(1)
+    data = read_dataset(source)
+    if args.to == "csv":
+        print(f"✅ Export CSV -> {export_csv(data, source)}")
+    else:
+        print(f"✅ {len(data)} lignes -> {write_dataset(data, source, fmt=args.to)}")
@@ -2,11 +2,14 @@ from pathlib import Path
 import pandas as pd
 import string
 import secrets
-import random  # Utilisé UNIQUEMENT pour piocher dans les fichiers, pas pour générer les mots de passe
-import csv
 
 # --- IMPORT DES CALCULS MATHÉMATIQUES ---
 from backend.app.utils.math_features import compute_length_norm, compute_diversity, compute_entropy
+from backend.app.utils.leak_sampler import find_leak_files, sample_leak_files
+from backend.app.utils.external_dedup import dedup_leak_files, DEFAULT_MEMORY_MB
+from backend.app.utils.strong_generator import generate_strong_passwords_bulk, has_required_classes
+from backend.app.utils.dataset_io import read_dataset, write_dataset
+from backend.app.utils.pipeline_profiler import substep
 
 # --- CONFIGURATION DES CHEMINS ---
 DATASET_DIR = Path(__file__).resolve().parents[3] / "datasets"
@@ -68,65 +71,52 @@ def generate_strong_password(min_len=14, max_len=32):
         ]
         alphabet = sys_random.choice(pools)
 
-    return ''.join(sys_random.choice(alphabet) for _ in range(length))
+    # Tirage rejeté s'il manque une classe de caractères de l'alphabet (minuscule, majuscule, chiffre, symbole)
+    while True:
+        password = ''.join(sys_random.choice(alphabet) for _ in range(length))
+        if has_required_classes(password, alphabet):
+            return password
 
 
-def create_strong_passwords_csv(n=50000, filename="strong_passwords.csv"):
+def create_strong_passwords_csv(n=50000, filename="strong_passwords", workers=None):
     print(f"Génération de {n} mots de passe FORTS (CSPRNG & Diceware)...")
-    passwords = [generate_strong_password() for _ in range(n)]
+    # Génération par lots (os.urandom + NumPy), même distribution que generate_strong_password
+    passwords = generate_strong_passwords_bulk(n, WORD_LIST, workers=workers)
     df = pd.DataFrame({"password": passwords, "label": 1})
-    df.to_csv(RAW_DIR / filename, index=False, sep=',', quoting=csv.QUOTE_NONNUMERIC)
-    print(f"✅ Sauvegardé dans {filename}")
+    path = write_dataset(df, RAW_DIR / filename)
+    print(f"✅ Sauvegardé dans {path.name}")
     return df
 
 
 # --- EXTRACTION DES MOTS DE PASSE FAIBLES (LABEL 0) ---
-def load_weak_passwords_sample(n=50000):
-    """Lit TOUS les fichiers .txt dans datasets/raw/leaks/ et échantillonne (Reservoir Sampling)"""
-    txt_files = list(LEAKS_DIR.glob("*.txt"))
+def load_weak_passwords_sample(n=50000, workers=None):
+    """
+    Lit TOUS les fichiers de fuites (.txt, .txt.gz, .txt.xz, .txt.bz2) de datasets/raw/leaks/
+    et échantillonne (Reservoir Sampling parallèle, voir leak_sampler.py)
+    """
+    txt_files = find_leak_files(LEAKS_DIR)
 
     if not txt_files:
         print(f"⚠️ Aucun fichier trouvé dans {LEAKS_DIR}. Je cherche dans {RAW_DIR}...")
-        txt_files = list(RAW_DIR.glob("*.txt"))
+        txt_files = find_leak_files(RAW_DIR)
 
     if not txt_files:
         raise FileNotFoundError(f"❌ AUCUN dictionnaire de fuites (.txt) trouvé ! Ajoutez RockYou ou Top29M.")
 
     print(f"Lecture et échantillonnage depuis {len(txt_files)} fichiers de leaks...")
     reservoir = []
-    seen = set()
-    total_lines = 0
 
     try:
-        for filepath in txt_files:
-            print(f"   -> Analyse de {filepath.name}...")
-            with open(filepath, "r", encoding="latin-1", errors="ignore") as f:
-                for line in f:
-                    pwd = line.strip()
-                    # Ignorer les vides, trop longs ou déjà vus
-                    if not pwd or len(pwd) > 50 or pwd in seen:
-                        continue
-
-                    total_lines += 1
-
-                    # Logique du Reservoir Sampling
-                    if len(reservoir) < n:
-                        reservoir.append(pwd)
-                        seen.add(pwd)
-                    else:
-                        # random() classique est suffisant ici (rapidité pour 40M de lignes)
-                        j = random.randint(0, total_lines - 1)
-                        if j < n:
-                            seen.remove(reservoir[j])
-                            reservoir[j] = pwd
-                            seen.add(pwd)
+        reservoir = sample_leak_files(txt_files, n, workers=workers)
     except KeyboardInterrupt:
         print("\n⚠️ Arrêt manuel de l'échantillonnage.")
 
+    # Dédoublonnage (l'ordre du tirage est conservé)
+    reservoir = list(dict.fromkeys(reservoir))
     return pd.DataFrame({"password": reservoir})
 
 
-def create_weak_passwords_csv(n=50000, filename="weak_passwords.csv"):
+def create_weak_passwords_csv(n=50000, filename="weak_passwords"):
     print(f"Extraction de {n} mots de passe FAIBLES depuis les leaks...")
     # On tire un peu plus de lignes au cas où le nettoyage en supprime
     df = load_weak_passwords_sample(int(n * 1.5))
@@ -138,29 +128,53 @@ def create_weak_passwords_csv(n=50000, filename="weak_passwords.csv"):
     # On coupe à n exactement
     df = df.head(n)
     df["label"] = 0
-    df.to_csv(RAW_DIR / filename, index=False, sep=',', quoting=csv.QUOTE_NONNUMERIC)
-    print(f"✅ Sauvegardé dans {filename} ({len(df)} lignes)")
+    path = write_dataset(df, RAW_DIR / filename)
+    print(f"✅ Sauvegardé dans {path.name} ({len(df)} lignes)")
     return df
 
 
+# --- FRÉQUENCES DES FUITES (DÉDOUBLONNAGE EXTERNE) ---
+def create_leak_frequency_csv(filename="leak_frequencies.csv", memory_limit_mb=DEFAULT_MEMORY_MB, workers=None):
+    """Dédoublonne TOUTES les fuites sur disque et compte les occurrences de chaque mot de passe."""
+    txt_files = find_leak_files(LEAKS_DIR, RAW_DIR)
+    if not txt_files:
+        print("⚠️ Aucun fichier de fuites : table de fréquences non générée.")
+        return None
+    print(f"Dédoublonnage externe de {len(txt_files)} fichiers de leaks (plafond {memory_limit_mb} Mo)...")
+    dedup_leak_files(txt_files, PROCESSED_DIR / filename, memory_limit_mb=memory_limit_mb, workers=workers)
+    return PROCESSED_DIR / filename
+
+
+def lookup_leak_counts(passwords, filename="leak_frequencies.csv", chunksize=1_000_000):
+    """Fréquence de fuite de chaque mot de passe (0 si absent), en lisant la table par morceaux."""
+    counts = pd.Series(0, index=pd.Index(passwords).unique(), dtype="int64")
+    path = PROCESSED_DIR / filename
+    if not path.exists():
+        return counts
+    for chunk in pd.read_csv(path, chunksize=chunksize, keep_default_na=False, dtype={"password": str}):
+        hits = chunk[chunk["password"].isin(counts.index)]
+        counts.loc[hits["password"]] = hits["count"].astype("int64").values
+    return counts
+
+
 # --- FUSION ET CRÉATION DU DATASET FINAL ---
-def create_labeled_dataset(weak_filename="weak_passwords.csv", strong_filename="strong_passwords.csv",
-                           output_filename="passwords_labeled.csv"):
+def create_labeled_dataset(weak_filename="weak_passwords", strong_filename="strong_passwords",
+                           output_filename="passwords_labeled"):
     print("Fusion et mélange des datasets...")
-    df_weak = pd.read_csv(RAW_DIR / weak_filename)
-    df_strong = pd.read_csv(RAW_DIR / strong_filename)
+    df_weak = read_dataset(RAW_DIR / weak_filename)
+    df_strong = read_dataset(RAW_DIR / strong_filename)
 
     df_combined = pd.concat([df_weak, df_strong], ignore_index=True)
     # Mélange aléatoire (shuffle)
     df_combined = df_combined.sample(frac=1, random_state=42).reset_index(drop=True)
-    df_combined.to_csv(RAW_DIR / output_filename, index=False)
-    print(f"✅ Dataset labellisé brut créé : {output_filename} ({len(df_combined)} lignes)")
+    path = write_dataset(df_combined, RAW_DIR / output_filename)
+    print(f"✅ Dataset labellisé brut créé : {path.name} ({len(df_combined)} lignes)")
     return df_combined
 
 
-def create_processed_dataset(raw_filename="passwords_labeled.csv", processed_filename="passwords_processed.csv"):
+def create_processed_dataset(raw_filename="passwords_labeled", processed_filename="passwords_processed"):
     print("Ajout des features mathématiques...")
-    df = pd.read_csv(RAW_DIR / raw_filename)
+    df = read_dataset(RAW_DIR / raw_filename)
     df = df.drop_duplicates(subset=['password'])
     df = df[df['password'].str.len() >= 4]
     df['password'] = df['password'].astype(str)
@@ -170,16 +184,29 @@ def create_processed_dataset(raw_filename="passwords_labeled.csv", processed_fil
     df['diversity'] = df['password'].apply(compute_diversity)
     df['entropy'] = df['password'].apply(compute_entropy)
 
-    df.to_csv(PROCESSED_DIR / processed_filename, index=False, sep=',', quoting=csv.QUOTE_NONNUMERIC)
-    print(f"✅ Dataset FINAL PRÊT : {processed_filename}")
+    # Signal faible supplémentaire : nombre d'apparitions dans les fuites (si la table existe)
+    if (PROCESSED_DIR / "leak_frequencies.csv").exists():
+        df['leak_count'] = df['password'].map(lookup_leak_counts(df['password'])).fillna(0).astype("int64")
+
+    # Features en float32, label en int8 (Parquet : lecture par colonne et projection en mémoire)
+    path = write_dataset(df, PROCESSED_DIR / processed_filename)
+    print(f"✅ Dataset FINAL PRÊT : {path.name}")
     return df
 
 
 # --- POINT D'ENTRÉE ---
 if __name__ == "__main__":
     print("--- 🚀 CRÉATION DU DATASET D'ENTRAÎNEMENT ---")
-    create_weak_passwords_csv(n=50000)
-    create_strong_passwords_csv(n=50000)
-    create_labeled_dataset()
-    create_processed_dataset()
+    # Sous-étapes mesurées quand le script est lancé par retrain_all.py
+    if not (PROCESSED_DIR / "leak_frequencies.csv").exists():
+        with substep("frequences_fuites"):
+            create_leak_frequency_csv()
+    with substep("echantillonnage_faibles"):
+        create_weak_passwords_csv(n=50000)
+    with substep("generation_forts"):
+        create_strong_passwords_csv(n=50000)
+    with substep("fusion"):
+        create_labeled_dataset()
+    with substep("features_maths"):
+        create_processed_dataset()
     print("--- 🎉 OPÉRATION TERMINÉE ---")
\ No newline at end of file
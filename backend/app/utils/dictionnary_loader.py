@@ -1,3 +1,6 @@
+import hashlib
+import json
+import sys
 import pandas as pd
 import re
 from pathlib import Path
@@ -5,10 +8,22 @@ from pathlib import Path
 # --- GESTION DES CHEMINS ---
 BASE_DIR = Path(__file__).resolve().parents[3]
 PATH_RAW = BASE_DIR / "datasets" / "Dictionnaries" / "raw"
+# Sources supplémentaires : datasets/Dictionnaries/raw/extra/<catégorie>/*.txt (nouvelle fuite, mots d'une locale...)
+PATH_EXTRA = PATH_RAW / "extra"
 # Chemin vers le dossier datasets/raw où tu as mis common-passwords.txt
 PATH_DATASETS_RAW = BASE_DIR / "datasets" / "raw"
 PATH_PROCESSED = BASE_DIR / "datasets" / "Dictionnaries" / "processed"
-PATH_PROCESSED.mkdir(parents=True, exist_ok=True)
+PATH_SOURCES_CACHE = PATH_PROCESSED / "sources"
+OUTFILE = PATH_PROCESSED / "linguistic_dictionary.csv"
+STATE_FILE = PATH_PROCESSED / "dictionary_state.json"
+
+# SYSTEME DE PRIORITE POUR "SUMMER", "PARIS", etc.
+# Ordre : Weak (0) > Word (1) > Name (2) > Place (3)
+# Si "Summer" est dans Word et Name, on garde Word (car 1 < 2).
+PRIORITY = {'weak_pwd': 0, 'word': 1, 'name': 2, 'place': 3}
+
+MIN_CITY_POPULATION = 15000
+GEONAMES_CHUNKSIZE = 200_000
 
 
 def clean_token(token):
@@ -17,89 +32,216 @@ def clean_token(token):
     return token if len(token) > 2 else ""
 
 
-print("--- 🚀 GÉNÉRATION DU CORPUS LINGUISTIQUE (FINAL) ---")
-
-# 1. Chargement des Mots Anglais
-print("1. Chargement des mots anglais...")
-with open(PATH_RAW / "english-words.35", "r", encoding="latin-1", errors="ignore") as f:
-    words = [clean_token(w) for w in f]
-words_list = list(set(filter(None, words)))
-print(f"   -> {len(words_list)} mots conservés.")
-
-# 2. Chargement des Noms et Prénoms
-print("2. Chargement des prénoms/noms...")
-female = pd.read_csv(PATH_RAW / "dist.female.first.txt", sep=r"\s+", header=None, encoding="latin-1")[0]
-male = pd.read_csv(PATH_RAW / "dist.male.first.txt", sep=r"\s+", header=None, encoding="latin-1")[0]
-last = pd.read_csv(PATH_RAW / "dist.all.last.txt", sep=r"\s+", header=None, encoding="latin-1")[0]
-all_names_raw = pd.concat([female, male, last], ignore_index=True)
-names_list = list(set(filter(None, [clean_token(n) for n in all_names_raw])))
-print(f"   -> {len(names_list)} noms conservés.")
-
-# 3. Villes (FILTRÉES > 15k Habitants)
-print("3. Chargement des lieux (Population > 15k)...")
-try:
-    df_cities = pd.read_csv(
-        PATH_RAW / "geonames-all-cities-with-a-population-1000.csv",
-        sep=";", encoding="utf-8", on_bad_lines="skip"
-    )
-    df_cities = df_cities[df_cities['Population'] > 15000]
-    cities = [clean_token(str(n)) for n in df_cities["Name"]]
-
-    with open(PATH_RAW / "countries.txt", "r", encoding="utf-8") as f:
-        countries = [clean_token(c) for c in f]
-
-    places_list = list(set(filter(None, cities + countries)))
-    print(f"   -> {len(places_list)} lieux conservés (filtrés).")
-except Exception as e:
-    print(f"⚠️ Erreur chargement villes : {e}")
-    places_list = []
-
-# 4. Mots de passe faibles (CORRECTION PATH + ENCODING)
-print("4. Chargement de la liste 'Common Passwords'...")
-# On cherche le fichier dans datasets/raw/
-weak_file = PATH_RAW / "common-passwords.txt"
-
-if weak_file.exists():
-    try:
-        # CORRECTION ICI : encoding='utf-8' et errors='ignore' pour éviter le crash
-        with open(weak_file, "r", encoding="utf-8", errors="ignore") as f:
-            weak_pwds = [p.strip().lower() for p in f if p.strip()]
-
-        weak_pwds = list(set(weak_pwds))
-        print(f"   -> {len(weak_pwds)} leaks chargés.")
-    except Exception as e:
-        print(f"❌ Erreur lecture fichier weak : {e}")
-        weak_pwds = []
-else:
-    print(f"❌ ERREUR CRITIQUE : Aucun fichier de mot de passe trouvé !")
-    weak_pwds = []
+# --- LECTEURS DE SOURCES ---
+def read_words(paths):
+    tokens = set()
+    for path in paths:
+        with open(path, "r", encoding="latin-1", errors="ignore") as f:
+            tokens.update(clean_token(w) for w in f)
+    tokens.discard("")
+    return tokens
+
+
+def read_names(paths):
+    tokens = set()
+    for path in paths:
+        col = pd.read_csv(path, sep=r"\s+", header=None, encoding="latin-1", usecols=[0])[0]
+        tokens.update(clean_token(n) for n in col)
+    tokens.discard("")
+    return tokens
+
+
+def read_cities(paths):
+    """Villes > 15k habitants. Le CSV geonames est lu par morceaux, 2 colonnes seulement."""
+    tokens = set()
+    for path in paths:
+        chunks = pd.read_csv(
+            path, sep=";", encoding="utf-8", on_bad_lines="skip",
+            usecols=["Name", "Population"], chunksize=GEONAMES_CHUNKSIZE
+        )
+        for chunk in chunks:
+            chunk = chunk[chunk["Population"] > MIN_CITY_POPULATION]
+            tokens.update(clean_token(str(n)) for n in chunk["Name"])
+    tokens.discard("")
+    return tokens
 
-# --- COMPILATION INTELLIGENTE ---
-print("5. Compilation et Dédoublonnage avec Priorité...")
 
-corpus = pd.DataFrame({
-    "token": words_list + names_list + places_list + weak_pwds,
-    "category": ["word"] * len(words_list) + ["name"] * len(names_list) + ["place"] * len(places_list) + [
-        "weak_pwd"] * len(weak_pwds)
-})
+def read_countries(paths):
+    tokens = set()
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            tokens.update(clean_token(c) for c in f)
+    tokens.discard("")
+    return tokens
+
+
+def read_weak_passwords(paths):
+    tokens = set()
+    for path in paths:
+        # encoding='utf-8' et errors='ignore' pour éviter le crash
+        with open(path, "r", encoding="utf-8", errors="ignore") as f:
+            tokens.update(p.strip().lower() for p in f if p.strip())
+    return tokens
+
+
+READERS_BY_CATEGORY = {"word": read_words, "name": read_words, "place": read_countries, "weak_pwd": read_weak_passwords}
 
-# SYSTEME DE PRIORITE POUR "SUMMER", "PARIS", etc.
-# Ordre : Weak (0) > Word (1) > Name (2) > Place (3)
-# Si "Summer" est dans Word et Name, on garde Word (car 1 < 2).
-corpus['priority'] = corpus['category'].map({'weak_pwd': 0, 'word': 1, 'name': 2, 'place': 3})
 
-# On trie : les prioritaires remontent en haut
-corpus = corpus.sort_values('priority')
+def list_sources():
+    """Sources connues (nom, catégorie, fichiers, lecteur) + sources supplémentaires du dossier extra/."""
+    sources = [
+        ("english_words", "word", [PATH_RAW / "english-words.35"], read_words),
+        ("names", "name", [PATH_RAW / "dist.female.first.txt", PATH_RAW / "dist.male.first.txt",
+                           PATH_RAW / "dist.all.last.txt"], read_names),
+        ("cities", "place", [PATH_RAW / "geonames-all-cities-with-a-population-1000.csv"], read_cities),
+        ("countries", "place", [PATH_RAW / "countries.txt"], read_countries),
+        ("common_passwords", "weak_pwd", [PATH_RAW / "common-passwords.txt"], read_weak_passwords),
+    ]
+    for category, reader in READERS_BY_CATEGORY.items():
+        for path in sorted((PATH_EXTRA / category).glob("*.txt")):
+            sources.append((f"extra_{category}_{path.stem}", category, [path], reader))
+    return sources
 
-# On dédoublonne en gardant le premier (donc le plus prioritaire)
-corpus = corpus.drop_duplicates(subset=["token"], keep='first')
 
-# On nettoie la colonne temporaire
-corpus = corpus.drop('priority', axis=1)
+# --- EMPREINTES ---
+def file_digest(path):
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(block)
+    return h.hexdigest()
 
-outfile = PATH_PROCESSED / "linguistic_dictionary.csv"
-corpus.to_csv(outfile, index=False)
 
-print(f"--- SUCCÈS ---")
-print(f"Fichier généré : {outfile}")
-print(f"Total entrées uniques : {len(corpus)}")
\ No newline at end of file
+def fingerprint(paths, previous=None):
+    """
+    Empreinte des fichiers d'une source. Le SHA-1 n'est recalculé que si la taille
+    ou la date de modification a changé depuis le dernier build.
+    """
+    previous = previous or {}
+    result = {}
+    for path in paths:
+        stat = path.stat()
+        old = previous.get(path.name, {})
+        if old.get("size") == stat.st_size and old.get("mtime_ns") == stat.st_mtime_ns:
+            digest = old["sha1"]
+        else:
+            digest = file_digest(path)
+        result[path.name] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha1": digest}
+    return result
+
+
+def same_content(old, new):
+    return {k: v["sha1"] for k, v in old.items()} == {k: v["sha1"] for k, v in new.items()}
+
+
+def load_state():
+    if STATE_FILE.exists():
+        with open(STATE_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    return {"sources": {}}
+
+
+def save_state(state):
+    with open(STATE_FILE, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2)
+
+
+def cache_path(name):
+    return PATH_SOURCES_CACHE / f"{name}.txt"
+
+
+def write_cache(name, tokens):
+    with open(cache_path(name), "w", encoding="utf-8") as f:
+        f.write("\n".join(sorted(tokens)))
+
+
+def read_cache(name):
+    with open(cache_path(name), "r", encoding="utf-8") as f:
+        return [t for t in f.read().split("\n") if t]
+
+
+# --- COMPILATION INTELLIGENTE ---
+def prioritize(corpus):
+    """Dédoublonnage avec priorité : pour un token présent dans plusieurs catégories, la plus prioritaire gagne."""
+    corpus = corpus.assign(priority=corpus['category'].map(PRIORITY))
+    # On trie : les prioritaires remontent en haut (tri stable pour un résultat reproductible)
+    corpus = corpus.sort_values('priority', kind='stable')
+    # On dédoublonne en gardant le premier (donc le plus prioritaire)
+    corpus = corpus.drop_duplicates(subset=["token"], keep='first')
+    return corpus.drop('priority', axis=1).reset_index(drop=True)
+
+
+def tokens_frame(tokens_by_source):
+    frames = [pd.DataFrame({"token": tokens, "category": category}) for category, tokens in tokens_by_source]
+    if not frames:
+        return pd.DataFrame({"token": [], "category": []})
+    return pd.concat(frames, ignore_index=True)
+
+
+def build_dictionary(full=False):
+    """
+    Construit (ou met à jour) linguistic_dictionary.csv.
+    - Seules les sources nouvelles ou modifiées sont relues depuis les fichiers bruts.
+    - Si des sources ont seulement été ajoutées, elles sont fusionnées dans le dictionnaire existant.
+    - Si une source a été modifiée ou supprimée, le dictionnaire est recomposé depuis les caches par source.
+    """
+    print("--- 🚀 GÉNÉRATION DU CORPUS LINGUISTIQUE ---")
+    PATH_PROCESSED.mkdir(parents=True, exist_ok=True)
+    PATH_SOURCES_CACHE.mkdir(parents=True, exist_ok=True)
+
+    state = {"sources": {}} if full else load_state()
+    known = state["sources"]
+    sources = []
+    for source in list_sources():
+        if all(p.exists() for p in source[2]):
+            sources.append(source)
+        else:
+            print(f"⚠️ Source absente : {source[0]}")
+    names = {s[0] for s in sources}
+
+    added, modified = [], []
+    for name, category, paths, reader in sources:
+        fp = fingerprint(paths, known.get(name, {}).get("files"))
+        if name in known and same_content(known[name]["files"], fp) and cache_path(name).exists():
+            known[name]["files"] = fp  # Simple "touch" : on mémorise la nouvelle date sans relire
+            continue
+        print(f"   -> Lecture de la source '{name}' ({category})...")
+        tokens = reader(paths)
+        write_cache(name, tokens)
+        (modified if name in known else added).append(name)
+        known[name] = {"category": category, "files": fp, "count": len(tokens)}
+        print(f"      {len(tokens)} tokens conservés.")
+
+    removed = [name for name in known if name not in names]
+    for name in removed:
+        print(f"   -> Source retirée : '{name}'")
+        del known[name]
+        cache_path(name).unlink(missing_ok=True)
+
+    if not (added or modified or removed) and OUTFILE.exists():
+        print("✅ Dictionnaire à jour, aucune source modifiée.")
+        save_state(state)  # Mémorise les nouvelles dates des fichiers seulement "touchés"
+        return pd.read_csv(OUTFILE)
+
+    if modified or removed or not OUTFILE.exists():
+        print("Recomposition depuis les caches par source...")
+        corpus = tokens_frame((known[name]["category"], read_cache(name)) for name in known)
+    else:
+        print(f"Fusion incrémentale de {len(added)} nouvelle(s) source(s)...")
+        corpus = pd.concat([
+            pd.read_csv(OUTFILE, keep_default_na=False),
+            tokens_frame((known[name]["category"], read_cache(name)) for name in added)
+        ], ignore_index=True)
+
+    corpus = prioritize(corpus)
+    corpus.to_csv(OUTFILE, index=False)
+    save_state(state)
+
+    print(f"--- SUCCÈS ---")
+    print(f"Fichier généré : {OUTFILE}")
+    print(f"Total entrées uniques : {len(corpus)}")
+    return corpus
+
+
+if __name__ == "__main__":
+    build_dictionary(full="--full" in sys.argv)
@@ -1,15 +1,23 @@
-import pandas as pd
 import numpy as np
+import json
 import pickle
+import sys
 from pathlib import Path
 from tensorflow.keras.preprocessing.text import Tokenizer
 from tensorflow.keras.preprocessing.sequence import pad_sequences
 from sklearn.model_selection import train_test_split
 
+# --- CONFIGURATION DU CHEMIN (Pour trouver les modules quand le script est lancé seul) ---
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+
+from backend.app.utils.dataset_io import dataset_exists, dataset_path, iter_dataset, read_dataset
+from backend.app.utils.pipeline_profiler import substep
+
 # --- CONFIGURATION ---
 BASE_DIR = Path(__file__).resolve().parents[3]
 PROCESSED_DIR = BASE_DIR / "datasets" / "processed"
 DL_DATA_DIR = BASE_DIR / "datasets" / "deep_learning_data"
+SHARDS_DIR = DL_DATA_DIR / "shards"
 DL_DATA_DIR.mkdir(parents=True, exist_ok=True)
 
 # Paramètres cruciaux pour le Deep Learning
@@ -19,17 +27,24 @@ MAX_LEN = 32  # On regarde les 32 premiers caractères (suffisant pour 99.9% des
 # Tout mot de passe plus court sera complété par des 0.
 # Tout mot de passe plus long sera coupé.
 
+# Mode "shards" (gros volumes) : le CSV est lu par morceaux et les tenseurs écrits au fil de l'eau
+CSV_CHUNKSIZE = 500_000
+SHARD_SIZE = 1_000_000
+# Mêmes proportions que les deux train_test_split (20% test, puis 10% du reste en validation), mais PAS les mêmes
+# lignes : le tirage se fait ligne par ligne au fil du flux. Le Juge doit alors être entraîné en --oof.
+SPLIT_FRACTIONS = {"test": 0.2, "val": 0.8 * 0.1}
+
 def prepare_dl_data():
     print("\n--- 🧠 PRÉPARATION DES DONNÉES DEEP LEARNING ---")
 
     # 1. Chargement du dataset brut (juste le texte et le label)
-    csv_path = PROCESSED_DIR / "passwords_processed.csv"
-    if not csv_path.exists():
-        print(f"❌ Erreur : {csv_path} introuvable. Lance dataset_loader.py d'abord.")
+    dataset = PROCESSED_DIR / "passwords_processed"
+    if not dataset_exists(dataset):
+        print(f"❌ Erreur : {dataset} introuvable. Lance dataset_loader.py d'abord.")
         return
 
-    print("⏳ Chargement du CSV...")
-    df = pd.read_csv(csv_path)
+    print(f"⏳ Chargement de {dataset_path(dataset).name}...")
+    df = read_dataset(dataset, columns=['password', 'label'])
 
     # Conversion en string pur pour éviter les bugs (ex: "NaN" ou chiffres interprétés)
     passwords = df['password'].astype(str).tolist()
@@ -42,7 +57,8 @@ def prepare_dl_data():
 
     # char_level=True est VITAL : on veut découper par lettre, pas par mot
     tokenizer = Tokenizer(char_level=True, lower=False)  # lower=False car 'A' != 'a' en mdp
-    tokenizer.fit_on_texts(passwords)
+    with substep("tokenizer"):
+        tokenizer.fit_on_texts(passwords)
 
     # On récupère le nombre de caractères uniques trouvés (le vocabulaire)
     vocab_size = len(tokenizer.word_index) + 1  # +1 pour le padding (0)
@@ -50,7 +66,8 @@ def prepare_dl_data():
 
     # 3. Transformation en Séquences d'entiers
     print("⏳ Conversion en séquences numériques...")
-    sequences = tokenizer.texts_to_sequences(passwords)
+    with substep("sequences"):
+        sequences = tokenizer.texts_to_sequences(passwords)
 
     # Exemple pour visualiser
     print(f"   Exemple : '{passwords[0]}' devient {sequences[0]}")
@@ -79,6 +96,8 @@ def prepare_dl_data():
     print("💾 Sauvegarde des tenseurs et du tokenizer...")
 
     # On sauve les matrices numpy (très rapide à charger)
+    # (et on invalide d'éventuels shards d'une préparation précédente)
+    (SHARDS_DIR / "shards.json").unlink(missing_ok=True)
     np.save(DL_DATA_DIR / "X_train.npy", X_train)
     np.save(DL_DATA_DIR / "y_train.npy", y_train)
     np.save(DL_DATA_DIR / "X_val.npy", X_val)
@@ -92,7 +111,7 @@ def prepare_dl_data():
         pickle.dump(tokenizer, handle, protocol=pickle.HIGHEST_PROTOCOL)
 
     # On sauve aussi les infos de config pour les charger dynamiquement
-    config = {"max_len": MAX_LEN, "vocab_size": vocab_size}
+    config = {"max_len": MAX_LEN, "vocab_size": vocab_size, "sharded": False}
     with open(DL_DATA_DIR / "config.pickle", "wb") as handle:
         pickle.dump(config, handle, protocol=pickle.HIGHEST_PROTOCOL)
 
@@ -100,5 +119,96 @@ def prepare_dl_data():
     print(f"   Dossier : {DL_DATA_DIR}")
 
 
+# --- MODE SHARDS (OUT-OF-CORE) ---
+class ShardWriter:
+    """Accumule les lignes d'un split et écrit un shard .npy dès que shard_size lignes sont prêtes."""
+
+    def __init__(self, split, shard_size):
+        self.split = split
+        self.shard_size = shard_size
+        self.X, self.y = [], []
+        self.pending = 0
+        self.shards = []
+
+    def add(self, X, y):
+        self.X.append(X)
+        self.y.append(y)
+        self.pending += len(X)
+        while self.pending >= self.shard_size:
+            self._write(self.shard_size)
+
+    def _write(self, rows):
+        X, y = np.concatenate(self.X), np.concatenate(self.y)
+        i = len(self.shards)
+        x_name, y_name = f"X_{self.split}-{i:05d}.npy", f"y_{self.split}-{i:05d}.npy"
+        np.save(SHARDS_DIR / x_name, X[:rows])
+        np.save(SHARDS_DIR / y_name, y[:rows])
+        self.shards.append({"x": x_name, "y": y_name, "rows": int(rows)})
+        self.X, self.y = [X[rows:]], [y[rows:]]
+        self.pending = len(X) - rows
+
+    def close(self):
+        if self.pending:
+            self._write(self.pending)
+        return self.shards
+
+
+def iter_password_chunks(dataset, chunksize=CSV_CHUNKSIZE):
+    for chunk in iter_dataset(dataset, columns=['password', 'label'], chunksize=chunksize):
+        yield chunk['password'].astype(str).tolist(), chunk['label'].values
+
+
+def prepare_dl_shards(shard_size=SHARD_SIZE, chunksize=CSV_CHUNKSIZE):
+    """
+    Variante à mémoire constante de prepare_dl_data : deux passes en flux sur le dataset
+    (1. vocabulaire du tokenizer, 2. séquences), tenseurs écrits par shards de shard_size lignes.
+    """
+    print("\n--- 🧠 PRÉPARATION DES DONNÉES DEEP LEARNING (SHARDS) ---")
+    dataset = PROCESSED_DIR / "passwords_processed"
+    if not dataset_exists(dataset):
+        print(f"❌ Erreur : {dataset} introuvable. Lance dataset_loader.py d'abord.")
+        return
+
+    SHARDS_DIR.mkdir(parents=True, exist_ok=True)
+    for old in SHARDS_DIR.glob("*.npy"):
+        old.unlink()
+
+    print("⏳ Passe 1 : apprentissage des caractères...")
+    tokenizer = Tokenizer(char_level=True, lower=False)
+    for passwords, _ in iter_password_chunks(dataset, chunksize):
+        tokenizer.fit_on_texts(passwords)
+    vocab_size = len(tokenizer.word_index) + 1
+    print(f"   -> Vocabulaire détecté : {vocab_size} caractères uniques.")
+
+    print(f"⏳ Passe 2 : séquences + padding ({MAX_LEN}) + écriture des shards...")
+    rng = np.random.default_rng(42)
+    writers = {split: ShardWriter(split, shard_size) for split in ["train", "val", "test"]}
+    for passwords, labels in iter_password_chunks(dataset, chunksize):
+        X = pad_sequences(tokenizer.texts_to_sequences(passwords), maxlen=MAX_LEN, padding='post', truncating='post')
+        u = rng.random(len(X))
+        test = u < SPLIT_FRACTIONS["test"]
+        val = ~test & (u < SPLIT_FRACTIONS["test"] + SPLIT_FRACTIONS["val"])
+        for split, mask in [("test", test), ("val", val), ("train", ~(test | val))]:
+            writers[split].add(X[mask], np.asarray(labels)[mask])
+
+    manifest = {split: w.close() for split, w in writers.items()}
+    with open(SHARDS_DIR / "shards.json", "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    for split, shards in manifest.items():
+        print(f"   {split:<5} : {sum(s['rows'] for s in shards)} lignes en {len(shards)} shard(s)")
+
+    with open(DL_DATA_DIR / "tokenizer.pickle", "wb") as handle:
+        pickle.dump(tokenizer, handle, protocol=pickle.HIGHEST_PROTOCOL)
+    config = {"max_len": MAX_LEN, "vocab_size": vocab_size, "sharded": True}
+    with open(DL_DATA_DIR / "config.pickle", "wb") as handle:
+        pickle.dump(config, handle, protocol=pickle.HIGHEST_PROTOCOL)
+
+    print("\n✅ PRÉPARATION TERMINÉE ! Shards prêts pour l'entraînement en flux.")
+    print(f"   Dossier : {SHARDS_DIR}")
+
+
 if __name__ == "__main__":
-    prepare_dl_data()
\ No newline at end of file
+    if "--shards" in sys.argv:
+        prepare_dl_shards()
+    else:
+        prepare_dl_data()
@@ -0,0 +1,215 @@
+import csv
+import hashlib
+import os
+import shutil
+import sys
+import tempfile
+import zlib
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from backend.app.utils.leak_sampler import find_leak_files, iter_passwords, is_compressed, split_ranges
+
+# --- CONFIGURATION ---
+BASE_DIR = Path(__file__).resolve().parents[3]
+LEAKS_DIR = BASE_DIR / "datasets" / "raw" / "leaks"
+PROCESSED_DIR = BASE_DIR / "datasets" / "processed"
+
+DEFAULT_MEMORY_MB = 512
+# Coût mémoire estimé d'un octet de bucket une fois compté (objets bytes + entrées du Counter)
+MEMORY_OVERHEAD = 12
+# Facteur de décompression supposé pour estimer la taille des fuites compressées
+COMPRESSION_RATIO = 4
+# Taille des tampons d'écriture par bucket avant flush sur disque
+FLUSH_BYTES = 1024 * 1024
+# Coût d'un mot de passe en tampon en plus de ses octets (objet bytes + pointeur de liste)
+BUFFER_ITEM_OVERHEAD = sys.getsizeof(b"") + 8
+MAX_DEPTH = 3
+MAX_BUCKETS = 4096
+
+
+def bucket_of(pwd, n_buckets, salt=0):
+    """
+    Bucket d'un mot de passe. Niveau 0 : CRC32 (rapide). Re-partitionnement (salt > 0) : BLAKE2b salé,
+    indépendant du CRC (changer la graine d'un CRC ne fait qu'appliquer un XOR dépendant de la longueur :
+    les mots de passe de même longueur d'un bucket trop plein resteraient ensemble).
+    """
+    if salt == 0:
+        return zlib.crc32(pwd) % n_buckets
+    digest = hashlib.blake2b(pwd, digest_size=8, salt=salt.to_bytes(16, "little")).digest()
+    return int.from_bytes(digest, "little") % n_buckets
+
+
+def estimate_buckets(files, memory_limit_mb, workers):
+    """Nombre de buckets pour que chaque worker tienne sous le plafond mémoire."""
+    raw_bytes = sum(
+        Path(f).stat().st_size * (COMPRESSION_RATIO if is_compressed(f) else 1) for f in files
+    )
+    per_worker = max(1, memory_limit_mb * 1024 * 1024 // max(1, workers))
+    n = -(-raw_bytes * MEMORY_OVERHEAD // per_worker)
+    return int(min(max(n, 1), MAX_BUCKETS))
+
+
+class BucketWriter:
+    """
+    Répartit des mots de passe (bytes) dans n fichiers selon leur hash, avec tampons.
+    Un bucket est écrit dès que son tampon atteint FLUSH_BYTES ; si l'ensemble des tampons dépasse
+    buffer_limit (avec beaucoup de buckets, aucun n'atteint FLUSH_BYTES), tout est écrit sur disque.
+    """
+
+    def __init__(self, directory, n_buckets, prefix, salt=0, buffer_limit=None):
+        self.paths = [Path(directory) / f"{prefix}-{b:04d}.bin" for b in range(n_buckets)]
+        self.buffers = [[] for _ in range(n_buckets)]
+        self.sizes = [0] * n_buckets
+        self.n_buckets = n_buckets
+        self.salt = salt
+        self.buffer_limit = buffer_limit or FLUSH_BYTES * n_buckets
+        self.buffered = 0  # Mémoire estimée de tous les tampons
+
+    def add(self, passwords):
+        for pwd in passwords:
+            b = bucket_of(pwd, self.n_buckets, self.salt)
+            self.buffers[b].append(pwd)
+            self.sizes[b] += len(pwd) + 1
+            self.buffered += len(pwd) + BUFFER_ITEM_OVERHEAD
+            if self.sizes[b] >= FLUSH_BYTES:
+                self._flush(b)
+            if self.buffered >= self.buffer_limit:
+                self.close()
+
+    def _flush(self, b):
+        if self.buffers[b]:
+            with open(self.paths[b], "ab") as f:
+                f.write(b"\n".join(self.buffers[b]) + b"\n")
+            self.buffered -= self.sizes[b] + len(self.buffers[b]) * (BUFFER_ITEM_OVERHEAD - 1)
+        self.buffers[b] = []
+        self.sizes[b] = 0
+
+    def close(self):
+        for b in range(self.n_buckets):
+            self._flush(b)
+
+
+def _partition_task(task):
+    """Worker (phase 1) : une tranche de fuite -> ses propres fichiers de buckets."""
+    path, start, end, bucket_dir, n_buckets, index, buffer_limit = task
+    writer = BucketWriter(bucket_dir, n_buckets, prefix=f"part{index:04d}", buffer_limit=buffer_limit)
+    for passwords in iter_passwords(path, start, end):
+        writer.add(passwords)
+    writer.close()
+
+
+def _read_lines(paths):
+    for path in paths:
+        if Path(path).exists():
+            with open(path, "rb") as f:
+                for line in f:
+                    yield line[:-1] if line.endswith(b"\n") else line
+
+
+def _count_bucket(paths, out_path, memory_limit, depth=0):
+    """
+    Compte les occurrences d'un bucket. Si le bucket dépasse le plafond mémoire,
+    il est re-partitionné avec un autre sel de hash (buckets trop gros / mal répartis).
+    Renvoie le nombre de mots de passe distincts écrits.
+    """
+    size = sum(Path(p).stat().st_size for p in paths if Path(p).exists())
+    if size * MEMORY_OVERHEAD > memory_limit and depth < MAX_DEPTH:
+        sub_dir = Path(tempfile.mkdtemp(dir=Path(out_path).parent))
+        n_sub = int(min(-(-size * MEMORY_OVERHEAD // memory_limit), MAX_BUCKETS))
+        writer = BucketWriter(sub_dir, n_sub, prefix="sub", salt=depth + 1, buffer_limit=memory_limit)
+        block = []
+        for line in _read_lines(paths):
+            block.append(line)
+            if len(block) >= 100_000:
+                writer.add(block)
+                block = []
+        writer.add(block)
+        writer.close()
+
+        distinct = 0
+        for i, sub_path in enumerate(writer.paths):
+            distinct += _count_bucket([sub_path], f"{out_path}.{i}", memory_limit, depth + 1)
+        with open(out_path, "wb") as out:
+            for i in range(n_sub):
+                part = Path(f"{out_path}.{i}")
+                if part.exists():
+                    with open(part, "rb") as f:
+                        shutil.copyfileobj(f, out)
+                    part.unlink()
+        shutil.rmtree(sub_dir, ignore_errors=True)
+        return distinct
+
+    counts = Counter(_read_lines(paths))
+    with open(out_path, "w", encoding="ascii", newline="") as f:
+        writer = csv.writer(f, quoting=csv.QUOTE_NONNUMERIC)
+        for pwd, count in counts.items():
+            writer.writerow([pwd.decode("ascii"), count])
+    return len(counts)
+
+
+def _count_task(task):
+    """Worker (phase 2) : dédoublonne un bucket indépendamment des autres."""
+    paths, out_path, memory_limit = task
+    return _count_bucket(paths, out_path, memory_limit)
+
+
+def dedup_leak_files(files, output_path, memory_limit_mb=DEFAULT_MEMORY_MB, workers=None, tmp_dir=None):
+    """
+    Dédoublonnage externe (hors mémoire) de fichiers de fuites.
+    1. Les mots de passe sont répartis par hash dans des buckets sur disque (en parallèle).
+    2. Chaque bucket est compté indépendamment (en parallèle), sous le plafond mémoire.
+    Le fichier de sortie contient une ligne "password","count" par mot de passe distinct.
+    Renvoie le nombre de mots de passe distincts.
+    """
+    workers = workers or os.cpu_count() or 1
+    files = [Path(f) for f in files]
+    n_buckets = estimate_buckets(files, memory_limit_mb, workers)
+    memory_limit = memory_limit_mb * 1024 * 1024 // workers
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    work_dir = Path(tempfile.mkdtemp(prefix="dedup-", dir=tmp_dir or output_path.parent))
+    try:
+        print(f"   -> Phase 1 : partitionnement en {n_buckets} buckets...")
+        tasks = [
+            (path, start, end, str(work_dir), n_buckets, i, memory_limit)
+            for i, (path, start, end) in enumerate(split_ranges(files))
+        ]
+        _run(_partition_task, tasks, workers)
+
+        print(f"   -> Phase 2 : comptage de {n_buckets} buckets...")
+        count_tasks = [
+            ([str(work_dir / f"part{i:04d}-{b:04d}.bin") for i in range(len(tasks))],
+             str(work_dir / f"counts-{b:04d}.csv"), memory_limit)
+            for b in range(n_buckets)
+        ]
+        distinct = sum(_run(_count_task, count_tasks, workers))
+
+        with open(output_path, "w", encoding="ascii", newline="") as out:
+            csv.writer(out, quoting=csv.QUOTE_NONNUMERIC).writerow(["password", "count"])
+            for _, count_path, _ in count_tasks:
+                with open(count_path, "r", encoding="ascii", newline="") as f:
+                    shutil.copyfileobj(f, out)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    print(f"✅ {distinct} mots de passe distincts -> {output_path.name}")
+    return distinct
+
+
+def _run(fn, tasks, workers):
+    if workers == 1 or len(tasks) <= 1:
+        return [fn(t) for t in tasks]
+    with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+        return list(pool.map(fn, tasks))
+
+
+if __name__ == "__main__":
+    print("--- 🧹 DÉDOUBLONNAGE EXTERNE DES FUITES ---")
+    leak_files = find_leak_files(LEAKS_DIR)
+    if not leak_files:
+        print(f"❌ Aucun fichier de fuites dans {LEAKS_DIR}")
+    else:
+        dedup_leak_files(leak_files, PROCESSED_DIR / "leak_frequencies.csv")
@@ -0,0 +1,312 @@
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+# --- CONFIGURATION DU CHEMIN (Pour trouver les modules) ---
+BASE_DIR = Path(__file__).resolve().parents[3]
+sys.path.append(str(BASE_DIR))
+
+from backend.app.services import password_services as ps
+from backend.app.utils.strong_generator import generate_batch
+from backend.app.utils.length_buckets import bucketing_margin, padding_margin, predict_bucketed
+from backend.app.utils.dataset_io import dataset_exists, read_dataset
+from backend.app.utils.pipeline_profiler import RssSampler
+
+PROCESSED_DATASET = BASE_DIR / "datasets" / "processed" / "passwords_processed"
+RESULTS_DIR = BASE_DIR / "benchmarks" / "inference"
+BASELINE_FILE = RESULTS_DIR / "baseline.json"
+SCHEMA_VERSION = 2
+
+MODEL_TYPES = ['rf', 'xgb', 'log', 'cnn', 'lstm', 'dnn', 'hybrid']
+BATCH_SIZES = [1, 16, 128]
+LENGTH_BUCKETS = [(1, 7), (8, 11), (12, 15), (16, 23), (24, 64)]
+STAGES = ['features', 'zxcvbn', 'dl_input', 'model', 'judge', 'total']
+# Tolérance par défaut avant de signaler une régression (+15% de latence / -15% de débit)
+DEFAULT_THRESHOLD = 0.15
+
+
+def bucket_name(bucket):
+    return f"{bucket[0]}-{bucket[1]}"
+
+
+def password_pool():
+    """Mots de passe de test (dataset réel si présent, sinon synthétiques)."""
+    if dataset_exists(PROCESSED_DATASET):
+        return read_dataset(PROCESSED_DATASET, columns=['password'])['password'].astype(str).tolist()
+    weak = [f"{w}{i}" for i in range(200) for w in ["password", "soleil", "azerty", "marseille", "dragon"]]
+    return weak + generate_batch(5000, ["alpha", "bravo", "charlie", "delta", "echo"] * 3, min_len=6, max_len=40)
+
+
+def load_passwords(per_bucket=512):
+    """Mots de passe de test répartis par tranche de longueur."""
+    pool = password_pool()
+    rng = np.random.default_rng(42)
+    buckets = {}
+    for low, high in LENGTH_BUCKETS:
+        candidates = [p for p in pool if low <= len(p) <= high]
+        if candidates:
+            buckets[bucket_name((low, high))] = list(rng.choice(candidates, size=per_bucket, replace=True))
+    return buckets
+
+
+def available_models(bundle):
+    models = []
+    for m in MODEL_TYPES:
+        if m == 'hybrid':
+            ok = bundle.meta_model is not None
+        elif m in ps.DL_EXPERTS:
+            ok = m in bundle.dl_models and bundle.tokenizer is not None
+        else:
+            ok = m in bundle.ml_models
+        if ok:
+            models.append(m)
+    return models
+
+
+def run_stages(bundle, model_type, batch):
+    """Une inférence complète, découpée par étape. Renvoie les durées (secondes) de chaque étape."""
+    timings = {}
+    t0 = time.perf_counter()
+
+    t = time.perf_counter()
+    features_df = ps.compute_features(batch)
+    timings['features'] = time.perf_counter() - t
+
+    t = time.perf_counter()
+    # Coût brut (sans cache) de l'évaluation bornée en longueur
+    for p in batch:
+        ps.zxcvbn(p[:ps.zxcvbn_guard.ZXCVBN_MAX_LENGTH])
+    timings['zxcvbn'] = time.perf_counter() - t
+
+    dl_in = None
+    if model_type == 'hybrid' or model_type in ps.DL_EXPERTS:
+        t = time.perf_counter()
+        dl_in = ps.prepare_dl_batch(batch, bundle)
+        timings['dl_input'] = time.perf_counter() - t
+
+    t = time.perf_counter()
+    if model_type == 'hybrid':
+        votes = ps.predict_votes(bundle, features_df, dl_in)
+        timings['model'] = time.perf_counter() - t
+        t = time.perf_counter()
+        ps.predict_judge(bundle, votes)
+        timings['judge'] = time.perf_counter() - t
+    else:
+        ps.predict_expert(bundle, model_type, features_df, dl_in)
+        timings['model'] = time.perf_counter() - t
+
+    timings['total'] = time.perf_counter() - t0
+    return timings
+
+
+def measure_allocations(bundle, model_type, batch):
+    """Allocations Python (tracemalloc) d'une inférence : pic et nombre de blocs alloués."""
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    run_stages(bundle, model_type, batch)
+    after = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    diff = after.compare_to(before, 'filename')
+    return {
+        "peak_bytes": int(peak),
+        "allocated_blocks": int(sum(max(d.count_diff, 0) for d in diff)),
+    }
+
+
+def summarize(samples):
+    arr = np.array(samples) * 1000.0
+    return {
+        "p50_ms": round(float(np.percentile(arr, 50)), 4),
+        "p90_ms": round(float(np.percentile(arr, 90)), 4),
+        "p99_ms": round(float(np.percentile(arr, 99)), 4),
+        "mean_ms": round(float(arr.mean()), 4),
+    }
+
+
+def run_benchmark(models=None, batch_sizes=BATCH_SIZES, iterations=30, warmup=3):
+    bundle = ps.active_bundle
+    buckets = load_passwords()
+    models = [m for m in (models or available_models(bundle)) if m in available_models(bundle)]
+    print(f"--- ⏱️ BENCHMARK D'INFÉRENCE (version {bundle.version}) ---")
+    print(f"Modèles : {', '.join(models) or 'aucun'} | Lots : {batch_sizes} | Tranches : {list(buckets)}")
+
+    results = []
+    rng = np.random.default_rng(0)
+    for model_type in models:
+        for batch_size in batch_sizes:
+            for bucket, pool in buckets.items():
+                batches = [list(rng.choice(pool, size=batch_size)) for _ in range(warmup + iterations)]
+                for batch in batches[:warmup]:
+                    run_stages(bundle, model_type, batch)
+
+                samples = {stage: [] for stage in STAGES}
+                # Pic de RSS échantillonné pendant cette configuration seulement (ru_maxrss : pic du processus entier)
+                with RssSampler() as rss:
+                    for batch in batches[warmup:]:
+                        for stage, duration in run_stages(bundle, model_type, batch).items():
+                            samples[stage].append(duration)
+
+                stages = {stage: summarize(v) for stage, v in samples.items() if v}
+                total_mean = np.mean(samples['total'])
+                entry = {
+                    "model_type": model_type,
+                    "batch_size": batch_size,
+                    "length_bucket": bucket,
+                    "stages": stages,
+                    "throughput_pwd_s": round(batch_size / total_mean, 2) if total_mean else None,
+                    "peak_rss_bytes": int(rss.peak),
+                    "allocations": measure_allocations(bundle, model_type, batches[-1]),
+                }
+                results.append(entry)
+                print(f"  {model_type:<7} lot={batch_size:<4} len={bucket:<6} "
+                      f"p50={stages['total']['p50_ms']:>9.3f}ms p99={stages['total']['p99_ms']:>9.3f}ms "
+                      f"débit={entry['throughput_pwd_s']:>10.1f} mdp/s")
+
+    return {
+        "schema_version": SCHEMA_VERSION,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "git_commit": git_commit(),
+        "model_version": bundle.version,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "iterations": iterations,
+        "results": results,
+    }
+
+
+def run_length_bucket_benchmark(batch_sizes=BATCH_SIZES, iterations=30, warmup=3):
+    """
+    Gain du regroupement par longueur : débit de chaque modèle DL avec padding complet (max_len)
+    puis avec predict_bucketed, sur des lots à la distribution de longueurs réelle (même appel Keras des deux côtés).
+    """
+    bundle = ps.active_bundle
+    pool = password_pool()
+    rng = np.random.default_rng(0)
+    print("--- 📏 REGROUPEMENT PAR LONGUEUR (DL) ---")
+
+    results = []
+    for key, model in bundle.dl_models.items():
+        # Regroupement forcé (dès qu'il est exact) pour mesurer aussi les modèles où il est désactivé
+        margin = padding_margin(model)
+        if margin is None:
+            print(f"  {key:<5} longueur fixe : pas de regroupement possible")
+            continue
+        for batch_size in batch_sizes:
+            batches = [ps.prepare_dl_batch(list(rng.choice(pool, size=batch_size)), bundle)
+                       for _ in range(warmup + iterations)]
+            timings = {}
+            for mode, predict in [("full", lambda X: model.predict_on_batch(X)),
+                                  ("bucketed", lambda X: predict_bucketed(model, X, margin=margin))]:
+                for X in batches[:warmup]:
+                    predict(X)
+                t = time.perf_counter()
+                for X in batches[warmup:]:
+                    predict(X)
+                timings[mode] = (time.perf_counter() - t) / iterations
+
+            entry = {
+                "model_type": key,
+                "batch_size": batch_size,
+                "padding_margin": margin,
+                "enabled": bucketing_margin(model) is not None,
+                "full_pwd_s": round(batch_size / timings["full"], 2),
+                "bucketed_pwd_s": round(batch_size / timings["bucketed"], 2),
+                "speedup": round(timings["full"] / timings["bucketed"], 3),
+            }
+            results.append(entry)
+            print(f"  {key:<5} lot={batch_size:<4} complet={entry['full_pwd_s']:>10.1f} mdp/s "
+                  f"par longueur={entry['bucketed_pwd_s']:>10.1f} mdp/s  x{entry['speedup']}"
+                  + ("" if entry["enabled"] else " (désactivé en service)"))
+    return results
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BASE_DIR,
+                              capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def save_report(report, path=None):
+    RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    path = Path(path) if path else RESULTS_DIR / f"{datetime.now():%Y%m%d-%H%M%S}_{report['git_commit'] or 'nogit'}.json"
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"💾 Résultats : {path}")
+    return path
+
+
+def compare_reports(current, baseline, threshold=DEFAULT_THRESHOLD):
+    """Liste des régressions (latence p50/p99 ou débit) par rapport à une référence."""
+    def key(r):
+        return r["model_type"], r["batch_size"], r["length_bucket"]
+
+    base = {key(r): r for r in baseline["results"]}
+    regressions = []
+    for r in current["results"]:
+        ref = base.get(key(r))
+        if not ref:
+            continue
+        for stage, stats in r["stages"].items():
+            ref_stats = ref["stages"].get(stage)
+            if not ref_stats:
+                continue
+            for metric in ["p50_ms", "p99_ms"]:
+                if ref_stats[metric] > 0 and stats[metric] > ref_stats[metric] * (1 + threshold):
+                    regressions.append((key(r), stage, metric, ref_stats[metric], stats[metric]))
+        if ref["throughput_pwd_s"] and r["throughput_pwd_s"] < ref["throughput_pwd_s"] * (1 - threshold):
+            regressions.append((key(r), "total", "throughput_pwd_s", ref["throughput_pwd_s"], r["throughput_pwd_s"]))
+    return regressions
+
+
+def print_regressions(regressions, threshold):
+    if not regressions:
+        print(f"✅ Aucune régression (seuil {threshold:.0%}).")
+        return
+    print(f"⚠️ {len(regressions)} régression(s) (seuil {threshold:.0%}) :")
+    for (model, batch, bucket), stage, metric, before, after in regressions:
+        print(f"  - {model:<7} lot={batch:<4} len={bucket:<6} {stage:<9} {metric:<16} {before:>10.3f} -> {after:>10.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark d'inférence (latence, débit, allocations)")
+    parser.add_argument("--models", nargs="*", help="model_type à mesurer (défaut : tous ceux chargés)")
+    parser.add_argument("--batch-sizes", nargs="*", type=int, default=BATCH_SIZES)
+    parser.add_argument("--iterations", type=int, default=30)
+    parser.add_argument("--output", help="Fichier JSON de sortie")
+    parser.add_argument("--compare", nargs="?", const=str(BASELINE_FILE),
+                        help="Compare à une référence (défaut : benchmarks/inference/baseline.json)")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--save-baseline", action="store_true", help="Enregistre ce run comme référence")
+    parser.add_argument("--length-buckets", action="store_true",
+                        help="Mesure aussi le gain du regroupement par longueur (modèles DL)")
+    args = parser.parse_args()
+
+    report = run_benchmark(args.models, args.batch_sizes, args.iterations)
+    if args.length_buckets:
+        report["length_buckets"] = run_length_bucket_benchmark(args.batch_sizes, args.iterations)
+    save_report(report, args.output)
+    if args.save_baseline:
+        save_report(report, BASELINE_FILE)
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare_reports(report, baseline, args.threshold)
+        print_regressions(regressions, args.threshold)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+import pandas as pd
+
+# --- CONFIGURATION ---
+# Longueur minimale d'une marche ("azer", "wxcv", "7410")
+MIN_WALK = 4
+
+# Disposition : rangées (touches non-shiftées, touches shiftées, décalage horizontal de la rangée).
+# Un espace marque un emplacement sans touche.
+LAYOUTS = {
+    "qwerty": [
+        ("`1234567890-=", "~!@#$%^&*()_+", 0.0),
+        ("qwertyuiop[]\\", "QWERTYUIOP{}|", 1.5),
+        ("asdfghjkl;'", "ASDFGHJKL:\"", 1.75),
+        ("zxcvbnm,./", "ZXCVBNM<>?", 2.25),
+    ],
+    "azerty": [
+        ("²&é\"'(-è_çà)=", "²1234567890°+", 0.0),
+        ("azertyuiop^$", "AZERTYUIOP¨£", 1.5),
+        ("qsdfghjklmù*", "QSDFGHJKLM%µ", 1.75),
+        ("<wxcvbn,;:!", ">WXCVBN?./§", 1.25),
+    ],
+    # Pavé numérique : grille sans décalage, les diagonales comptent ("7530", "1590")
+    "numpad": [
+        ("/*-", "/*-", 1.0),
+        ("789+", "789+", 0.0),
+        ("456", "456", 0.0),
+        ("123", "123", 0.0),
+        ("0 .", "0 .", 0.0),
+    ],
+}
+LAYOUT_NAMES = {"qwerty": "QWERTY", "azerty": "AZERTY", "numpad": "pavé numérique"}
+
+KEYBOARD_FEATURES = ['has_keyboard_walk', 'keyboard_walk_ratio']
+
+
+def _build_tables():
+    """
+    Tables précalculées par disposition :
+    - position de chaque caractère (rangée, colonne) et s'il est shifté ;
+    - voisins de chaque touche (même rangée à ±1, rangée voisine à moins d'une touche de décalage).
+    """
+    positions, neighbours = {}, {}
+    for layout, rows in LAYOUTS.items():
+        pos, keys = {}, []
+        for r, (plain, shifted, offset) in enumerate(rows):
+            for c, (p, s) in enumerate(zip(plain, shifted)):
+                if p == " ":
+                    continue
+                x = offset + c
+                keys.append((r, x))
+                pos.setdefault(p, (r, x, False))
+                pos.setdefault(s, (r, x, s != p))
+        diagonal = layout == "numpad"
+        adj = {}
+        for r1, x1 in keys:
+            adj[(r1, x1)] = {
+                (r2, x2) for r2, x2 in keys
+                if (r2, x2) != (r1, x1) and (
+                    (r1 == r2 and abs(x1 - x2) <= 1) or
+                    (abs(r1 - r2) == 1 and (abs(x1 - x2) <= 1 if diagonal else abs(x1 - x2) < 1))
+                )
+            }
+        positions[layout], neighbours[layout] = pos, adj
+    return positions, neighbours
+
+
+POSITIONS, NEIGHBOURS = _build_tables()
+
+
+def _step(layout, a, b):
+    """Direction du déplacement a -> b si les touches sont voisines (None sinon)."""
+    pa, pb = POSITIONS[layout].get(a), POSITIONS[layout].get(b)
+    if pa is None or pb is None or (pb[0], pb[1]) not in NEIGHBOURS[layout][(pa[0], pa[1])]:
+        return None
+    dx = pb[1] - pa[1]
+    return pb[0] - pa[0], (dx > 0) - (dx < 0)
+
+
+def _same_key(layout, a, b):
+    pa, pb = POSITIONS[layout].get(a), POSITIONS[layout].get(b)
+    return pa is not None and pb is not None and pa[:2] == pb[:2]
+
+
+def find_walks(password):
+    """
+    Marches clavier (touches voisines successives) sur chaque disposition, en un seul passage.
+    Les caractères shiftés comptent comme leur touche ; un changement de direction est un virage.
+    Renvoie des {layout, start, end, token, turns, shifted} sans chevauchement (la plus longue gagne).
+    """
+    password = str(password)
+    n = len(password)
+    state = {layout: {"start": 0, "direction": None, "turns": 0} for layout in LAYOUTS}
+    candidates = []
+
+    for i in range(1, n + 1):
+        for layout, st in state.items():
+            step = _step(layout, password[i - 1], password[i]) if i < n else None
+            # Un aller-retour sur la même touche ("202") n'est pas une marche : on repart de la dernière paire
+            backtrack = step is not None and i - st["start"] >= 2 and _same_key(layout, password[i], password[i - 2])
+            if step is not None and not backtrack:
+                if st["direction"] is not None and step != st["direction"]:
+                    st["turns"] += 1
+                st["direction"] = step
+                continue
+            if i - st["start"] >= MIN_WALK:
+                token = password[st["start"]:i]
+                candidates.append({
+                    "layout": layout, "start": st["start"], "end": i, "token": token, "turns": st["turns"],
+                    "shifted": sum(POSITIONS[layout][ch][2] for ch in token),
+                })
+            if backtrack:
+                st.update(start=i - 1, direction=step, turns=0)
+            else:
+                st.update(start=i, direction=None, turns=0)
+
+    walks, taken = [], set()
+    for w in sorted(candidates, key=lambda w: (w["start"] - w["end"], w["turns"])):
+        span = set(range(w["start"], w["end"]))
+        if not span & taken:
+            walks.append(w)
+            taken |= span
+    walks.sort(key=lambda w: w["start"])
+    return walks
+
+
+def walk_feedback(walks):
+    layouts = []
+    for w in walks:
+        if w["layout"] not in layouts:
+            layouts.append(w["layout"])
+    return [f"Suite de touches du clavier ({LAYOUT_NAMES[layout]})" for layout in layouts]
+
+
+def keyboard_features(password, walks=None):
+    password = str(password)
+    walks = find_walks(password) if walks is None else walks
+    covered = sum(w["end"] - w["start"] for w in walks)
+    return {
+        'has_keyboard_walk': int(bool(walks)),
+        'keyboard_walk_ratio': covered / len(password) if password else 0.0,
+    }
+
+
+def keyboard_features_batch(passwords):
+    """Version lot (entraînement) : un DataFrame aligné sur l'index de l'entrée."""
+    index = passwords.index if isinstance(passwords, pd.Series) else None
+    return pd.DataFrame([keyboard_features(p) for p in passwords], columns=KEYBOARD_FEATURES, index=index)
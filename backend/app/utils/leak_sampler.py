@@ -0,0 +1,222 @@
+import bz2
+import gzip
+import lzma
+import math
+import mmap
+import os
+import random  # Utilisé UNIQUEMENT pour l'échantillonnage, pas pour générer les mots de passe
+import secrets
+import string
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+# --- CONFIGURATION ---
+# Taille des blocs lus en une fois (lecture binaire, pas ligne par ligne)
+CHUNK_SIZE = 16 * 1024 * 1024
+# Taille d'une tranche de fichier confiée à un worker (fichiers non compressés uniquement)
+RANGE_SIZE = 256 * 1024 * 1024
+MAX_PWD_LEN = 50
+
+# Formats de fuites reconnus (le contenu compressé est décompressé à la volée)
+OPENERS = {".gz": gzip.open, ".xz": lzma.open, ".bz2": bz2.open}
+LEAK_PATTERNS = ["*.txt", "*.txt.gz", "*.txt.xz", "*.txt.bz2"]
+
+# Filtre ASCII identique à create_weak_passwords_csv (lettres, chiffres, ponctuation, espace)
+ALLOWED_BYTES = (string.ascii_letters + string.digits + string.punctuation + " ").encode("ascii")
+
+
+def find_leak_files(*directories):
+    """Liste les fichiers de fuites (.txt, compressés ou non) du premier dossier qui en contient."""
+    for directory in directories:
+        files = sorted(f for pattern in LEAK_PATTERNS for f in Path(directory).glob(pattern))
+        if files:
+            return files
+    return []
+
+
+def is_compressed(path):
+    return Path(path).suffix in OPENERS
+
+
+def keep_line(line):
+    """Même filtre que l'ancien échantillonneur : non vide, <= 50 caractères, ASCII standard."""
+    return 0 < len(line) <= MAX_PWD_LEN and not line.translate(None, ALLOWED_BYTES)
+
+
+def iter_line_blocks(read_block):
+    """
+    Transforme une suite de blocs binaires en listes de lignes complètes.
+    read_block() renvoie b"" à la fin du flux.
+    """
+    tail = b""
+    while True:
+        block = read_block()
+        if not block:
+            break
+        block = tail + block
+        cut = block.rfind(b"\n")
+        if cut == -1:
+            tail = block
+            continue
+        tail = block[cut + 1:]
+        yield block[:cut].split(b"\n")
+    if tail:
+        yield [tail]
+
+
+def iter_file_blocks(path, start=0, end=None):
+    """
+    Lignes brutes d'un fichier de fuite, par blocs.
+    - Fichier compressé : lecture en flux (start/end ignorés).
+    - Fichier texte : mmap, limité à la tranche [start, end) recalée sur les fins de ligne.
+    """
+    path = Path(path)
+    if is_compressed(path):
+        with OPENERS[path.suffix](path, "rb") as f:
+            yield from iter_line_blocks(lambda: f.read(CHUNK_SIZE))
+        return
+
+    size = path.stat().st_size
+    if size == 0:
+        return
+    end = size if end is None else min(end, size)
+
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        # Une ligne appartient à la tranche qui contient son premier octet
+        def align(pos):
+            if pos <= 0 or pos >= size:
+                return max(0, min(pos, size))
+            nl = mm.find(b"\n", pos - 1)
+            return size if nl == -1 else nl + 1
+
+        pos, end = align(start), align(end)
+
+        def read_block():
+            nonlocal pos
+            block = mm[pos:min(pos + CHUNK_SIZE, end)]
+            pos += len(block)
+            return block
+
+        yield from iter_line_blocks(read_block)
+
+
+def iter_passwords(path, start=0, end=None):
+    """Mots de passe filtrés (bytes), bloc par bloc."""
+    for lines in iter_file_blocks(path, start, end):
+        yield [p for p in (line.strip() for line in lines) if keep_line(p)]
+
+
+# --- RESERVOIR SAMPLING (ALGORITHME L) ---
+def _open_unit(rng):
+    """Réel uniforme dans ]0, 1[ (évite log(0))."""
+    u = rng.random()
+    while u == 0.0:
+        u = rng.random()
+    return u
+
+
+def reservoir_sample(blocks, k, rng):
+    """
+    Algorithme L (Li, 1994) : au lieu de tirer un aléatoire par ligne, on calcule
+    directement combien d'éléments sauter avant le prochain remplacement.
+    Renvoie (reservoir, nombre_total_d_elements_vus).
+    """
+    reservoir = []
+    seen = 0
+    w = 0.0
+    next_pos = 0  # Position (1-indexée) du prochain élément à insérer
+
+    for items in blocks:
+        m = len(items)
+
+        # Phase de remplissage
+        if len(reservoir) < k:
+            take = min(k - len(reservoir), m)
+            reservoir.extend(items[:take])
+            if len(reservoir) == k:
+                w = math.exp(math.log(_open_unit(rng)) / k)
+                next_pos = seen + take + math.floor(math.log(_open_unit(rng)) / math.log(1 - w)) + 1
+
+        # Phase de saut
+        if len(reservoir) == k:
+            while next_pos <= seen + m:
+                reservoir[rng.randrange(k)] = items[next_pos - seen - 1]
+                w *= math.exp(math.log(_open_unit(rng)) / k)
+                next_pos += math.floor(math.log(_open_unit(rng)) / math.log(1 - w)) + 1
+
+        seen += m
+    return reservoir, seen
+
+
+def _sample_task(task):
+    """Worker : échantillonne une tranche (ou un fichier compressé entier)."""
+    path, start, end, k, seed = task
+    rng = random.Random(seed)
+    return reservoir_sample(iter_passwords(path, start, end), k, rng)
+
+
+def merge_reservoirs(parts, k, rng):
+    """
+    Fusionne des réservoirs indépendants en un échantillon uniforme de taille k.
+    Chaque élément est pris dans la partie i avec une probabilité proportionnelle au
+    nombre d'éléments qu'elle représente encore (tirage hypergéométrique multivarié).
+    """
+    pools = []
+    for reservoir, count in parts:
+        reservoir = list(reservoir)
+        rng.shuffle(reservoir)
+        if count:
+            pools.append([reservoir, count])
+
+    total = sum(count for _, count in pools)
+    sample = []
+    while len(sample) < k and total > 0:
+        r = rng.randrange(total)
+        for pool in pools:
+            if r < pool[1]:
+                break
+            r -= pool[1]
+        sample.append(pool[0].pop())
+        pool[1] -= 1
+        total -= 1
+    return sample
+
+
+def split_ranges(files):
+    """Découpe les fichiers en tranches (path, start, end) ; un fichier compressé = une tranche."""
+    ranges = []
+    for path in files:
+        path = Path(path)
+        size = path.stat().st_size
+        if is_compressed(path) or size <= RANGE_SIZE:
+            ranges.append((str(path), 0, None))
+        else:
+            ranges.extend((str(path), s, s + RANGE_SIZE) for s in range(0, size, RANGE_SIZE))
+    return ranges
+
+
+def build_tasks(files, k, seed_rng):
+    return [(path, start, end, k, seed_rng.getrandbits(64)) for path, start, end in split_ranges(files)]
+
+
+def sample_leak_files(files, n, workers=None, seed=None):
+    """
+    Échantillon uniforme de n mots de passe parmi toutes les lignes valides des fichiers.
+    Les fichiers (ou tranches de fichiers) sont traités en parallèle puis fusionnés.
+    """
+    if n <= 0:
+        return []
+    seed_rng = random.Random(secrets.randbits(64) if seed is None else seed)
+    tasks = build_tasks(files, n, seed_rng)
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1 or len(tasks) == 1:
+        parts = [_sample_task(t) for t in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+            parts = list(pool.map(_sample_task, tasks))
+
+    total = sum(count for _, count in parts)
+    print(f"   -> {total} lignes valides parcourues ({len(tasks)} tranches).")
+    sample = merge_reservoirs(parts, n, seed_rng)
+    return [p.decode("ascii") for p in sample]
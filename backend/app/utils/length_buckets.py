@@ -0,0 +1,107 @@
+import numpy as np
+
+# --- CONFIGURATION ---
+# Bornes des tranches de longueur : une séquence de 7 caractères n'est complétée que jusqu'à 8, pas jusqu'à max_len.
+# Le dernier bucket va jusqu'à max_len. Peu de bornes = peu de formes différentes (peu de retraçages TensorFlow).
+LENGTH_BOUNDARIES = [8, 12, 16, 24]
+
+# Couches qui exigent une longueur fixe (ou dont la sortie dépend du nombre de 0 ajoutés)
+FIXED_LENGTH_LAYERS = {'Flatten', 'MaxPooling1D', 'AveragePooling1D'}
+RECURRENT_LAYERS = {'LSTM', 'GRU', 'SimpleRNN', 'Bidirectional'}
+# predict_on_batch par blocs : model.predict a un coût fixe (~100 ms) qui écraserait le gain sur les petits lots
+PREDICT_CHUNK = 4096
+# Le regroupement n'est rentable que si le coût suit le nombre de pas (couches récurrentes).
+# Mesuré sur CPU : le CNN, très peu coûteux, est plus lent en formes variables qu'en forme fixe (entraînement
+# comme inférence), il reste donc complété à max_len. inference_benchmark.py --length-buckets mesure les deux.
+BUCKETED_LAYERS = RECURRENT_LAYERS
+# Chaque appel au modèle coûte ~1 ms : une tranche plus petite est fusionnée avec la suivante (complétée plus loin)
+MIN_BUCKET_ROWS = 128
+
+
+def bucket_bounds(max_len, boundaries=LENGTH_BOUNDARIES):
+    return [b for b in boundaries if b < max_len] + [max_len]
+
+
+def sequence_lengths(X):
+    """Longueur réelle de séquences complétées par des 0 à droite (padding='post')."""
+    X = np.asarray(X)
+    if X.size == 0:
+        return np.zeros(len(X), dtype=int)
+    nonzero = X != 0
+    last = X.shape[1] - np.argmax(nonzero[:, ::-1], axis=1)
+    return np.where(nonzero.any(axis=1), last, 0)
+
+
+def padding_margin(model):
+    """
+    Nombre de 0 à conserver après la tranche pour que la sortie soit identique au padding complet :
+    - récurrent avec masque (mask_zero) : 0, les positions de padding sont ignorées ;
+    - convolution + pooling global : champ réceptif, pour retrouver les mêmes fenêtres (dont celle "tout padding").
+    None si le modèle exige la longueur complète (entrée de taille fixe, Flatten, récurrent sans masque).
+    """
+    try:
+        if model.input_shape[1] is not None:
+            return None
+    except (AttributeError, ValueError, IndexError, TypeError):
+        return None
+
+    names = {layer.__class__.__name__ for layer in model.layers}
+    if names & FIXED_LENGTH_LAYERS:
+        return None
+    if names & RECURRENT_LAYERS and not any(getattr(layer, 'mask_zero', False) for layer in model.layers):
+        return None
+    convs = [layer for layer in model.layers if layer.__class__.__name__ == 'Conv1D']
+    return sum(layer.kernel_size[0] - 1 for layer in convs) + 1 if convs else 0
+
+
+def bucketing_margin(model):
+    """Marge de padding si le regroupement par longueur est exact et rentable pour ce modèle, sinon None."""
+    margin = padding_margin(model)
+    if margin is None or not {layer.__class__.__name__ for layer in model.layers} & BUCKETED_LAYERS:
+        return None
+    return margin
+
+
+def group_by_length(X, boundaries=LENGTH_BOUNDARIES, min_rows=MIN_BUCKET_ROWS):
+    """
+    (indices, borne) de chaque tranche de longueur du lot. Une tranche de moins de min_rows lignes
+    rejoint la tranche suivante : un lot de 1 est complété à sa propre borne, un petit lot hétérogène
+    à la borne de sa plus longue séquence (un seul appel au modèle).
+    """
+    bounds = bucket_bounds(X.shape[1], boundaries)
+    buckets = np.searchsorted(bounds, sequence_lengths(X), side='left')
+    present = np.unique(buckets)
+    groups = []
+    carry = np.empty(0, dtype=int)
+    for b in present:
+        idx = np.concatenate([carry, np.flatnonzero(buckets == b)])
+        if len(idx) < min_rows and b != present[-1]:
+            carry = idx
+            continue
+        groups.append((idx, bounds[b]))
+        carry = np.empty(0, dtype=int)
+    return groups
+
+
+def _predict(model, X):
+    out = [np.asarray(model.predict_on_batch(X[i:i + PREDICT_CHUNK]))[:, 0] for i in range(0, len(X), PREDICT_CHUNK)]
+    return np.concatenate(out) if out else np.empty(0)
+
+
+def predict_bucketed(model, X, boundaries=LENGTH_BOUNDARIES, margin=None):
+    """
+    Prédictions d'un modèle DL sur un lot complété à max_len : le lot est découpé par tranche de longueur
+    et chaque tranche n'est complétée que jusqu'à sa borne (+ marge du modèle).
+    margin force le regroupement (benchmark) ; par défaut, celui de bucketing_margin.
+    """
+    X = np.asarray(X)
+    margin = bucketing_margin(model) if margin is None else margin
+    if margin is None or len(X) == 0:
+        return _predict(model, X)
+
+    max_len = X.shape[1]
+    out = np.empty(len(X), dtype=float)
+    for idx, bound in group_by_length(X, boundaries):
+        width = min(bound + margin, max_len)
+        out[idx] = _predict(model, X[idx, :width])
+    return out
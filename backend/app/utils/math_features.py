@@ -6,6 +6,11 @@ import string
 MAX_LENGTH_CEILING = 20
 # Le seuil où l'entropie est "parfaite" (bits)
 MAX_ENTROPY = 100.0
+# Vitesse de l'attaquant : 100 GigaHashes/seconde (bon GPU sur MD5, scénario pessimiste pour l'utilisateur)
+GPU_HASHRATE = 100_000_000_000
+# Taille de l'alphabet de chaque classe de caractères (mêmes valeurs que compute_entropy)
+CLASS_POOL = {'lower': 26, 'upper': 26, 'digit': 10, 'punct': 32}
+DIVERSITY_SCORES = {0: 0.0, 1: 0.1, 2: 0.4, 3: 0.8, 4: 1.0}
 
 
 def compute_length_norm(password: str) -> float:
@@ -61,6 +66,27 @@ def compute_entropy(password: str) -> float:
     entropy_bits = len(password) * math.log2(pool_size)
     return min(entropy_bits / MAX_ENTROPY, 1.0)
 
+def char_classes(c):
+    """Classes d'un caractère (comptage incrémental : un compteur par classe suffit)."""
+    classes = []
+    if c.islower(): classes.append('lower')
+    if c.isupper(): classes.append('upper')
+    if c.isdigit(): classes.append('digit')
+    if c in string.punctuation: classes.append('punct')
+    return classes
+
+
+def features_from_counts(length, counts):
+    """length_norm / diversity / entropy à partir des compteurs de classes (mêmes résultats que compute_*)."""
+    present = [cls for cls, n in counts.items() if n > 0]
+    pool_size = sum(CLASS_POOL[cls] for cls in present)
+    entropy = min(length * math.log2(pool_size) / MAX_ENTROPY, 1.0) if length and pool_size else 0.0
+    return {
+        'length_norm': 1 / (1 + math.exp(-0.4 * (length - 14))) if length else 0.0,
+        'diversity': DIVERSITY_SCORES.get(len(present), 0.0),
+        'entropy': entropy,
+    }
+
 def calculate_bruteforce_time(password):
     """
     Estime le temps de craquage par force brute pure (hors dictionnaire).
@@ -75,23 +101,25 @@ def calculate_bruteforce_time(password):
 
     if pool_size == 0: return "Instant"
 
-    # 2. Calcul des combinaisons (N^L)
-    combinations = pool_size ** len(password)
+    # 2. Combinaisons (N^L), en log2 : N^L / 2 ne tient plus dans un float vers 200 caractères
+    log2_combinations = len(password) * math.log2(pool_size)
+
+    # 3. Temps en secondes (Moyenne = 50% de l'espace)
+    log2_seconds = log2_combinations - 1 - math.log2(GPU_HASHRATE)
+    seconds = 2.0 ** log2_seconds if log2_seconds < 1000 else math.inf
 
-    # 3. Vitesse (Hashrate)
-    # 100 GigaHashes/seconde (très rapide, scénario pessimiste pour l'utilisateur)
-    hashrate = 100_000_000_000
+    # 4. Conversion lisible
+    return format_crack_time(seconds)
 
-    # 4. Temps en secondes (Moyenne = 50% de l'espace)
-    seconds = (combinations / 2) / hashrate
 
-    # 5. Conversion lisible
+def format_crack_time(seconds):
+    """Durée de craquage lisible (secondes -> "3 heures", "12 ans"...)."""
     if seconds < 1: return "Instantané"
     if seconds < 60: return f"{int(seconds)} secondes"
     if seconds < 3600: return f"{int(seconds / 60)} minutes"
     if seconds < 86400: return f"{int(seconds / 3600)} heures"
     if seconds < 31536000: return f"{int(seconds / 86400)} jours"
 
-    years = int(seconds / 31536000)
-    if years > 1000000: return "Des millions d'années"
-    return f"{years} ans"
\ No newline at end of file
+    # Comparaison avant int() : une durée infinie ou démesurée ne se convertit pas en entier
+    if seconds > 1000000 * 31536000: return "Des millions d'années"
+    return f"{int(seconds / 31536000)} ans"
\ No newline at end of file
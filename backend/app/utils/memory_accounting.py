@@ -0,0 +1,184 @@
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+import numpy as np
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+# --- CONFIGURATION ---
+try:
+    import resource
+
+    PAGE_SIZE = resource.getpagesize()
+except ImportError:
+    resource = None
+    PAGE_SIZE = 4096
+
+
+# --- RSS DU PROCESSUS ---
+def rss_bytes():
+    """RSS courant du processus (psutil, sinon /proc, sinon pic via resource)."""
+    if psutil is not None:
+        return psutil.Process().memory_info().rss
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * PAGE_SIZE
+    except (OSError, IndexError, ValueError):
+        pass
+    if resource is not None:
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return rss if sys.platform == "darwin" else rss * 1024
+    return 0
+
+
+# --- TAILLE PROFONDE ---
+def _keras_weights_size(model):
+    return sum(int(np.prod(w.shape)) * np.dtype(str(w.dtype)).itemsize for w in model.weights)
+
+
+def _special_size(obj):
+    """Tailles connues sans parcours : tableaux numpy, modèles Keras, boosters xgboost. None sinon."""
+    if isinstance(obj, np.ndarray):
+        # Une vue sur un autre tableau est comptée via ce tableau (cf. deep_sizeof)
+        return 0 if isinstance(obj.base, np.ndarray) else obj.nbytes
+    module = type(obj).__module__
+    if module.startswith(("keras", "tensorflow")) and hasattr(obj, "weights"):
+        try:
+            return _keras_weights_size(obj)
+        except Exception:
+            return None
+    if module.startswith("xgboost"):
+        try:
+            booster = obj.get_booster() if hasattr(obj, "get_booster") else obj
+            return len(booster.save_raw())
+        except Exception:
+            return None
+    return None
+
+
+def deep_sizeof(obj):
+    """
+    Taille mémoire approximative d'une structure (objets partagés comptés une fois).
+    Parcours itératif : conteneurs, attributs d'objets, état picklable (arbres sklearn).
+    """
+    seen = set()
+    # Les états temporaires restent référencés : sinon leurs id() seraient réutilisés pendant le parcours
+    keep_alive = []
+    stack = [obj]
+    total = 0
+    while stack:
+        o = stack.pop()
+        if id(o) in seen:
+            continue
+        seen.add(id(o))
+
+        if isinstance(o, np.ndarray) and isinstance(o.base, np.ndarray):
+            stack.append(o.base)
+        special = _special_size(o)
+        if special is not None:
+            total += special
+            continue
+
+        total += sys.getsizeof(o)
+        if isinstance(o, (str, bytes, bytearray, int, float, bool, type(None))):
+            continue
+        if isinstance(o, dict):
+            stack.extend(o.keys())
+            stack.extend(o.values())
+        elif isinstance(o, (list, tuple, set, frozenset)):
+            stack.extend(o)
+        elif isinstance(o, type):
+            continue
+        elif hasattr(o, "__dict__"):
+            stack.append(o.__dict__)
+        else:
+            # Objets Cython (ex : sklearn Tree) : leur état expose les tableaux internes
+            try:
+                state = o.__getstate__()
+            except Exception:
+                state = None
+            if isinstance(state, dict):
+                keep_alive.append(state)
+                stack.append(state)
+    return total
+
+
+# --- REGISTRE MÉMOIRE ---
+class MemoryLedger:
+    """Consommation mémoire de chaque ressource chargée : delta RSS au chargement + taille profonde."""
+
+    def __init__(self):
+        self.entries = {}
+        self.lock = threading.Lock()
+
+    @contextmanager
+    def track(self, name, kind):
+        """
+        Mesure le delta RSS du bloc (chargement d'un artefact, import d'un runtime...).
+        Le RSS est celui de tout le processus : deux blocs mesurés en même temps (ou une autre activité
+        du processus) se comptent l'un l'autre. L'appelant sérialise les chargements qu'il veut mesurer
+        (cf. ModelPool). Si le bloc échoue, aucune mesure n'est gardée pour ce nom.
+        """
+        before = rss_bytes()
+        start = time.perf_counter()
+        completed = False
+        try:
+            yield
+            completed = True
+        finally:
+            with self.lock:
+                if completed:
+                    self.entries[name] = {
+                        "kind": kind,
+                        "rss_delta_bytes": max(rss_bytes() - before, 0),
+                        "load_seconds": round(time.perf_counter() - start, 3),
+                        "deep_size_bytes": None,
+                    }
+                else:
+                    # Une mesure antérieure (chargement précédent) ne vaut plus pour la ressource en échec
+                    self.entries.pop(name, None)
+
+    def entry(self, name):
+        """Copie de la mesure d'une ressource (None si inconnue), lue sous le verrou."""
+        with self.lock:
+            entry = self.entries.get(name)
+            return dict(entry) if entry is not None else None
+
+    def measure(self, name, obj):
+        size = deep_sizeof(obj)
+        with self.lock:
+            self.entries.setdefault(name, {"kind": "object", "rss_delta_bytes": None, "load_seconds": None})
+            self.entries[name]["deep_size_bytes"] = size
+        return size
+
+    def forget(self, name):
+        """Ressource déchargée (ex : modèle évincé du pool) : elle ne compte plus dans le rapport."""
+        with self.lock:
+            self.entries.pop(name, None)
+
+    def report(self):
+        with self.lock:
+            rows = [{"name": name, **entry} for name, entry in self.entries.items()]
+        # La ressource la plus lourde en premier : c'est celle à alléger d'abord
+        return sorted(rows, key=lambda r: max(r["rss_delta_bytes"] or 0, r["deep_size_bytes"] or 0), reverse=True)
+
+
+def format_bytes(n):
+    if n is None:
+        return "-"
+    for unit in ["o", "Ko", "Mo", "Go"]:
+        if abs(n) < 1024 or unit == "Go":
+            return f"{n:.1f} {unit}" if unit != "o" else f"{n} o"
+        n /= 1024
+
+
+def log_report(rows, title="Mémoire par ressource"):
+    print(f"--- 🧮 {title} (RSS actuel : {format_bytes(rss_bytes())}) ---")
+    for r in rows:
+        print(f"   {r['name']:<22} {r['kind']:<10} RSS +{format_bytes(r['rss_delta_bytes']):>10} | "
+              f"taille {format_bytes(r['deep_size_bytes']):>10}")
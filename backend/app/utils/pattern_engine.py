@@ -0,0 +1,207 @@
+import pandas as pd
+
+# --- CONFIGURATION ---
+# Longueur minimale d'une suite ("abc", "987") ou d'une répétition ("aaa")
+MIN_RUN = 3
+YEAR_MIN, YEAR_MAX = 1900, 2039
+DATE_SEPARATORS = "/-. "
+
+PATTERN_TYPES = ['date', 'year', 'repeat', 'sequence']
+PATTERN_FEATURES = ['has_sequence', 'has_repeat', 'has_date', 'has_year', 'pattern_ratio']
+
+FEEDBACK = {
+    'date': "Contient une date",
+    'year': "Contient une année",
+    'repeat': "Caractères répétés",
+    'sequence': "Suite logique",
+}
+
+
+def _kind(c):
+    if '0' <= c <= '9':
+        return 'digit'
+    if 'a' <= c <= 'z' or 'A' <= c <= 'Z':
+        return 'letter'
+    return None
+
+
+def _code(c):
+    return ord(c.lower())
+
+
+def _is_year(text):
+    return len(text) == 4 and YEAR_MIN <= int(text) <= YEAR_MAX
+
+
+def _is_date(day, month, year):
+    if not (1 <= int(day) <= 31 and 1 <= int(month) <= 12):
+        return False
+    return len(year) == 2 or _is_year(year)
+
+
+def _digit_group_patterns(password, start, end, found):
+    """Dates collées (JJMMAAAA, AAAAMMJJ, JJMMAA) puis années dans un bloc de chiffres."""
+    j = start
+    while j < end:
+        matched = False
+        if end - j >= 8:
+            s = password[j:j + 8]
+            if _is_date(s[:2], s[2:4], s[4:]) or _is_date(s[6:], s[4:6], s[:4]):
+                found.append({'type': 'date', 'start': j, 'end': j + 8, 'token': s})
+                j, matched = j + 8, True
+        if not matched and end - j >= 6:
+            s = password[j:j + 6]
+            if _is_date(s[:2], s[2:4], s[4:]):
+                found.append({'type': 'date', 'start': j, 'end': j + 6, 'token': s})
+                j, matched = j + 6, True
+        if not matched and end - j >= 4 and _is_year(password[j:j + 4]):
+            found.append({'type': 'year', 'start': j, 'end': j + 4, 'token': password[j:j + 4]})
+            j, matched = j + 4, True
+        if not matched:
+            j += 1
+
+
+def _separated_date(password, groups, found):
+    """Date avec séparateurs (12/05/1998, 1998-05-12) : les 3 derniers blocs de chiffres, même séparateur."""
+    if len(groups) < 3:
+        return
+    (s1, e1), (s2, e2), (s3, e3) = groups[-3:]
+    if not (s2 == e1 + 1 and s3 == e2 + 1):
+        return
+    sep = password[e1]
+    if sep not in DATE_SEPARATORS or password[e2] != sep:
+        return
+    a, b, c = password[s1:e1], password[s2:e2], password[s3:e3]
+    if (len(a) <= 2 and len(b) <= 2 and len(c) in (2, 4) and _is_date(a, b, c)) or \
+            (len(a) == 4 and len(b) <= 2 and len(c) <= 2 and _is_date(c, b, a)):
+        found.append({'type': 'date', 'start': s1, 'end': e3, 'token': password[s1:e3]})
+
+
+class PatternScanner:
+    """
+    Scanner incrémental : un caractère ajouté (push) ou retiré (pop) à la fin ne rejoue pas tout le mot de passe.
+    L'état avant chaque caractère est mémorisé, les motifs déjà fermés ne dépendent plus de la suite.
+    """
+
+    def __init__(self, password=""):
+        self.text = ""
+        self.found = []
+        self.groups = []
+        self.rep_start = 0
+        self.seq_start, self.seq_step = 0, None
+        self.digit_start = None
+        self.history = []
+        for c in str(password):
+            self.push(c)
+
+    def _step(self, i, c, found, groups):
+        """Traite la position i (c=None : fin du mot de passe). Renvoie le nouvel état scalaire."""
+        password = self.text
+        rep_start, seq_start, seq_step, digit_start = self.rep_start, self.seq_start, self.seq_step, self.digit_start
+        if c is not None:
+            password += c
+
+        # Répétitions : même caractère consécutif
+        if c is None or i == 0 or c != password[i - 1]:
+            if i - rep_start >= MIN_RUN:
+                found.append({'type': 'repeat', 'start': rep_start, 'end': i, 'token': password[rep_start:i]})
+            rep_start = i
+
+        # Suites : même classe, pas de +1 ou -1 (le point de retournement de "12321" est partagé)
+        step = None
+        if c is not None and i > 0:
+            kind = _kind(c)
+            if kind and kind == _kind(password[i - 1]):
+                diff = _code(c) - _code(password[i - 1])
+                step = diff if diff in (1, -1) else None
+        if step is None or step != seq_step:
+            if seq_step is not None and i - seq_start >= MIN_RUN:
+                found.append({'type': 'sequence', 'start': seq_start, 'end': i, 'token': password[seq_start:i]})
+            seq_start, seq_step = (i - 1, step) if step is not None else (i, None)
+
+        # Blocs de chiffres : analysés (dates, années) à leur fermeture
+        if c is not None and '0' <= c <= '9':
+            if digit_start is None:
+                digit_start = i
+        elif digit_start is not None:
+            _digit_group_patterns(password, digit_start, i, found)
+            groups.append((digit_start, i))
+            _separated_date(password, groups, found)
+            digit_start = None
+
+        return rep_start, seq_start, seq_step, digit_start
+
+    def push(self, c):
+        self.history.append((self.rep_start, self.seq_start, self.seq_step, self.digit_start,
+                             len(self.found), len(self.groups)))
+        state = self._step(len(self.text), c, self.found, self.groups)
+        self.rep_start, self.seq_start, self.seq_step, self.digit_start = state
+        self.text += c
+
+    def pop(self):
+        if not self.text:
+            return
+        self.rep_start, self.seq_start, self.seq_step, self.digit_start, n_found, n_groups = self.history.pop()
+        del self.found[n_found:]
+        del self.groups[n_groups:]
+        self.text = self.text[:-1]
+
+    def update(self, password):
+        """Aligne le scanner sur un nouveau texte : retour au plus long préfixe commun, puis ajout de la fin."""
+        password = str(password)
+        common = 0
+        limit = min(len(password), len(self.text))
+        while common < limit and password[common] == self.text[common]:
+            common += 1
+        while len(self.text) > common:
+            self.pop()
+        for c in password[common:]:
+            self.push(c)
+
+    def patterns(self):
+        """Motifs du texte courant (les motifs encore ouverts sont fermés sur une copie de l'état)."""
+        found, groups = list(self.found), list(self.groups)
+        self._step(len(self.text), None, found, groups)
+
+        # Une année incluse dans une date n'est pas signalée deux fois
+        dates = [(p['start'], p['end']) for p in found if p['type'] == 'date']
+        found = [p for p in found
+                 if p['type'] != 'year' or not any(s <= p['start'] and p['end'] <= e for s, e in dates)]
+        found.sort(key=lambda p: (p['start'], p['end']))
+        return found
+
+
+def find_patterns(password):
+    """
+    Détecte en un seul passage : suites (lettres ou chiffres, croissantes ou décroissantes, de toute longueur),
+    répétitions, dates et années. Renvoie une liste de {type, start, end, token} triée par position.
+    """
+    return PatternScanner(password).patterns()
+
+
+def pattern_feedback(patterns):
+    types = {p['type'] for p in patterns}
+    return [FEEDBACK[t] for t in PATTERN_TYPES if t in types]
+
+
+def pattern_features(password, patterns=None):
+    """Features de motifs d'un mot de passe : présence de chaque type + part des caractères couverts."""
+    password = str(password)
+    patterns = find_patterns(password) if patterns is None else patterns
+    covered = set()
+    for p in patterns:
+        covered.update(range(p['start'], p['end']))
+    types = {p['type'] for p in patterns}
+    return {
+        'has_sequence': int('sequence' in types),
+        'has_repeat': int('repeat' in types),
+        'has_date': int('date' in types),
+        'has_year': int('year' in types),
+        'pattern_ratio': len(covered) / len(password) if password else 0.0,
+    }
+
+
+def pattern_features_batch(passwords):
+    """Version lot (entraînement) : un DataFrame aligné sur l'index de l'entrée."""
+    index = passwords.index if isinstance(passwords, pd.Series) else None
+    return pd.DataFrame([pattern_features(p) for p in passwords], columns=PATTERN_FEATURES, index=index)
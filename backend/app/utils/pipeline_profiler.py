@@ -0,0 +1,243 @@
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+from backend.app.utils.memory_accounting import format_bytes, rss_bytes
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+# --- CONFIGURATION ---
+BASE_DIR = Path(__file__).resolve().parents[3]
+RUNS_DIR = BASE_DIR / "benchmarks" / "pipeline"
+HISTORY_FILE = RUNS_DIR / "history.jsonl"
+# Variables transmises par retrain_all.py aux scripts de chaque étape
+PROFILE_FILE_ENV = "PIPELINE_PROFILE_FILE"  # JSONL où chaque sous-étape ajoute sa mesure
+TRACEMALLOC_ENV = "PIPELINE_TRACEMALLOC"  # "1" : pic d'allocations Python par sous-étape (ralentit le code Python)
+# Tolérance avant de signaler une régression par rapport au run précédent (+15% de temps ou de pic RSS)
+DEFAULT_THRESHOLD = 0.15
+# En dessous, les écarts de durée sont du bruit (démarrage de l'interpréteur...)
+MIN_SECONDS = 1.0
+# Période d'échantillonnage du RSS pendant une sous-étape (s)
+RSS_SAMPLE_INTERVAL = 0.01
+
+
+# --- SOUS-ÉTAPES (CÔTÉ SCRIPT) ---
+_active = []
+
+
+class RssSampler:
+    """
+    Pic de RSS d'une sous-étape, relevé par un thread toutes les RSS_SAMPLE_INTERVAL s.
+    ru_maxrss ne convient pas : c'est le pic du processus depuis son démarrage, pas celui de la sous-étape.
+    Un pic plus bref que l'intervalle peut échapper au relevé.
+    """
+
+    def __init__(self, interval=RSS_SAMPLE_INTERVAL):
+        self.interval = interval
+        self.peak = rss_bytes()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True, name="rss-sampler")
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, rss_bytes())
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, rss_bytes())
+        return False
+
+
+@contextmanager
+def substep(name):
+    """
+    Mesure une sous-étape nommée d'un script du pipeline : durée, CPU, RSS, pic d'allocations Python.
+    Hors retrain_all.py (PIPELINE_PROFILE_FILE absent), le bloc s'exécute sans aucune mesure.
+    """
+    path = os.getenv(PROFILE_FILE_ENV)
+    if not path:
+        yield
+        return
+
+    if os.getenv(TRACEMALLOC_ENV) == "1" and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    tracing = tracemalloc.is_tracing()
+    if tracing:
+        # Le pic en cours appartient à la sous-étape parente : on le lui reporte avant de repartir de zéro
+        if _active:
+            _active[-1]["py_peak"] = max(_active[-1]["py_peak"], tracemalloc.get_traced_memory()[1])
+        tracemalloc.reset_peak()
+    frame = {"name": name, "py_peak": 0}
+    _active.append(frame)
+    # Sous-étapes imbriquées : "entraînement/rf"
+    name = "/".join(f["name"] for f in _active)
+
+    rss_before = rss_bytes()
+    cpu_start, wall_start = time.process_time(), time.perf_counter()
+    try:
+        with RssSampler() as sampler:
+            yield
+    finally:
+        wall = time.perf_counter() - wall_start
+        cpu = time.process_time() - cpu_start
+        _active.pop()
+        if tracing:
+            frame["py_peak"] = max(frame["py_peak"], tracemalloc.get_traced_memory()[1])
+            if _active:
+                _active[-1]["py_peak"] = max(_active[-1]["py_peak"], frame["py_peak"])
+            tracemalloc.reset_peak()
+        record = {
+            "name": name,
+            "wall_seconds": round(wall, 3),
+            "cpu_seconds": round(cpu, 3),
+            "cpu_utilization": round(cpu / wall, 3) if wall > 0 else None,
+            "rss_before_bytes": rss_before,
+            "rss_after_bytes": rss_bytes(),
+            # Pic échantillonné pendant la sous-étape (le pic de processus ru_maxrss est mesuré par étape)
+            "peak_rss_sampled_bytes": sampler.peak,
+            "py_peak_bytes": frame["py_peak"] if tracing else None,
+        }
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+
+
+# --- ÉTAPES (CÔTÉ ORCHESTRATEUR) ---
+def _read_substeps(path):
+    if not path.exists():
+        return []
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def run_stage(name, script, tracemalloc_enabled=False):
+    """
+    Exécute le script d'une étape dans un sous-processus et mesure : durée, CPU (utilisateur + système)
+    et pic de RSS de ce processus (os.wait4), sous-étapes déclarées par le script.
+    """
+    RUNS_DIR.mkdir(parents=True, exist_ok=True)
+    substeps_file = RUNS_DIR / f".substeps-{os.getpid()}.jsonl"
+    substeps_file.unlink(missing_ok=True)
+    env = dict(os.environ, **{PROFILE_FILE_ENV: str(substeps_file), TRACEMALLOC_ENV: "1" if tracemalloc_enabled else "0"})
+    # Les scripts importent backend.app... : la racine du dépôt doit être sur leur sys.path (pas seulement le nôtre)
+    env["PYTHONPATH"] = os.pathsep.join(p for p in [str(BASE_DIR), os.environ.get("PYTHONPATH")] if p)
+
+    start = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, str(script)], env=env)
+    usage = None
+    if hasattr(os, "wait4"):
+        # Ressources de CE processus (Popen.wait ne les expose pas)
+        _, status, usage = os.wait4(proc.pid, 0)
+        proc.returncode = os.waitstatus_to_exitcode(status)
+    else:
+        proc.wait()
+    wall = time.perf_counter() - start
+
+    stage = {"name": name, "script": Path(script).name, "returncode": proc.returncode,
+             "wall_seconds": round(wall, 3), "cpu_user_seconds": None, "cpu_system_seconds": None,
+             "cpu_utilization": None, "peak_rss_bytes": None}
+    if usage is not None:
+        cpu = usage.ru_utime + usage.ru_stime
+        stage.update({
+            "cpu_user_seconds": round(usage.ru_utime, 3),
+            "cpu_system_seconds": round(usage.ru_stime, 3),
+            # > 1 : plusieurs cœurs occupés (TensorFlow, n_jobs, processus de travail)
+            "cpu_utilization": round(cpu / wall, 3) if wall > 0 else None,
+            "peak_rss_bytes": int(usage.ru_maxrss if sys.platform == "darwin" else usage.ru_maxrss * 1024),
+        })
+    stage["substeps"] = _read_substeps(substeps_file)
+    substeps_file.unlink(missing_ok=True)
+    return stage
+
+
+def print_stage(stage):
+    cpu = f"{stage['cpu_utilization']:.2f}" if stage["cpu_utilization"] is not None else "-"
+    print(f"📊 {stage['wall_seconds']:.2f}s | CPU x{cpu} (sur {os.cpu_count()} cœurs) | "
+          f"pic RSS {format_bytes(stage['peak_rss_bytes'])}")
+    for s in stage["substeps"]:
+        py_peak = f" | pic Python {format_bytes(s['py_peak_bytes'])}" if s["py_peak_bytes"] is not None else ""
+        print(f"   - {s['name']:<32} {s['wall_seconds']:>9.2f}s | CPU x{s['cpu_utilization'] or 0:.2f} | "
+              f"pic RSS échantillonné {format_bytes(s.get('peak_rss_sampled_bytes'))}{py_peak}")
+
+
+# --- RAPPORT DE RUN ET HISTORIQUE ---
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BASE_DIR,
+                              capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def new_run_report():
+    return {"started_at": datetime.now().isoformat(timespec="seconds"), "git_commit": git_commit(),
+            "cpu_count": os.cpu_count(), "stages": []}
+
+
+def load_history():
+    if not HISTORY_FILE.exists():
+        return []
+    with open(HISTORY_FILE, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def save_run_report(report):
+    """Rapport complet dans run-<date>.json + une ligne dans history.jsonl (un run par ligne)."""
+    RUNS_DIR.mkdir(parents=True, exist_ok=True)
+    path = RUNS_DIR / f"run-{datetime.now():%Y%m%d-%H%M%S}_{report['git_commit'] or 'nogit'}.json"
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    with open(HISTORY_FILE, "a", encoding="utf-8") as f:
+        f.write(json.dumps(report) + "\n")
+    print(f"💾 Rapport du pipeline : {path}")
+    return path
+
+
+def _measures(report):
+    """{(étape, sous-étape ou None): (durée, pic RSS)} : pic du processus par étape, pic échantillonné par sous-étape."""
+    out = {}
+    for stage in report["stages"]:
+        out[(stage["name"], None)] = (stage["wall_seconds"], stage["peak_rss_bytes"])
+        for s in stage["substeps"]:
+            # Rapports antérieurs : ru_maxrss par sous-étape, non comparable (pas de clé échantillonnée)
+            out[(stage["name"], s["name"])] = (s["wall_seconds"], s.get("peak_rss_sampled_bytes"))
+    return out
+
+
+def compare_runs(current, previous, threshold=DEFAULT_THRESHOLD):
+    """Régressions (durée ou pic RSS) d'un run par rapport au précédent : [(étape, sous-étape, mesure, avant, après)]."""
+    before = _measures(previous)
+    regressions = []
+    for key, (wall, rss) in _measures(current).items():
+        if key not in before:
+            continue
+        ref_wall, ref_rss = before[key]
+        if ref_wall >= MIN_SECONDS and wall > ref_wall * (1 + threshold):
+            regressions.append((*key, "wall_seconds", ref_wall, wall))
+        if ref_rss and rss and rss > ref_rss * (1 + threshold):
+            regressions.append((*key, "peak_rss_bytes", ref_rss, rss))
+    return regressions
+
+
+def print_regressions(regressions, threshold):
+    if not regressions:
+        print(f"✅ Aucune régression par rapport au run précédent (seuil {threshold:.0%}).")
+        return
+    print(f"⚠️ {len(regressions)} régression(s) par rapport au run précédent (seuil {threshold:.0%}) :")
+    for stage, sub, metric, before, after in regressions:
+        fmt = format_bytes if metric == "peak_rss_bytes" else (lambda v: f"{v:.2f}s")
+        print(f"  - {stage + ' / ' + sub if sub else stage} {metric} : {fmt(before)} -> {fmt(after)}")
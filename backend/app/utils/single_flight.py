@@ -0,0 +1,39 @@
+import asyncio
+import functools
+
+
+class SingleFlight:
+    """
+    Fusion des requêtes identiques simultanées : tant qu'un calcul est en cours pour une clé,
+    les requêtes suivantes attendent son résultat au lieu de relancer l'inférence.
+    Rien n'est mis en cache : une fois le calcul terminé, la requête suivante recalcule.
+    """
+
+    def __init__(self):
+        self.in_flight = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    async def run(self, key, fn, *args):
+        """Résultat de fn(*args), exécuté dans un thread ; partagé avec les requêtes de même clé."""
+        self.calls += 1
+        future = self.in_flight.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(None, functools.partial(fn, *args))
+            self.in_flight[key] = future
+            future.add_done_callback(lambda f, k=key: self._finish(k, f))
+        else:
+            self.coalesced += 1
+        # shield : l'annulation d'un client (déconnexion) n'annule pas le calcul partagé
+        return await asyncio.shield(future)
+
+    def _finish(self, key, future):
+        if self.in_flight.get(key) is future:
+            del self.in_flight[key]
+        # Erreur déjà transmise aux appelants : évite l'avertissement "exception never retrieved"
+        if not future.cancelled():
+            future.exception()
+
+    def status(self):
+        return {"in_flight": len(self.in_flight), "calls": self.calls, "coalesced": self.coalesced}
@@ -0,0 +1,169 @@
+import math
+import string
+
+import numpy as np
+import pandas as pd
+
+# --- CONFIGURATION ---
+# HyperLogLog : 2^14 registres (16 Ko), erreur relative ~0.8%
+HLL_PRECISION = 14
+# Count-Min : 4 lignes de 2^20 compteurs uint32 (16 Mo), surestimation <= e/width * N avec proba 1 - e^-depth
+CMS_WIDTH = 1 << 20
+CMS_DEPTH = 4
+# Candidats conservés pour le top-k (marge pour les mots de passe dont l'estimation fluctue)
+HEAVY_HITTERS_FACTOR = 10
+# Longueurs au-delà regroupées dans le dernier bin
+MAX_HIST_LENGTH = 64
+CHAR_CLASSES = {
+    'lower': f"[{string.ascii_lowercase}]",
+    'upper': f"[{string.ascii_uppercase}]",
+    'digit': r"\d",
+    'punct': "[" + "".join("\\" + c for c in string.punctuation) + "]",
+}
+
+MASK64 = np.uint64(0xFFFFFFFFFFFFFFFF)
+
+
+def hash_values(values):
+    """Hash 64 bits vectorisé (même valeur -> même hash, d'un morceau à l'autre)."""
+    return pd.util.hash_array(np.asarray(values, dtype=object), categorize=False)
+
+
+def _mix(h):
+    """Finaliseur de splitmix64 : bits bien répartis à partir du hash pandas."""
+    h = h.astype(np.uint64, copy=True)
+    with np.errstate(over='ignore'):
+        h ^= h >> np.uint64(30)
+        h *= np.uint64(0xBF58476D1CE4E5B9)
+        h ^= h >> np.uint64(27)
+        h *= np.uint64(0x94D049BB133111EB)
+        h ^= h >> np.uint64(31)
+    return h & MASK64
+
+
+class HyperLogLog:
+    """Nombre d'éléments distincts en mémoire fixe (2^p registres d'un octet)."""
+
+    def __init__(self, p=HLL_PRECISION):
+        self.p = p
+        self.m = 1 << p
+        self.registers = np.zeros(self.m, dtype=np.uint8)
+        self.alpha = 0.7213 / (1 + 1.079 / self.m)
+
+    def add_hashes(self, hashes):
+        h = _mix(hashes)
+        idx = (h >> np.uint64(64 - self.p)).astype(np.int64)
+        rest = (h << np.uint64(self.p)) & MASK64
+        # Rang = position du premier bit à 1 dans les 64 - p bits restants (+1)
+        width = 64 - self.p
+        # log2 sur 53 bits au plus : la conversion en float64 reste exacte (pas d'arrondi à la puissance de 2 suivante)
+        high = (rest >> np.uint64(11)).astype(np.float64)
+        low = np.maximum(rest, np.uint64(1)).astype(np.float64)
+        top = np.where(high > 0, np.floor(np.log2(np.maximum(high, 1))) + 11, np.floor(np.log2(low))).astype(np.int64)
+        rank = np.where(rest == 0, width + 1, 64 - top).astype(np.uint8)
+        np.maximum.at(self.registers, idx, rank)
+
+    def add(self, values):
+        self.add_hashes(hash_values(values))
+
+    def merge(self, other):
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    def count(self):
+        estimate = self.alpha * self.m ** 2 / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        # Petites cardinalités : comptage linéaire (plus précis tant qu'il reste des registres vides)
+        if estimate <= 2.5 * self.m and zeros:
+            estimate = self.m * math.log(self.m / zeros)
+        return int(round(estimate))
+
+
+class CountMinSketch:
+    """Fréquences approchées (jamais sous-estimées) en mémoire fixe : depth x width compteurs."""
+
+    def __init__(self, width=CMS_WIDTH, depth=CMS_DEPTH):
+        self.width = width
+        self.depth = depth
+        self.table = np.zeros((depth, width), dtype=np.uint32)
+        self.total = 0
+
+    def _indices(self, hashes):
+        # Double hachage (Kirsch-Mitzenmacher) : depth index à partir de deux moitiés de 32 bits
+        h = _mix(hashes)
+        h1, h2 = h & np.uint64(0xFFFFFFFF), h >> np.uint64(32)
+        with np.errstate(over='ignore'):
+            return [((h1 + np.uint64(i) * h2) % np.uint64(self.width)).astype(np.int64) for i in range(self.depth)]
+
+    def add_hashes(self, hashes, counts=None):
+        counts = np.ones(len(hashes), dtype=np.uint64) if counts is None else np.asarray(counts, dtype=np.uint64)
+        for row, idx in zip(self.table, self._indices(hashes)):
+            row += np.bincount(idx, weights=counts, minlength=self.width).astype(np.uint32)
+        self.total += int(counts.sum())
+
+    def estimate_hashes(self, hashes):
+        if len(hashes) == 0:
+            return np.zeros(0, dtype=np.int64)
+        return np.min([row[idx] for row, idx in zip(self.table, self._indices(hashes))], axis=0).astype(np.int64)
+
+
+class HeavyHitters:
+    """Top-k approché : Count-Min pour les fréquences, ensemble borné de candidats (k x HEAVY_HITTERS_FACTOR)."""
+
+    def __init__(self, k=20, width=CMS_WIDTH, depth=CMS_DEPTH):
+        self.k = k
+        self.capacity = k * HEAVY_HITTERS_FACTOR
+        self.sketch = CountMinSketch(width, depth)
+        self.candidates = {}  # valeur -> hash
+
+    def add(self, values):
+        counts = pd.Series(values).value_counts(sort=False)
+        hashes = hash_values(counts.index)
+        self.sketch.add_hashes(hashes, counts.to_numpy())
+
+        # Candidats du morceau : les plus fréquents d'après le sketch (vectorisé, pas de boucle par ligne)
+        estimates = self.sketch.estimate_hashes(hashes)
+        if len(estimates) > self.capacity:
+            best = np.argpartition(-estimates, self.capacity)[:self.capacity]
+        else:
+            best = np.arange(len(estimates))
+        for i in best:
+            self.candidates[counts.index[i]] = hashes[i]
+        self._prune()
+
+    def _prune(self):
+        if len(self.candidates) <= self.capacity:
+            return
+        values = list(self.candidates)
+        estimates = self.sketch.estimate_hashes(np.array([self.candidates[v] for v in values], dtype=np.uint64))
+        keep = np.argsort(-estimates, kind='stable')[:self.capacity]
+        self.candidates = {values[i]: self.candidates[values[i]] for i in keep}
+
+    def top(self, k=None):
+        """[(valeur, fréquence estimée)] par fréquence décroissante."""
+        values = list(self.candidates)
+        if not values:
+            return []
+        estimates = self.sketch.estimate_hashes(np.array([self.candidates[v] for v in values], dtype=np.uint64))
+        order = np.argsort(-estimates, kind='stable')[:k or self.k]
+        return [(values[i], int(estimates[i])) for i in order]
+
+
+class PasswordHistograms:
+    """Histogrammes exacts à mémoire constante : longueurs, nombre de classes, présence de chaque classe."""
+
+    def __init__(self, max_length=MAX_HIST_LENGTH):
+        self.max_length = max_length
+        self.lengths = np.zeros(max_length + 1, dtype=np.int64)
+        self.n_classes = np.zeros(len(CHAR_CLASSES) + 1, dtype=np.int64)
+        self.classes = dict.fromkeys(CHAR_CLASSES, 0)
+
+    def add(self, values):
+        s = pd.Series(values, dtype=object).astype(str)
+        self.lengths += np.bincount(np.minimum(s.str.len().to_numpy(), self.max_length),
+                                    minlength=self.max_length + 1)
+        present = np.zeros(len(s), dtype=np.int64)
+        for cls, pattern in CHAR_CLASSES.items():
+            has = s.str.contains(pattern, regex=True).to_numpy()
+            self.classes[cls] += int(has.sum())
+            present += has
+        self.n_classes += np.bincount(present, minlength=len(CHAR_CLASSES) + 1)
@@ -0,0 +1,170 @@
+import os
+import string
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# --- CONFIGURATION ---
+# Octets d'aléa tirés d'os.urandom en une fois
+RANDOM_BLOCK = 1 << 20
+BATCH_SIZE = 200_000
+MIN_LEN, MAX_LEN = 14, 32
+
+# Mêmes alphabets et mêmes probabilités que dataset_loader.generate_strong_password
+FULL_ALPHABET = string.ascii_letters + string.digits + string.punctuation
+MIXED_POOLS = [
+    string.ascii_letters + string.digits,
+    string.ascii_letters + string.punctuation,
+    string.ascii_lowercase + string.ascii_uppercase + string.punctuation,
+]
+SIMPLE_POOLS = [
+    string.ascii_letters + string.digits,
+    string.ascii_letters + "!@#$%&?",
+]
+ALPHABETS = [FULL_ALPHABET] + MIXED_POOLS + SIMPLE_POOLS
+SEPARATORS = ['-', '_', '.', '', ' ']
+# Un mot de passe aléatoire contient au moins un caractère de chaque classe présente dans son alphabet
+CHARACTER_CLASSES = [string.ascii_lowercase, string.ascii_uppercase, string.digits, string.punctuation]
+
+
+def required_classes(alphabet):
+    """Classes de caractères (restreintes à l'alphabet) qu'un mot de passe tiré de cet alphabet doit contenir."""
+    return ["".join(c for c in cls if c in alphabet) for cls in CHARACTER_CLASSES if set(cls) & set(alphabet)]
+
+
+def has_required_classes(password, alphabet):
+    return all(set(password) & set(cls) for cls in required_classes(alphabet))
+
+
+_ALPHABET_ARRAYS = [np.frombuffer(a.encode("ascii"), dtype=np.uint8) for a in ALPHABETS]
+_REQUIRED_ARRAYS = [[np.frombuffer(c.encode("ascii"), dtype=np.uint8) for c in required_classes(a)] for a in ALPHABETS]
+_word_list = None
+
+
+class UrandomStream:
+    """Aléa cryptographique (os.urandom) consommé par gros blocs."""
+
+    def __init__(self, block_size=RANDOM_BLOCK):
+        self.block_size = block_size
+        self.buffer = np.empty(0, dtype=np.uint8)
+
+    def take(self, n):
+        if len(self.buffer) < n:
+            fresh = np.frombuffer(os.urandom(max(self.block_size, n - len(self.buffer))), dtype=np.uint8)
+            self.buffer = np.concatenate([self.buffer, fresh])
+        out, self.buffer = self.buffer[:n], self.buffer[n:]
+        return out
+
+
+def uniform_ints(stream, m, count):
+    """
+    count entiers uniformes dans [0, m), sans biais modulo :
+    les tirages au-delà du plus grand multiple de m sont rejetés.
+    """
+    if count == 0:
+        return np.empty(0, dtype=np.int64)
+    width = 1 if m <= 256 else 4
+    space = 1 << (8 * width)
+    limit = space - space % m
+
+    out = np.empty(0, dtype=np.int64)
+    while len(out) < count:
+        missing = count - len(out)
+        draw = int(missing * space / limit * 1.05) + 16
+        raw = stream.take(draw * width)
+        values = raw if width == 1 else raw.view(np.uint32)
+        values = values[values < limit].astype(np.int64) % m
+        out = np.concatenate([out, values[:missing]])
+    return out
+
+
+def _draw_from_alphabet(stream, a, lengths):
+    """Mots de passe des longueurs données tirés de l'alphabet a, chacun contenant toutes les classes requises."""
+    alphabet, required = _ALPHABET_ARRAYS[a], _REQUIRED_ARRAYS[a]
+    passwords = [None] * len(lengths)
+    rows = np.arange(len(lengths))
+    # Rejet des mots de passe auxquels manque une classe : seuls ceux-là sont retirés (même longueur)
+    while len(rows):
+        row_lengths = lengths[rows]
+        chars = alphabet[uniform_ints(stream, len(alphabet), int(row_lengths.sum()))]
+        ends = np.cumsum(row_lengths)
+        starts = ends - row_lengths
+        complete = np.ones(len(rows), dtype=bool)
+        for cls in required:
+            complete &= np.add.reduceat(np.isin(chars, cls), starts) > 0
+        text = chars.tobytes().decode("ascii")
+        for row, s, e in zip(rows[complete].tolist(), starts[complete].tolist(), ends[complete].tolist()):
+            passwords[row] = text[s:e]
+        rows = rows[~complete]
+    return passwords
+
+
+def _generate_random(stream, count, min_len, max_len):
+    lengths = min_len + uniform_ints(stream, max_len - min_len + 1, count)
+
+    # 50% alphabet complet, 30% un pool mixte, 20% un pool simple
+    tier = uniform_ints(stream, 10, count)
+    alphabet_ids = np.zeros(count, dtype=np.int64)
+    mixed = (tier >= 5) & (tier < 8)
+    simple = tier >= 8
+    alphabet_ids[mixed] = 1 + uniform_ints(stream, len(MIXED_POOLS), int(mixed.sum()))
+    alphabet_ids[simple] = 1 + len(MIXED_POOLS) + uniform_ints(stream, len(SIMPLE_POOLS), int(simple.sum()))
+
+    passwords = [None] * count
+    for a in range(len(ALPHABETS)):
+        rows = np.flatnonzero(alphabet_ids == a)
+        for row, password in zip(rows.tolist(), _draw_from_alphabet(stream, a, lengths[rows])):
+            passwords[row] = password
+    return passwords
+
+
+def _generate_diceware(stream, count, word_list):
+    num_words = 5 + uniform_ints(stream, 3, count)
+    separators = uniform_ints(stream, len(SEPARATORS), count)
+    words = uniform_ints(stream, len(word_list), int(num_words.sum())).tolist()
+    passwords = []
+    pos = 0
+    for k, sep in zip(num_words.tolist(), separators.tolist()):
+        passwords.append(SEPARATORS[sep].join(word_list[i] for i in words[pos:pos + k]))
+        pos += k
+    return passwords
+
+
+def generate_batch(n, word_list, min_len=MIN_LEN, max_len=MAX_LEN):
+    """Lot de n mots de passe forts (70% aléatoire, 30% Diceware), même distribution que le générateur unitaire."""
+    if min_len < len(CHARACTER_CLASSES):
+        raise ValueError(f"min_len doit valoir au moins {len(CHARACTER_CLASSES)} (une classe de caractères par position)")
+    stream = UrandomStream()
+    if len(word_list) > 10:
+        diceware = uniform_ints(stream, 10, n) < 3
+    else:
+        diceware = np.zeros(n, dtype=bool)
+
+    passwords = np.empty(n, dtype=object)
+    passwords[diceware] = _generate_diceware(stream, int(diceware.sum()), word_list)
+    passwords[~diceware] = _generate_random(stream, int((~diceware).sum()), min_len, max_len)
+    return passwords.tolist()
+
+
+def _init_worker(word_list):
+    global _word_list
+    _word_list = word_list
+
+
+def _batch_task(n):
+    return generate_batch(n, _word_list)
+
+
+def generate_strong_passwords_bulk(n, word_list, workers=None, batch_size=BATCH_SIZE):
+    """Génère n mots de passe forts en parallèle (un lot par tâche, aléa indépendant par processus)."""
+    batches = [batch_size] * (n // batch_size) + ([n % batch_size] if n % batch_size else [])
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(batches) <= 1:
+        return [p for b in batches for p in generate_batch(b, word_list)]
+
+    passwords = []
+    with ProcessPoolExecutor(max_workers=min(workers, len(batches)), initializer=_init_worker,
+                             initargs=(list(word_list),)) as pool:
+        for batch in pool.map(_batch_task, batches):
+            passwords.extend(batch)
+    return passwords
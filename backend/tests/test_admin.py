@@ -0,0 +1,47 @@
+import sys
+import unittest
+from pathlib import Path
+
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+# --- AJOUT DU CHEMIN POUR LES IMPORTS ---
+BASE_DIR = Path(__file__).resolve().parents[3]
+sys.path.append(str(BASE_DIR))
+
+from backend.app.routers import admin
+
+app = FastAPI()
+
+
+@app.get("/protected", dependencies=[Depends(admin.require_admin)])
+def protected():
+    return {"ok": True}
+
+
+class TestAdminAccess(unittest.TestCase):
+
+    def setUp(self):
+        self.saved_token = admin.ADMIN_TOKEN
+        admin.ADMIN_TOKEN = None
+
+    def tearDown(self):
+        admin.ADMIN_TOKEN = self.saved_token
+
+    def test_01_local_only_without_token(self):
+        local = TestClient(app, client=("127.0.0.1", 50000))
+        self.assertEqual(local.get("/protected").status_code, 200)
+        self.assertEqual(TestClient(app, client=("203.0.113.7", 50000)).get("/protected").status_code, 403)
+        # Derrière un reverse proxy local, le vrai client est ailleurs
+        proxied = local.get("/protected", headers={"X-Forwarded-For": "203.0.113.7"})
+        self.assertEqual(proxied.status_code, 403)
+
+    def test_02_token(self):
+        admin.ADMIN_TOKEN = "s3cret"
+        remote = TestClient(app, client=("203.0.113.7", 50000))
+        self.assertEqual(remote.get("/protected").status_code, 403)
+        self.assertEqual(remote.get("/protected", headers={"X-Admin-Token": "s3cret"}).status_code, 200)
+
+
+if __name__ == '__main__':
+    unittest.main()
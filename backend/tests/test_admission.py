@@ -0,0 +1,52 @@
+import asyncio
+import sys
+import unittest
+from pathlib import Path
+
+# --- AJOUT DU CHEMIN POUR LES IMPORTS ---
+BASE_DIR = Path(__file__).resolve().parents[3]
+sys.path.append(str(BASE_DIR))
+
+from backend.app.services.admission import AdmissionController, Overloaded
+
+
+class TestAdmission(unittest.TestCase):
+
+    def run_burst(self, controller, n, model_type="hybrid", work=0.05):
+        async def request():
+            try:
+                async with controller.admit(model_type) as effective:
+                    await asyncio.sleep(work)
+                    return effective
+            except Overloaded as e:
+                return ("503", e.retry_after)
+
+        async def main():
+            return await asyncio.gather(*[request() for _ in range(n)])
+
+        return asyncio.run(main())
+
+    def test_01_degradation_ladder(self):
+        """Sous pression, le hybrid mesuré comme trop lent est dégradé vers rf puis math."""
+        controller = AdmissionController(workers=2, queue=20, target_ms=100, max_wait_ms=5000)
+        controller.record("hybrid", 0.3)
+        controller.record("rf", 0.02)
+        controller.record("math", 0.001)
+        results = self.run_burst(controller, 12)
+        self.assertEqual(results[:2], ["hybrid", "hybrid"])  # créneaux libres : modèle demandé
+        self.assertTrue(set(results[2:]) <= {"rf", "math"})
+        self.assertEqual(controller.stats["degraded"], 10)
+
+    def test_02_fast_rejection(self):
+        """File pleine : 503 immédiat avec un Retry-After, sans attente."""
+        controller = AdmissionController(workers=1, queue=2, target_ms=1000, max_wait_ms=5000)
+        results = self.run_burst(controller, 6, model_type="rf")
+        self.assertEqual(sum(1 for r in results if r == "rf"), 3)
+        rejected = [r for r in results if isinstance(r, tuple)]
+        self.assertEqual(len(rejected), 3)
+        self.assertTrue(all(retry >= 1 for _, retry in rejected))
+        self.assertEqual(controller.status()["active"] + controller.status()["waiting"], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import unittest
+import sys
+import hashlib
+import tempfile
+from pathlib import Path
+
+# --- AJOUT DU CHEMIN POUR LES IMPORTS ---
+BASE_DIR = Path(__file__).resolve().parents[3]
+sys.path.append(str(BASE_DIR))
+
+from backend.app.utils import breach_index
+from backend.app.utils.breach_index import BreachIndex, build_breach_index
+
+
+class TestBreachIndex(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        leak = Path(cls.tmp.name) / "leak.txt"
+        leak.write_text("\n".join(["password"] * 3 + ["azerty", "123456", "azerty"]) + "\n")
+        freq = Path(cls.tmp.name) / "freq.csv"
+        freq.write_text('"password","count"\n"password",10\n"soleil",2\n')
+        build_breach_index([leak, freq], Path(cls.tmp.name) / "index.bin")
+        cls.index = BreachIndex(Path(cls.tmp.name) / "index.bin")
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.index.close()
+        cls.tmp.cleanup()
+
+    def test_01_counts(self):
+        """Les occurrences des différentes sources sont additionnées."""
+        self.assertEqual(self.index.n_records, 4)
+        self.assertEqual(self.index.count("password"), 13)
+        self.assertEqual(self.index.count("azerty"), 2)
+        self.assertEqual(self.index.count("Hk9#mP2$zL"), 0)
+
+    def test_02_range(self):
+        """Format k-anonymat : suffixe de 35 caractères hex + compteur."""
+        digest = hashlib.sha1(b"soleil").hexdigest().upper()
+        self.assertIn((digest[5:], 2), self.index.range(digest[:5]))
+
+    def test_03_bounded_partition(self):
+        """Tampons plafonnés (flush global toutes les quelques entrées) : mêmes buckets, mêmes comptes."""
+        leak = Path(self.tmp.name) / "many.txt"
+        leak.write_text("\n".join(f"pwd{i % 700}" for i in range(5000)) + "\n")
+        with tempfile.TemporaryDirectory() as work:
+            paths, total = breach_index._partition([leak], work, max_buffered=10 * breach_index.RECORD.itemsize)
+            records = sum(breach_index._sorted_bucket(p)['count'].sum() for p in paths)
+            distinct = sum(len(breach_index._sorted_bucket(p)) for p in paths)
+        self.assertEqual((total, records, distinct), (5000, 5000, 700))
+
+
+if __name__ == '__main__':
+    unittest.main()
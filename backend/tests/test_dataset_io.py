@@ -0,0 +1,63 @@
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# --- AJOUT DU CHEMIN POUR LES IMPORTS ---
+BASE_DIR = Path(__file__).resolve().parents[3]
+sys.path.append(str(BASE_DIR))
+
+from backend.app.utils import dataset_io
+
+
+class TestDatasetIO(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "passwords_processed"
+        self.df = pd.DataFrame({
+            "password": ['pass,"word"', "null", "NaN", "123456"],
+            "label": [0, 0, 1, 1],
+            "entropy": [0.1, 0.25, 0.5, 0.75],
+        })
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_01_roundtrip_compact(self):
+        """Mots de passe piégeux conservés à l'identique, types compacts (float32 / int8)."""
+        for fmt in (["csv", "parquet"] if dataset_io.HAS_PARQUET else ["csv"]):
+            written = dataset_io.write_dataset(self.df, self.path, fmt=fmt)
+            self.assertEqual(dataset_io.dataset_path(self.path), written)
+            df = dataset_io.read_dataset(self.path)
+            self.assertEqual(df["password"].tolist(), self.df["password"].tolist())
+            self.assertEqual(df["label"].dtype, np.int8)
+            self.assertEqual(df["entropy"].dtype, np.float32)
+
+    def test_02_columns_and_chunks(self):
+        for fmt in (["csv", "parquet"] if dataset_io.HAS_PARQUET else ["csv"]):
+            dataset_io.write_dataset(self.df, self.path, fmt=fmt)
+            self.assertEqual(list(dataset_io.read_dataset(self.path, columns=["password"]).columns), ["password"])
+            chunks = list(dataset_io.iter_dataset(self.path, columns=["password", "label"], chunksize=3))
+            self.assertEqual([len(c) for c in chunks], [3, 1])
+            self.assertEqual(pd.concat(chunks)["password"].tolist(), self.df["password"].tolist())
+
+    @unittest.skipUnless(dataset_io.HAS_PARQUET, "pyarrow absent")
+    def test_03_parquet_replaces_csv(self):
+        """Écriture Parquet : le CSV périmé est supprimé, sauf export demandé (relu à l'identique)."""
+        dataset_io.write_dataset(self.df, self.path, fmt="csv")
+        dataset_io.write_dataset(self.df, self.path, fmt="parquet")
+        self.assertFalse(self.path.with_suffix(".csv").exists())
+        self.assertEqual(dataset_io.dataset_path(self.path).suffix, ".parquet")
+
+        dataset_io.write_dataset(self.df, self.path, fmt="parquet", csv_export=True)
+        # Lecture directe : dataset_path préférerait le Parquet
+        exported = pd.read_csv(self.path.with_suffix(".csv"), keep_default_na=False, na_values=[],
+                               dtype={"password": str})
+        pd.testing.assert_frame_equal(dataset_io.compact_dtypes(exported), dataset_io.read_dataset(self.path))
+
+if __name__ == '__main__':
+    unittest.main()
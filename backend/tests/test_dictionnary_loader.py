@@ -0,0 +1,103 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import pandas as pd
+
+# --- AJOUT DU CHEMIN POUR LES IMPORTS ---
+BASE_DIR = Path(__file__).resolve().parents[3]
+sys.path.append(str(BASE_DIR))
+
+from backend.app.utils import dictionnary_loader
+from backend.app.utils.dictionnary_loader import build_dictionary, prioritize
+
+
+class TestDictionaryLoader(unittest.TestCase):
+
+    def setUp(self):
+        # Dictionnaire isolé dans un dossier temporaire : seules les sources extra/ y existent
+        self.tmp = tempfile.TemporaryDirectory()
+        root = Path(self.tmp.name)
+        raw, processed = root / "raw", root / "processed"
+        self.extra = raw / "extra"
+        patcher = mock.patch.multiple(
+            dictionnary_loader,
+            PATH_RAW=raw, PATH_EXTRA=self.extra, PATH_PROCESSED=processed,
+            PATH_SOURCES_CACHE=processed / "sources",
+            OUTFILE=processed / "linguistic_dictionary.csv",
+            STATE_FILE=processed / "dictionary_state.json",
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.tmp.cleanup)
+
+    def write_source(self, category, name, lines):
+        path = self.extra / category / f"{name}.txt"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        return path
+
+    def build(self):
+        with mock.patch("builtins.print"):
+            build_dictionary()
+        return dict(pd.read_csv(dictionnary_loader.OUTFILE, keep_default_na=False).itertuples(index=False))
+
+    def test_01_incremental_add(self):
+        """Une source ajoutée est fusionnée sans relire les sources déjà connues."""
+        self.write_source("word", "base", ["summer", "house"])
+        self.assertEqual(self.build(), {"summer": "word", "house": "word"})
+
+        self.write_source("name", "prenoms", ["alice", "summer"])
+        relue = mock.Mock(side_effect=AssertionError("source déjà connue relue"))
+        with mock.patch.dict(dictionnary_loader.READERS_BY_CATEGORY, word=relue):
+            corpus = self.build()
+        self.assertEqual(corpus, {"summer": "word", "house": "word", "alice": "name"})
+
+        state = json.loads(dictionnary_loader.STATE_FILE.read_text(encoding="utf-8"))
+        self.assertEqual(set(state["sources"]), {"extra_word_base", "extra_name_prenoms"})
+
+    def test_02_modify_and_remove(self):
+        """Une source modifiée ou supprimée entraîne la recomposition depuis les caches."""
+        self.write_source("word", "base", ["summer", "house"])
+        prenoms = self.write_source("name", "prenoms", ["alice"])
+        self.build()
+
+        self.write_source("word", "base", ["summer", "garden"])
+        self.assertEqual(self.build(), {"summer": "word", "garden": "word", "alice": "name"})
+
+        prenoms.unlink()
+        self.assertEqual(self.build(), {"summer": "word", "garden": "word"})
+        self.assertFalse(dictionnary_loader.cache_path("extra_name_prenoms").exists())
+        state = json.loads(dictionnary_loader.STATE_FILE.read_text(encoding="utf-8"))
+        self.assertEqual(set(state["sources"]), {"extra_word_base"})
+
+    def test_03_touch_saves_state(self):
+        """Un fichier seulement touché n'est pas relu, mais sa nouvelle date est mémorisée."""
+        path = self.write_source("word", "base", ["summer"])
+        self.build()
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        self.assertEqual(self.build(), {"summer": "word"})
+        state = json.loads(dictionnary_loader.STATE_FILE.read_text(encoding="utf-8"))
+        self.assertEqual(state["sources"]["extra_word_base"]["files"]["base.txt"]["mtime_ns"], path.stat().st_mtime_ns)
+
+    def test_04_prioritize(self):
+        """Un token présent dans plusieurs catégories garde la plus prioritaire (weak_pwd > word > name > place)."""
+        corpus = pd.DataFrame({
+            "token": ["paris", "paris", "summer", "summer", "summer", "alice", "qwerty", "qwerty"],
+            "category": ["place", "name", "name", "place", "word", "name", "word", "weak_pwd"],
+        })
+        result = prioritize(corpus)
+        self.assertEqual(dict(result.itertuples(index=False)),
+                         {"paris": "name", "summer": "word", "alice": "name", "qwerty": "weak_pwd"})
+        self.assertEqual(list(result.columns), ["token", "category"])
+        self.assertFalse(result["token"].duplicated().any())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import csv
+import random
+import sys
+import tempfile
+import unittest
+from collections import Counter
+from pathlib import Path
+
+# --- AJOUT DU CHEMIN POUR LES IMPORTS ---
+BASE_DIR = Path(__file__).resolve().parents[3]
+sys.path.append(str(BASE_DIR))
+
+from backend.app.utils import external_dedup
+from backend.app.utils.external_dedup import BucketWriter, bucket_of, dedup_leak_files
+
+
+def read_counts(path):
+    with open(path, "r", encoding="ascii", newline="") as f:
+        rows = list(csv.reader(f, quoting=csv.QUOTE_NONNUMERIC))
+    return Counter({str(pwd): int(count) for pwd, count in rows if pwd != "password"})
+
+
+class TestExternalDedup(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+        rng = random.Random(0)
+        # Distribution à longue traîne : quelques mots de passe très fréquents, beaucoup d'uniques
+        self.passwords = [f"pwd{int(rng.paretovariate(1.2))}" for _ in range(20_000)]
+        self.passwords += [f"u{rng.getrandbits(40):x}" for _ in range(5_000)]
+        rng.shuffle(self.passwords)
+        half = len(self.passwords) // 2
+        for name, chunk in [("a.txt", self.passwords[:half]), ("b.txt", self.passwords[half:])]:
+            (self.dir / name).write_text("\n".join(chunk) + "\n", encoding="ascii")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_01_exact_counts(self):
+        out = self.dir / "counts.csv"
+        distinct = dedup_leak_files([self.dir / "a.txt", self.dir / "b.txt"], out, memory_limit_mb=1, workers=1)
+        expected = Counter(self.passwords)
+        self.assertEqual(distinct, len(expected))
+        self.assertEqual(read_counts(out), expected)
+
+    def test_02_repartition_path(self):
+        """Bucket plus gros que le plafond : re-partitionné (BLAKE2b salé), comptes toujours exacts."""
+        bucket = self.dir / "bucket.bin"
+        bucket.write_bytes(b"\n".join(p.encode() for p in self.passwords) + b"\n")
+        out = self.dir / "bucket.csv"
+        distinct = external_dedup._count_bucket([bucket], out, memory_limit=20_000)
+        self.assertEqual(distinct, len(set(self.passwords)))
+        self.assertEqual(read_counts(out), Counter(self.passwords))
+
+    def test_03_rehash_independent_of_crc(self):
+        """Mots de passe de même longueur d'un même bucket CRC : répartis sur les sous-buckets."""
+        same = [f"{i:08d}".encode() for i in range(20_000)]
+        first = [p for p in same if bucket_of(p, 16) == 0]
+        sub = Counter(bucket_of(p, 16, salt=1) for p in first)
+        self.assertEqual(len(sub), 16)
+        self.assertLess(max(sub.values()), 2 * len(first) / 16)
+
+    def test_04_buffer_limit(self):
+        """Beaucoup de buckets : la mémoire des tampons reste sous buffer_limit, les données sont complètes."""
+        writer = BucketWriter(self.dir, 512, prefix="t", buffer_limit=50_000)
+        data = [p.encode() for p in self.passwords]
+        for i in range(0, len(data), 1000):
+            writer.add(data[i:i + 1000])
+            self.assertLess(writer.buffered, 50_000)
+        writer.close()
+        self.assertEqual(writer.buffered, 0)
+        written = Counter(line for path in writer.paths if path.exists()
+                          for line in path.read_bytes().splitlines())
+        self.assertEqual(written, Counter(data))
+
+
+if __name__ == '__main__':
+    unittest.main()
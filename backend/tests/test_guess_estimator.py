@@ -0,0 +1,83 @@
+import math
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# --- AJOUT DU CHEMIN POUR LES IMPORTS ---
+BASE_DIR = Path(__file__).resolve().parents[3]
+sys.path.append(str(BASE_DIR))
+
+from backend.app.services.guess_estimator import GuessModel, MAX_LOG2_GUESSES, _parse_structure, segments, structure_of
+
+CORPUS = ["123456", "password", "azerty", "thomas2024", "Thomas2024!", "soleil", "marseille13", "qwerty123",
+          "loulou", "nicolas1", "chouchou", "123456789", "Julie2010", "doudou!", "bonjour"] * 20
+
+
+class TestGuessEstimator(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.model = GuessModel().fit(CORPUS).build_rank_table(n=2000, seed=0)
+
+    def test_01_structures(self):
+        self.assertEqual(structure_of(segments("Thomas2024!")), "L6D4S1")
+        self.assertEqual(_parse_structure("L6D4S1"), [('L', 6), ('D', 4), ('S', 1)])
+        self.assertEqual(_parse_structure("L12D10"), [('L', 12), ('D', 10)])
+        self.assertAlmostEqual(sum(self.model.structures.values()), 1.0)
+
+    def test_02_sample(self):
+        """Même graine -> mêmes échantillons ; les structures PCFG tirées existent dans le modèle."""
+        sample = self.model.sample(500, seed=1)
+        self.assertEqual(sample, self.model.sample(500, seed=1))
+        known = sum(structure_of(segments(p)) in self.model.structures for p in sample if p)
+        self.assertGreater(known, 450)
+
+    def test_03_rank_table_monotonic(self):
+        """log2 p croissants ; rangs cumulés (indexés par le nombre d'échantillons plus probables) croissants."""
+        logp, rank = self.model.table_logp, self.model.table_rank
+        self.assertTrue(all(a <= b for a, b in zip(logp, logp[1:])))
+        self.assertTrue(all(a <= b for a, b in zip(rank, rank[1:])))
+        self.assertLess(self.model.guesses("123456"), self.model.guesses("Hk9#mP2$zL"))
+
+    def test_04_long_password_no_overflow(self):
+        """2^-logp débordait vers 160 caractères : l'extrapolation se fait en log et reste plafonnée."""
+        for pwd in ["x" * 200, "Hk9#mP2$zL" * 50]:
+            est = self.model.estimate(pwd)
+            self.assertTrue(math.isfinite(est["guesses"]))
+            self.assertLessEqual(est["log10_guesses"], round(MAX_LOG2_GUESSES * math.log10(2), 2))
+            self.assertEqual(est["crack_time_display"], "Des millions d'années")
+        self.assertGreater(self.model.log2_guesses("Hk9#mP2$zL" * 20), 900)
+
+
+    def test_05_script_pickle_loads_in_server(self):
+        """Modèle entraîné par le script (comme retrain_all) puis rechargé dans un autre interpréteur."""
+        with tempfile.TemporaryDirectory() as tmp:
+            train = (
+                "import runpy, sys\n"
+                "from pathlib import Path\n"
+                "import pandas as pd\n"
+                "import backend.app.services.guess_estimator as ge\n"
+                "from backend.app.utils.dataset_io import write_dataset\n"
+                "tmp = Path(sys.argv[1])\n"
+                "write_dataset(pd.DataFrame({'password': sys.argv[2].split(',')}), tmp / 'weak_passwords', fmt='csv')\n"
+                "ge.RAW_DIR = ge.MODEL_DIR = tmp\n"
+                "ge.train_guess_model.__defaults__ = ('weak_passwords', 500)\n"
+                "runpy.run_path(ge.__file__, run_name='__main__')\n"
+            )
+            load = (
+                "import sys, joblib\n"
+                "model = joblib.load(sys.argv[1])\n"
+                "print(type(model).__module__, model.estimate('azerty')['log10_guesses'] >= 0)\n"
+            )
+            env = {"PYTHONPATH": str(Path(__file__).resolve().parents[2]), "PATH": ""}
+            subprocess.run([sys.executable, "-c", train, tmp, ",".join(CORPUS[:15])], env=env, check=True,
+                           capture_output=True, cwd=tmp)
+            out = subprocess.run([sys.executable, "-c", load, str(Path(tmp) / "guess_model.pkl")], env=env,
+                                 check=True, capture_output=True, text=True, cwd=tmp).stdout
+        self.assertEqual(out.split(), ["backend.app.services.guess_estimator", "True"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,140 @@
+import sys
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+import numpy as np
+
+# --- AJOUT DU CHEMIN POUR LES IMPORTS ---
+BASE_DIR = Path(__file__).resolve().parents[3]
+sys.path.append(str(BASE_DIR))
+
+from backend.app.utils import inference_benchmark as ib
+from backend.app.utils.length_buckets import sequence_lengths
+
+
+def report(p50, p99, throughput, model_type="lstm", batch_size=16, bucket="8-11"):
+    stats = {"p50_ms": p50, "p99_ms": p99, "p90_ms": p99, "mean_ms": p50}
+    return {"results": [{"model_type": model_type, "batch_size": batch_size, "length_bucket": bucket,
+                         "stages": {"model": stats, "total": stats}, "throughput_pwd_s": throughput}]}
+
+
+class Layer:
+    pass
+
+
+class LSTM(Layer):
+    pass
+
+
+class Conv1D(Layer):
+    kernel_size = (3,)
+
+
+class Flatten(Layer):
+    pass
+
+
+class Embedding(Layer):
+    mask_zero = True
+
+
+class FakeModel:
+    """Modèle factice : enregistre la largeur reçue, renvoie la longueur réelle de chaque séquence."""
+
+    def __init__(self, layers, input_shape=(None, None)):
+        self.layers = layers
+        self.input_shape = input_shape
+        self.widths = []
+
+    def predict_on_batch(self, X):
+        self.widths.append(X.shape[1])
+        return sequence_lengths(X)[:, None].astype(float)
+
+
+def fake_dl_batch(batch, bundle, max_len=32):
+    X = np.zeros((len(batch), max_len), dtype=np.int32)
+    for i, p in enumerate(batch):
+        X[i, :min(len(p), max_len)] = 1
+    return X
+
+
+class TestInferenceBenchmark(unittest.TestCase):
+
+    def test_01_compare_reports(self):
+        """Latence au-delà du seuil et débit en deçà : régressions ; dans la tolérance : rien."""
+        baseline = report(p50=10.0, p99=20.0, throughput=1000.0)
+        self.assertEqual(ib.compare_reports(report(11.0, 22.0, 900.0), baseline, threshold=0.15), [])
+
+        regressions = ib.compare_reports(report(12.0, 20.0, 800.0), baseline, threshold=0.15)
+        key = ("lstm", 16, "8-11")
+        self.assertIn((key, "model", "p50_ms", 10.0, 12.0), regressions)
+        self.assertIn((key, "total", "p50_ms", 10.0, 12.0), regressions)
+        self.assertIn((key, "total", "throughput_pwd_s", 1000.0, 800.0), regressions)
+        self.assertEqual(len(regressions), 3)
+
+        # Configuration absente de la référence : ignorée ; seuil plus large : plus de régression
+        self.assertEqual(ib.compare_reports(report(50.0, 90.0, 10.0, batch_size=128), baseline), [])
+        self.assertEqual(ib.compare_reports(report(12.0, 20.0, 800.0), baseline, threshold=0.25), [])
+
+    def test_02_length_bucket_benchmark(self):
+        """Modèles à longueur variable mesurés (complet puis par tranche) ; longueur fixe ignorée."""
+        lstm = FakeModel([Embedding(), LSTM()])
+        cnn = FakeModel([Embedding(), Conv1D()])
+        fixed = FakeModel([Embedding(), Flatten()], input_shape=(None, 32))
+        bundle = SimpleNamespace(dl_models={"lstm": lstm, "cnn": cnn, "dnn": fixed})
+        pool = ["abc", "password1", "x" * 14, "y" * 30]
+
+        with mock.patch.object(ib.ps, "active_bundle", bundle), \
+                mock.patch.object(ib.ps, "prepare_dl_batch", fake_dl_batch), \
+                mock.patch.object(ib, "password_pool", return_value=pool), \
+                mock.patch("builtins.print"):
+            results = ib.run_length_bucket_benchmark(batch_sizes=[1, 8], iterations=3, warmup=1)
+
+        self.assertEqual([(r["model_type"], r["batch_size"]) for r in results],
+                         [("lstm", 1), ("lstm", 8), ("cnn", 1), ("cnn", 8)])
+        by_model = {r["model_type"]: r for r in results}
+        self.assertEqual(by_model["lstm"]["padding_margin"], 0)
+        self.assertEqual(by_model["cnn"]["padding_margin"], 3)
+        self.assertTrue(by_model["lstm"]["enabled"])
+        self.assertFalse(by_model["cnn"]["enabled"])
+        for r in results:
+            self.assertGreater(r["full_pwd_s"], 0)
+            self.assertGreater(r["bucketed_pwd_s"], 0)
+            self.assertGreater(r["speedup"], 0)
+        self.assertEqual(fixed.widths, [])
+        # Mode complet à 32, mode par tranche à une borne plus courte
+        self.assertIn(32, lstm.widths)
+        self.assertTrue(any(w < 32 for w in lstm.widths))
+
+    def test_03_rss_per_configuration(self):
+        """Chaque configuration porte son propre pic de RSS échantillonné."""
+        bundle = SimpleNamespace(version="test")
+        peaks = iter([100, 300, 200, 400])
+
+        class FakeSampler:
+            def __enter__(self):
+                self.peak = next(peaks)
+                return self
+
+            def __exit__(self, *exc):
+                return False
+
+        timings = {stage: 0.001 for stage in ib.STAGES}
+        with mock.patch.object(ib.ps, "active_bundle", bundle), \
+                mock.patch.object(ib, "available_models", return_value=["rf", "log"]), \
+                mock.patch.object(ib, "load_passwords", return_value={"8-11": ["password1"] * 4}), \
+                mock.patch.object(ib, "run_stages", return_value=timings), \
+                mock.patch.object(ib, "measure_allocations", return_value={}), \
+                mock.patch.object(ib, "RssSampler", FakeSampler), \
+                mock.patch("builtins.print"):
+            result = ib.run_benchmark(batch_sizes=[1, 16], iterations=2, warmup=0)
+
+        self.assertNotIn("peak_rss_bytes", result)
+        self.assertEqual([(r["model_type"], r["batch_size"], r["peak_rss_bytes"]) for r in result["results"]],
+                         [("rf", 1, 100), ("rf", 16, 300), ("log", 1, 200), ("log", 16, 400)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+import unittest
+import sys
+from pathlib import Path
+
+# --- AJOUT DU CHEMIN POUR LES IMPORTS ---
+BASE_DIR = Path(__file__).resolve().parents[3]
+sys.path.append(str(BASE_DIR))
+
+from backend.app.utils.keyboard_walk import find_walks, keyboard_features_batch
+
+
+def walks_of(password):
+    return [(w['layout'], w['token']) for w in find_walks(password)]
+
+
+class TestKeyboardWalk(unittest.TestCase):
+
+    def test_01_layouts(self):
+        """Marches classiques sur chaque disposition."""
+        self.assertEqual(walks_of("azerty"), [('azerty', 'azerty')])
+        self.assertEqual(walks_of("wxcvbn"), [('azerty', 'wxcvbn')])
+        self.assertEqual(walks_of("qwerty"), [('qwerty', 'qwerty')])
+        self.assertEqual(walks_of("7410"), [('numpad', '7410')])
+
+    def test_02_shift_and_turns(self):
+        walk = find_walks("AZERty")[0]
+        self.assertEqual(walk['shifted'], 4)
+        self.assertEqual(walks_of("1qaz2wsx"), [('qwerty', '1qaz'), ('qwerty', '2wsx')])
+        self.assertGreaterEqual(find_walks("0258")[0]['turns'], 1)
+
+    def test_03_no_false_positive(self):
+        """Aléatoire, mots courants et allers-retours ("2024") ne sont pas des marches."""
+        self.assertEqual(walks_of("Hk9#mP2$zL"), [])
+        self.assertEqual(walks_of("password"), [])
+        self.assertEqual(walks_of("Thomas2024!"), [])
+
+    def test_04_batch(self):
+        batch = keyboard_features_batch(["azerty", "Hk9#mP2$zL"])
+        self.assertEqual(batch['has_keyboard_walk'].tolist(), [1, 0])
+        self.assertAlmostEqual(batch['keyboard_walk_ratio'][0], 1.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import random
+import sys
+import unittest
+from collections import Counter
+from pathlib import Path
+
+# --- AJOUT DU CHEMIN POUR LES IMPORTS ---
+BASE_DIR = Path(__file__).resolve().parents[3]
+sys.path.append(str(BASE_DIR))
+
+from backend.app.utils.leak_sampler import merge_reservoirs, reservoir_sample
+
+
+def blocks(items, size):
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+class TestLeakSampler(unittest.TestCase):
+
+    def test_01_reservoir_size_and_seen(self):
+        """Échantillon de taille min(k, n), sans doublon, et nombre d'éléments vus exact."""
+        for n, k in [(0, 10), (7, 10), (10, 10), (10_000, 50)]:
+            items = list(range(n))
+            sample, seen = reservoir_sample(blocks(items, 333), k, random.Random(1))
+            self.assertEqual(seen, n)
+            self.assertEqual(len(sample), min(k, n))
+            self.assertEqual(len(set(sample)), len(sample))
+            self.assertTrue(set(sample) <= set(items))
+
+    def test_02_reservoir_uniform(self):
+        """Chaque élément a la même probabilité k/n d'être retenu (fréquence par dixième du flux)."""
+        rng = random.Random(2)
+        hits = Counter()
+        for _ in range(400):
+            sample, _ = reservoir_sample(blocks(list(range(1000)), 128), 20, rng)
+            hits.update(i // 100 for i in sample)
+        expected = 400 * 20 / 10
+        for decile in range(10):
+            self.assertAlmostEqual(hits[decile] / expected, 1.0, delta=0.15)
+
+    def test_03_merge_proportional(self):
+        """Fusion : k éléments, tirés dans chaque partie au prorata des éléments qu'elle représente."""
+        rng = random.Random(3)
+        parts = [(["a"] * 100, 9_000), (["b"] * 100, 1_000)]
+        taken = Counter()
+        for _ in range(200):
+            sample = merge_reservoirs(parts, 100, rng)
+            self.assertEqual(len(sample), 100)
+            taken.update(sample)
+        self.assertAlmostEqual(taken["a"] / (200 * 100), 0.9, delta=0.02)
+
+    def test_04_merge_small_parts(self):
+        """Moins d'éléments que k au total : tout est renvoyé."""
+        sample = merge_reservoirs([([1, 2], 2), ([3], 1), ([], 0)], 10, random.Random(4))
+        self.assertEqual(sorted(sample), [1, 2, 3])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import unittest
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# --- AJOUT DU CHEMIN POUR LES IMPORTS ---
+BASE_DIR = Path(__file__).resolve().parents[3]
+sys.path.append(str(BASE_DIR))
+
+from backend.app.utils.length_buckets import group_by_length, predict_bucketed, sequence_lengths
+
+
+def padded(lengths, max_len=32):
+    X = np.zeros((len(lengths), max_len), dtype=np.int32)
+    for i, n in enumerate(lengths):
+        X[i, :n] = 1
+    return X
+
+
+class Layer:
+    pass
+
+
+class LSTM(Layer):
+    pass
+
+
+class Embedding(Layer):
+    mask_zero = True
+
+
+class FakeRecurrentModel:
+    """Modèle factice : enregistre la largeur reçue, renvoie la longueur réelle de chaque séquence."""
+    input_shape = (None, None)
+    layers = [Embedding(), LSTM()]
+
+    def __init__(self):
+        self.widths = []
+
+    def predict_on_batch(self, X):
+        self.widths.append(X.shape[1])
+        return sequence_lengths(X)[:, None].astype(float)
+
+
+class TestLengthBuckets(unittest.TestCase):
+
+    def test_01_lengths(self):
+        self.assertEqual(sequence_lengths(padded([0, 3, 32])).tolist(), [0, 3, 32])
+
+    def test_02_small_buckets_merge(self):
+        """Une tranche trop petite rejoint la suivante ; un lot de 1 garde sa propre borne."""
+        self.assertEqual([b for _, b in group_by_length(padded([5]))], [8])
+        self.assertEqual([b for _, b in group_by_length(padded([5, 14]), min_rows=2)], [16])
+        groups = group_by_length(padded([5] * 3 + [14] * 3), min_rows=3)
+        self.assertEqual([(len(idx), b) for idx, b in groups], [(3, 8), (3, 16)])
+
+    def test_03_predict_order(self):
+        """Les prédictions reviennent dans l'ordre du lot, chaque tranche tronquée à sa borne."""
+        model = FakeRecurrentModel()
+        lengths = [20] * 200 + [6] * 200
+        out = predict_bucketed(model, padded(lengths))
+        self.assertEqual(out.tolist(), lengths)
+        self.assertEqual(sorted(model.widths), [8, 24])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,34 @@
+import sys
+import unittest
+from pathlib import Path
+
+# --- AJOUT DU CHEMIN POUR LES IMPORTS ---
+BASE_DIR = Path(__file__).resolve().parents[3]
+sys.path.append(str(BASE_DIR))
+
+from backend.app.services.live_scoring import LIVE_MAX_LENGTH, CountingScanner, LiveSession
+from backend.app.utils.pattern_engine import find_patterns
+
+
+class TestLiveScoring(unittest.TestCase):
+
+    def test_01_incremental_state_matches_full_scan(self):
+        """Après des éditions au milieu de la saisie, compteurs et motifs = ceux d'un scan complet."""
+        session = LiveSession()
+        for value in ["Thomas", "Thomas2024", "Tho2024!", "thomas1234!!", "Thomas1234"]:
+            session.update(value)
+            self.assertEqual(session.counts, CountingScanner(value).counts)
+            self.assertEqual(session.scanner.patterns(), find_patterns(value))
+        self.assertEqual(session.counts, {'lower': 5, 'upper': 1, 'digit': 4, 'punct': 0})
+
+    def test_02_long_input(self):
+        """Saisie collée très longue : tronquée et notée sans débordement du temps de craquage."""
+        session = LiveSession()
+        session.update("Ab1!" * 100)
+        frame = session.instant()
+        self.assertEqual(frame["length"], LIVE_MAX_LENGTH)
+        self.assertEqual(frame["crack_time_display"], "Des millions d'années")
+
+
+if __name__ == '__main__':
+    unittest.main()
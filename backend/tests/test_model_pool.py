@@ -0,0 +1,133 @@
+import sys
+import threading
+import time
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+# --- AJOUT DU CHEMIN POUR LES IMPORTS ---
+BASE_DIR = Path(__file__).resolve().parents[3]
+sys.path.append(str(BASE_DIR))
+
+from backend.app.services.model_pool import ModelPool, PooledModels
+from backend.app.utils.memory_accounting import MemoryLedger
+
+MB = 1024 * 1024
+
+
+class TestModelPool(unittest.TestCase):
+
+    def setUp(self):
+        self.loads = []
+        self.lock = threading.Lock()
+
+    def loader(self, key, size_mb=1, delay=0.0):
+        def load():
+            with self.lock:
+                self.loads.append(key)
+            time.sleep(delay)
+            return np.zeros(size_mb * MB, dtype=np.uint8)
+        return ("ml", load)
+
+    def test_01_lru_eviction_and_pinning(self):
+        """Budget de 2.5 Mo pour des modèles de 1 Mo : rf épinglé reste, le moins récemment utilisé part."""
+        pool = ModelPool({k: self.loader(k) for k in ["rf", "xgb", "log"]}, MemoryLedger(),
+                         budget_bytes=2.5 * MB, pinned=["rf"])
+        self.assertEqual(pool.preload(), [])
+        self.assertEqual(list(pool.resident), ["rf"])
+
+        pool.get("xgb")
+        pool.get("rf")
+        pool.get("log")
+        self.assertEqual(set(pool.resident), {"rf", "log"})
+        self.assertLessEqual(pool.used_bytes, 2.5 * MB)
+        self.assertNotIn("xgb", pool.ledger.entries)
+
+        pool.get("xgb")
+        self.assertEqual(set(pool.resident), {"rf", "xgb"})
+        self.assertEqual(self.loads, ["rf", "xgb", "log", "xgb"])
+        self.assertEqual(pool.status()["evictions"], 2)
+
+    def test_02_single_flight_reload(self):
+        """Huit threads demandent le même modèle absent : un seul chargement, le même objet pour tous."""
+        pool = ModelPool({"cnn": self.loader("cnn", delay=0.1)}, MemoryLedger(), budget_bytes=0, pinned=[])
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(pool.get("cnn"))) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(self.loads, ["cnn"])
+        self.assertTrue(all(r is results[0] for r in results))
+
+    def test_03_errors_not_cached(self):
+        attempts = []
+
+        def flaky():
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise OSError("fichier illisible")
+            return np.zeros(10)
+
+        pool = ModelPool({"lstm": ("keras", flaky)}, MemoryLedger(), budget_bytes=0, pinned=[])
+        with self.assertRaises(OSError):
+            pool.get("lstm")
+        self.assertEqual(len(pool.get("lstm")), 10)
+        self.assertEqual(pool.status()["load_errors"], 1)
+
+    def test_04_pooled_view(self):
+        pool = ModelPool({k: self.loader(k) for k in ["rf", "cnn"]}, MemoryLedger(), budget_bytes=0, pinned=[])
+        ml = PooledModels(pool, ["rf", "xgb", "log"])
+        self.assertIn("rf", ml)
+        self.assertNotIn("xgb", ml)
+        self.assertNotIn("cnn", ml)
+        self.assertEqual(list(ml), ["rf"])
+        self.assertEqual(self.loads, [])
+        self.assertEqual(ml["rf"].nbytes, MB)
+        with self.assertRaises(KeyError):
+            ml["xgb"]
+
+    def test_05_loads_serialized(self):
+        """Modèles différents demandés en même temps : chargements l'un après l'autre (delta RSS propre à chacun)."""
+        active, overlaps = [], []
+
+        def loader(key):
+            def load():
+                with self.lock:
+                    active.append(key)
+                    overlaps.append(len(active))
+                time.sleep(0.05)
+                with self.lock:
+                    active.remove(key)
+                return np.zeros(10)
+            return ("ml", load)
+
+        pool = ModelPool({k: loader(k) for k in ["rf", "xgb", "log", "cnn"]}, MemoryLedger(), budget_bytes=0, pinned=[])
+        threads = [threading.Thread(target=pool.get, args=(k,)) for k in ["rf", "xgb", "log", "cnn"]]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(len(overlaps), 4)
+        self.assertEqual(max(overlaps), 1)
+        self.assertEqual(set(pool.resident), {"rf", "xgb", "log", "cnn"})
+
+    def test_06_ledger_entry_and_failed_track(self):
+        """entry() renvoie une copie ; un bloc en échec ne laisse aucune mesure (même pas la précédente)."""
+        ledger = MemoryLedger()
+        with ledger.track("cnn", "keras"):
+            pass
+        entry = ledger.entry("cnn")
+        entry["kind"] = "modifié"
+        self.assertEqual(ledger.entry("cnn")["kind"], "keras")
+
+        with self.assertRaises(OSError):
+            with ledger.track("cnn", "keras"):
+                raise OSError("fichier illisible")
+        self.assertIsNone(ledger.entry("cnn"))
+        self.assertEqual(ledger.report(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
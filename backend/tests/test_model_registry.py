@@ -0,0 +1,82 @@
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LogisticRegression
+
+# --- AJOUT DU CHEMIN POUR LES IMPORTS ---
+BASE_DIR = Path(__file__).resolve().parents[3]
+sys.path.append(str(BASE_DIR))
+
+from backend.app.services import model_registry
+from backend.app.services.model_registry import (
+    FEATURE_SCHEMA, META_FILE, ML_FILES, STACK_SCHEMA, check_schema, trained_schemas
+)
+
+
+def fitted(columns):
+    X = pd.DataFrame(np.random.default_rng(0).random((20, len(columns))), columns=columns)
+    return LogisticRegression().fit(X, [0, 1] * 10)
+
+
+class TestModelRegistry(unittest.TestCase):
+
+    def test_01_trained_schemas(self):
+        """Le manifeste décrit les colonnes vues à l'entraînement, pas la constante du code."""
+        with tempfile.TemporaryDirectory() as tmp:
+            joblib.dump(fitted(FEATURE_SCHEMA[:8]), Path(tmp) / ML_FILES["log"])
+            joblib.dump(fitted(STACK_SCHEMA), Path(tmp) / META_FILE)
+            features, stack = trained_schemas(Path(tmp))
+        self.assertEqual(features, {"log": FEATURE_SCHEMA[:8]})
+        self.assertEqual(stack, STACK_SCHEMA)
+
+    def test_02_check_schema(self):
+        # Ancien modèle (sous-ensemble des colonnes servies) : accepté
+        check_schema({"model_features": {"rf": FEATURE_SCHEMA[:8]}, "stack_schema": STACK_SCHEMA})
+        check_schema({})
+        with self.assertRaises(ValueError):
+            check_schema({"model_features": {"rf": FEATURE_SCHEMA + ["new_feature"]}})
+        with self.assertRaises(ValueError):
+            check_schema({"stack_schema": list(reversed(STACK_SCHEMA))})
+
+
+    def test_03_publish_activate_load(self):
+        """Pipeline de publication de bout en bout sur un registre temporaire."""
+        with tempfile.TemporaryDirectory() as tmp:
+            models, registry = Path(tmp) / "models", Path(tmp) / "models" / "registry"
+            models.mkdir()
+            joblib.dump(fitted(FEATURE_SCHEMA), models / ML_FILES["rf"])
+            joblib.dump(fitted(STACK_SCHEMA), models / META_FILE)
+            names = ("MODEL_DIR", "DL_DATA_DIR", "REGISTRY_DIR", "ACTIVE_FILE")
+            saved = {k: getattr(model_registry, k) for k in names}
+            model_registry.MODEL_DIR, model_registry.DL_DATA_DIR = models, Path(tmp) / "dl"
+            model_registry.REGISTRY_DIR, model_registry.ACTIVE_FILE = registry, registry / "ACTIVE"
+            try:
+                model_registry.publish_version("v1", activate=False)
+                model_registry.publish_version("v2")
+                self.assertEqual(model_registry.list_versions(), ["v1", "v2"])
+                self.assertEqual(model_registry.active_version(), "v2")
+                model_registry.set_active("v1")
+                bundle = model_registry.load_bundle()
+                self.assertEqual(bundle.version, "v1")
+                self.assertEqual(bundle.manifest["model_features"], {"rf": FEATURE_SCHEMA})
+                self.assertIn("rf", bundle.ml_models)
+                self.assertIsNotNone(bundle.meta_model)
+            finally:
+                for k, v in saved.items():
+                    setattr(model_registry, k, v)
+
+    def test_04_cli_runs_as_script(self):
+        """L'étape 9 de retrain_all lance ce fichier en script, sans PYTHONPATH."""
+        result = subprocess.run([sys.executable, model_registry.__file__, "list"], capture_output=True, text=True,
+                                env={"PATH": ""}, cwd=tempfile.gettempdir())
+        self.assertEqual(result.returncode, 0, result.stderr[-500:])
+
+
+if __name__ == '__main__':
+    unittest.main()
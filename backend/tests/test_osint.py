@@ -0,0 +1,38 @@
+import unittest
+import sys
+from pathlib import Path
+
+# --- AJOUT DU CHEMIN POUR LES IMPORTS ---
+BASE_DIR = Path(__file__).resolve().parents[3]
+sys.path.append(str(BASE_DIR))
+
+from backend.app.services.osint_services import TokenMatcher, profile_variants, keep_relevant
+
+PROFILE = {'first_name': 'Jean', 'last_name': 'Dupont', 'birth_date': '1998-05-12', 'zip_home': '13008'}
+
+
+def found(password):
+    matcher = TokenMatcher(profile_variants(PROFILE))
+    return [(m['label'], m['form']) for m in keep_relevant(matcher.find(password))]
+
+
+class TestTargetedAttack(unittest.TestCase):
+
+    def test_01_variants(self):
+        """Casse, Leet et inversion des données personnelles."""
+        self.assertEqual(found("JEAN!"), [('Prénom', 'exact')])
+        self.assertEqual(found("j34n"), [('Prénom', 'leet')])
+        self.assertEqual(found("tnopud"), [('Nom', 'inversé')])
+
+    def test_02_dates(self):
+        """La date complète l'emporte sur l'année qu'elle contient."""
+        self.assertEqual(found("x12051998"), [('Date de naissance', 'date')])
+        self.assertEqual(found("1998-05-12"), [('Date de naissance', 'date ISO')])
+        self.assertEqual(found("abc1998"), [('Année de naissance', 'année')])
+
+    def test_03_clean_password(self):
+        self.assertEqual(found("Hk9#mP2$zL"), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
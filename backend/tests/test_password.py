@@ -106,6 +106,15 @@ class TestPasswordAnalysis(unittest.TestCase):
         res_emoji = analyse_password("🔒🔒🔒🔒🔒")
         self.assertIsNotNone(res_emoji['score'])
 
+    def test_07_long_passphrase(self):
+        """
+        Une longue phrase de passe collée ne doit pas faire planter l'analyse (N^L débordait vers 200 caractères).
+        """
+        passphrase = "Correct-Horse-Battery-Staple-42! " * 8
+        res_long = analyse_password(passphrase)
+        self.assertEqual(res_long['details']['crack_time_display'], "Des millions d'années")
+        self.assertIn(res_long['details']['zxcvbn_status'], ("ok", "truncated", "timeout", "unavailable"))
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
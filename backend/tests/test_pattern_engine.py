@@ -0,0 +1,56 @@
+import unittest
+import sys
+from pathlib import Path
+
+# --- AJOUT DU CHEMIN POUR LES IMPORTS ---
+BASE_DIR = Path(__file__).resolve().parents[3]
+sys.path.append(str(BASE_DIR))
+
+from backend.app.utils.pattern_engine import PatternScanner, find_patterns, pattern_features, pattern_features_batch
+
+
+def types_of(password):
+    return [(p['type'], p['token']) for p in find_patterns(password)]
+
+
+class TestPatternEngine(unittest.TestCase):
+
+    def test_01_sequences(self):
+        """Suites de lettres et de chiffres, dans les deux sens et de toute longueur."""
+        self.assertEqual(types_of("abcdef"), [('sequence', 'abcdef')])
+        self.assertEqual(types_of("zyx9876"), [('sequence', 'zyx'), ('sequence', '9876')])
+        self.assertEqual(types_of("12321"), [('sequence', '123'), ('sequence', '321')])
+        self.assertEqual(types_of("a1b2c3"), [])
+
+    def test_02_repeats(self):
+        self.assertEqual(types_of("xaaay"), [('repeat', 'aaa')])
+        self.assertEqual(types_of("aab"), [])
+
+    def test_03_dates_and_years(self):
+        """Une année incluse dans une date n'est signalée qu'une fois (comme date)."""
+        self.assertEqual(types_of("Thomas2024!"), [('year', '2024')])
+        self.assertEqual(types_of("lea12051998"), [('date', '12051998')])
+        self.assertEqual(types_of("1998-05-12"), [('date', '1998-05-12')])
+        self.assertEqual(types_of("12/5/98"), [('date', '12/5/98')])
+        self.assertEqual(types_of("99999999"), [('repeat', '99999999')])
+
+    def test_04_features(self):
+        features = pattern_features("abc2024")
+        self.assertEqual(features['has_sequence'], 1)
+        self.assertEqual(features['has_year'], 1)
+        self.assertAlmostEqual(features['pattern_ratio'], 1.0)
+        self.assertEqual(pattern_features("")['pattern_ratio'], 0.0)
+
+        batch = pattern_features_batch(["abc", "Hk9#mP2$zL"])
+        self.assertEqual(batch['has_sequence'].tolist(), [1, 0])
+
+    def test_05_incremental(self):
+        """Frappe, effacement et correction au milieu : même résultat qu'une analyse complète."""
+        scanner = PatternScanner()
+        for text in ["a", "abc", "abc12", "abc12/05/1998", "abc12/05", "abX12/05/98", "aaaa2024", ""]:
+            scanner.update(text)
+            self.assertEqual(scanner.patterns(), find_patterns(text))
+
+
+if __name__ == '__main__':
+    unittest.main()
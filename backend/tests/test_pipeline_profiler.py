@@ -0,0 +1,87 @@
+import json
+import os
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+# --- AJOUT DU CHEMIN POUR LES IMPORTS ---
+BASE_DIR = Path(__file__).resolve().parents[3]
+sys.path.append(str(BASE_DIR))
+
+from backend.app.utils import pipeline_profiler as pp
+
+
+class TestPipelineProfiler(unittest.TestCase):
+
+    def test_01_nested_substeps(self):
+        """Sous-étapes imbriquées : noms composés, pic Python remonté au parent."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "substeps.jsonl"
+            saved = {k: os.environ.get(k) for k in (pp.PROFILE_FILE_ENV, pp.TRACEMALLOC_ENV)}
+            os.environ[pp.PROFILE_FILE_ENV], os.environ[pp.TRACEMALLOC_ENV] = str(path), "1"
+            try:
+                with pp.substep("outer"):
+                    with pp.substep("alloc"):
+                        data = bytearray(8 * 1024 * 1024)
+                    del data
+            finally:
+                for k, v in saved.items():
+                    os.environ.pop(k, None) if v is None else os.environ.__setitem__(k, v)
+            records = {r["name"]: r for r in map(json.loads, path.read_text().splitlines())}
+        self.assertEqual(set(records), {"outer", "outer/alloc"})
+        self.assertGreaterEqual(records["outer/alloc"]["py_peak_bytes"], 8 * 1024 * 1024)
+        self.assertGreaterEqual(records["outer"]["py_peak_bytes"], records["outer/alloc"]["py_peak_bytes"])
+
+    def test_02_peak_per_substep(self):
+        """Une sous-étape qui suit un gros pic (mémoire rendue) ne se voit pas attribuer ce pic."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "substeps.jsonl"
+            saved = os.environ.get(pp.PROFILE_FILE_ENV)
+            os.environ[pp.PROFILE_FILE_ENV] = str(path)
+            try:
+                with pp.substep("gros"):
+                    data = bytearray(200 * 1024 * 1024)
+                    time.sleep(5 * pp.RSS_SAMPLE_INTERVAL)
+                    del data
+                with pp.substep("petit"):
+                    time.sleep(5 * pp.RSS_SAMPLE_INTERVAL)
+            finally:
+                if saved is None:
+                    os.environ.pop(pp.PROFILE_FILE_ENV)
+                else:
+                    os.environ[pp.PROFILE_FILE_ENV] = saved
+            records = {r["name"]: r for r in map(json.loads, path.read_text().splitlines())}
+        peak_big, peak_small = records["gros"]["peak_rss_sampled_bytes"], records["petit"]["peak_rss_sampled_bytes"]
+        self.assertGreater(peak_big - peak_small, 100 * 1024 * 1024)
+
+    def test_03_stage_subprocess_imports(self):
+        """Un script d'étape lancé hors du dépôt importe backend.app... (PYTHONPATH transmis au sous-processus)."""
+        with tempfile.TemporaryDirectory() as tmp:
+            script = Path(tmp) / "stage.py"
+            script.write_text("from backend.app.utils.pipeline_profiler import substep\n"
+                              "with substep('travail'):\n    sum(range(1000))\n", encoding="utf-8")
+            saved_dir, saved_path = pp.RUNS_DIR, os.environ.pop("PYTHONPATH", None)
+            pp.RUNS_DIR = Path(tmp) / "runs"
+            try:
+                stage = pp.run_stage("fake", script)
+            finally:
+                pp.RUNS_DIR = saved_dir
+                if saved_path is not None:
+                    os.environ["PYTHONPATH"] = saved_path
+        self.assertEqual(stage["returncode"], 0)
+        self.assertEqual([s["name"] for s in stage["substeps"]], ["travail"])
+
+    def test_04_regressions(self):
+        def run(wall, rss):
+            return {"stages": [{"name": "ml", "wall_seconds": wall, "peak_rss_bytes": rss,
+                                "substeps": [{"name": "fit_rf", "wall_seconds": wall / 2, "peak_rss_sampled_bytes": rss}]}]}
+
+        self.assertEqual(pp.compare_runs(run(10, 100), run(10, 100)), [])
+        regressions = pp.compare_runs(run(20, 100), run(10, 100))
+        self.assertEqual({(r[1], r[2]) for r in regressions}, {(None, "wall_seconds"), ("fit_rf", "wall_seconds")})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+# --- AJOUT DU CHEMIN POUR LES IMPORTS ---
+BASE_DIR = Path(__file__).resolve().parents[3]
+sys.path.append(str(BASE_DIR))
+
+from backend.app.services import profiling
+
+
+def hot_loop(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        sum(range(200))
+
+
+def slow_call():
+    hot_loop(0.15)
+    return "ok"
+
+
+class TestProfiling(unittest.TestCase):
+
+    def test_01_disabled(self):
+        """Sans demande ni taux d'échantillonnage : pas de profil, appel direct."""
+        self.assertIsNone(profiling.request_profile(False, "rf"))
+        self.assertEqual(profiling.run(None, slow_call), "ok")
+
+    def test_02_collapsed_and_hot_functions(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            with profiling.SamplingProfiler(interval_ms=1) as profiler:
+                slow_call()
+            path = profiler.dump(profiling.new_profile_id("../rf"), directory=tmp)
+            self.assertEqual(path.parent, Path(tmp))
+            lines = path.read_text(encoding="utf-8").splitlines()
+            self.assertTrue(any("slow_call" in line and "hot_loop" in line for line in lines))
+            self.assertTrue(any("hot_loop" in label for label, _, _ in profiler.hot_functions()))
+            self.assertTrue(path.with_suffix(".txt").exists())
+
+
+if __name__ == '__main__':
+    unittest.main()
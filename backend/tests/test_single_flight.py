@@ -0,0 +1,50 @@
+import asyncio
+import sys
+import threading
+import time
+import unittest
+from pathlib import Path
+
+# --- AJOUT DU CHEMIN POUR LES IMPORTS ---
+BASE_DIR = Path(__file__).resolve().parents[3]
+sys.path.append(str(BASE_DIR))
+
+from backend.app.utils.single_flight import SingleFlight
+
+
+class TestSingleFlight(unittest.TestCase):
+
+    def test_01_coalescing(self):
+        """Cinq requêtes identiques simultanées : un seul calcul, même résultat pour toutes."""
+        flights = SingleFlight()
+        runs = []
+        lock = threading.Lock()
+
+        def slow(x):
+            with lock:
+                runs.append(x)
+            time.sleep(0.05)
+            return x * 2
+
+        async def main():
+            return await asyncio.gather(*[flights.run("k", slow, 21) for _ in range(5)])
+
+        self.assertEqual(asyncio.run(main()), [42] * 5)
+        self.assertEqual(len(runs), 1)
+        self.assertEqual(flights.status(), {"in_flight": 0, "calls": 5, "coalesced": 4})
+
+    def test_02_error_shared(self):
+        flights = SingleFlight()
+
+        def fail():
+            raise ValueError("boom")
+
+        async def main():
+            return await asyncio.gather(flights.run("k", fail), flights.run("k", fail), return_exceptions=True)
+
+        self.assertTrue(all(isinstance(r, ValueError) for r in asyncio.run(main())))
+        self.assertEqual(flights.status()["in_flight"], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+import sys
+import unittest
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
+
+# --- AJOUT DU CHEMIN POUR LES IMPORTS ---
+BASE_DIR = Path(__file__).resolve().parents[3]
+sys.path.append(str(BASE_DIR))
+
+from backend.app.utils.sketches import HeavyHitters, HyperLogLog, PasswordHistograms
+
+
+class TestSketches(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.values = np.array([f"pw{x}" for x in rng.zipf(1.3, 200_000)], dtype=object)
+        self.exact = Counter(self.values)
+
+    def feed(self, sketch):
+        for i in range(0, len(self.values), 50_000):
+            sketch.add(self.values[i:i + 50_000])
+        return sketch
+
+    def test_01_distinct_count(self):
+        """HyperLogLog : erreur relative de quelques % sur les distincts, morceau par morceau."""
+        estimate = self.feed(HyperLogLog()).count()
+        self.assertLess(abs(estimate - len(self.exact)) / len(self.exact), 0.03)
+
+    def test_02_heavy_hitters(self):
+        """Top-k : mêmes mots de passe que le comptage exact, fréquences jamais sous-estimées."""
+        top = self.feed(HeavyHitters(k=5)).top()
+        self.assertEqual([v for v, _ in top], [v for v, _ in self.exact.most_common(5)])
+        self.assertTrue(all(count >= self.exact[v] for v, count in top))
+
+    def test_03_histograms(self):
+        hist = PasswordHistograms()
+        hist.add(["abc", "Abc1!", "12345678"])
+        self.assertEqual(hist.lengths[3], 1)
+        self.assertEqual(hist.lengths[8], 1)
+        self.assertEqual(list(hist.n_classes), [0, 2, 0, 0, 1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+import string
+import sys
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+# --- AJOUT DU CHEMIN POUR LES IMPORTS ---
+BASE_DIR = Path(__file__).resolve().parents[3]
+sys.path.append(str(BASE_DIR))
+
+from backend.app.utils.strong_generator import (
+    ALPHABETS, SEPARATORS, UrandomStream, _draw_from_alphabet, generate_batch, generate_strong_passwords_bulk,
+    has_required_classes, uniform_ints
+)
+
+WORDS = ["alpha", "bravo", "charlie", "delta", "echo", "foxtrot", "golf", "hotel", "india", "juliett", "kilo"]
+
+
+def is_diceware(pwd, words=WORDS):
+    """5 à 7 mots de la liste joints par un séparateur (découpe gloutonne sans séparateur : aucun mot n'en préfixe un autre)."""
+    for sep in SEPARATORS:
+        if sep:
+            parts = pwd.split(sep)
+        else:
+            parts, rest = [], pwd
+            while rest and (word := next((w for w in words if rest.startswith(w)), None)):
+                parts.append(word)
+                rest = rest[len(word):]
+            if rest:
+                continue
+        if 5 <= len(parts) <= 7 and set(parts) <= set(words):
+            return True
+    return False
+
+
+class FixedStream:
+    """Flux d'octets imposés (puis une graine fixe) : rend le rejet observable et les tests reproductibles."""
+
+    def __init__(self, prefix=b"", seed=0):
+        self.buffer = bytes(prefix)
+        self.rng = np.random.default_rng(seed)
+
+    def take(self, n):
+        if len(self.buffer) < n:
+            self.buffer += self.rng.bytes(n - len(self.buffer))
+        out, self.buffer = self.buffer[:n], self.buffer[n:]
+        return np.frombuffer(out, dtype=np.uint8)
+
+
+class TestStrongGenerator(unittest.TestCase):
+
+    def test_01_range(self):
+        """Entiers toujours dans [0, m), sur un octet comme sur quatre."""
+        stream = UrandomStream(block_size=4096)
+        for m in (1, 2, 3, 10, 94, 255, 256, 257, 1000, 70_000):
+            values = uniform_ints(stream, m, 5000)
+            self.assertEqual(len(values), 5000)
+            self.assertGreaterEqual(values.min(), 0)
+            self.assertLess(values.max(), m)
+        self.assertEqual(len(uniform_ints(stream, 10, 0)), 0)
+
+    def test_02_rejection_bound(self):
+        """m = 10 sur un octet : 250..255 (au-delà du plus grand multiple de 10) sont rejetés, 249 est gardé."""
+        stream = FixedStream(bytes([255, 250, 249, 0, 253, 9, 10]))
+        self.assertEqual(uniform_ints(stream, 10, 4).tolist(), [9, 0, 9, 0])
+
+        # m = 300 sur quatre octets : limite = 2**32 - 2**32 % 300 = 4294967100
+        limit = 2**32 - 2**32 % 300
+        raw = np.array([2**32 - 1, limit, limit - 1, 299, 300], dtype="<u4").tobytes()
+        stream = FixedStream(raw)
+        self.assertEqual(uniform_ints(stream, 300, 3).tolist(), [(limit - 1) % 300, 299, 0])
+
+    def test_03_required_classes(self):
+        """Chaque alphabet : caractères de l'alphabet seulement, et au moins un de chaque classe qu'il contient."""
+        stream = FixedStream(seed=1)
+        lengths = np.full(5000, 4)  # Longueur minimale : le rejet est fréquent
+        for a, alphabet in enumerate(ALPHABETS):
+            passwords = _draw_from_alphabet(stream, a, lengths)
+            self.assertEqual(len(passwords), len(lengths))
+            for pwd in passwords:
+                self.assertEqual(len(pwd), 4)
+                self.assertLessEqual(set(pwd), set(alphabet))
+                self.assertTrue(has_required_classes(pwd, alphabet), (alphabet, pwd))
+
+        # Génération complète : aléatoires conformes, Diceware construits depuis la liste de mots
+        passwords = generate_strong_passwords_bulk(20_000, WORDS, workers=1, batch_size=5000)
+        self.assertEqual(len(passwords), 20_000)
+        for pwd in passwords:
+            if is_diceware(pwd):
+                continue
+            self.assertTrue(14 <= len(pwd) <= 32, pwd)
+            self.assertTrue(any(set(pwd) <= set(a) and has_required_classes(pwd, a) for a in ALPHABETS), pwd)
+
+    def test_04_chi_squared(self):
+        """χ² grossier : tirages uniformes (m non puissance de deux) sous le seuil à p = 0.001."""
+        stream = FixedStream(seed=42)
+        for m, critical in ((10, 27.88), (94, 140.89), (300, 380.30)):
+            n = 300_000
+            counts = np.bincount(uniform_ints(stream, m, n), minlength=m)
+            expected = n / m
+            chi2 = ((counts - expected) ** 2 / expected).sum()
+            self.assertLess(chi2, critical, f"m={m}")
+
+    def test_05_min_len(self):
+        with self.assertRaises(ValueError):
+            generate_batch(10, WORDS, min_len=3, max_len=5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+import sys
+import time
+from pathlib import Path
+
+# --- AJOUT DU CHEMIN POUR LES IMPORTS ---
+BASE_DIR = Path(__file__).resolve().parents[3]
+sys.path.append(str(BASE_DIR))
+
+from backend.app.services import zxcvbn_guard
+
+
+def slow_zxcvbn(pwd):
+    """zxcvbn factice : le temps de calcul dépend de la longueur évaluée."""
+    time.sleep(0.002 * len(pwd))
+    return {'score': min(len(pwd) // 4, 4), 'crack_times_display': {'offline_slow_hashing_1e4_per_second': f"{len(pwd)}"}}
+
+
+class TestZxcvbnGuard(unittest.TestCase):
+
+    def setUp(self):
+        self.saved = (zxcvbn_guard.zxcvbn, zxcvbn_guard.HAS_ZXCVBN, zxcvbn_guard.cache)
+        zxcvbn_guard.zxcvbn, zxcvbn_guard.HAS_ZXCVBN = slow_zxcvbn, True
+        zxcvbn_guard.cache = zxcvbn_guard.ResultCache(size=8)
+
+    def tearDown(self):
+        zxcvbn_guard.zxcvbn, zxcvbn_guard.HAS_ZXCVBN, zxcvbn_guard.cache = self.saved
+
+    def test_01_truncation_and_cache(self):
+        """Une passphrase trop longue est évaluée sur son début, puis servie par le cache."""
+        long_pwd = "x" * (zxcvbn_guard.ZXCVBN_MAX_LENGTH + 100)
+        first = zxcvbn_guard.evaluate(long_pwd, budget_ms=0)
+        self.assertEqual(first["zxcvbn_status"], zxcvbn_guard.STATUS_TRUNCATED)
+        self.assertEqual(first["zxcvbn_time"], str(zxcvbn_guard.ZXCVBN_MAX_LENGTH))
+        self.assertEqual(zxcvbn_guard.evaluate(long_pwd, budget_ms=0), first)
+        self.assertEqual(zxcvbn_guard.cache.status()["hits"], 1)
+
+    def test_02_budget(self):
+        """Budget dépassé : résultat dégradé, puis le calcul terminé alimente le cache."""
+        pwd = "a" * 40
+        result = zxcvbn_guard.evaluate(pwd, budget_ms=5)
+        self.assertEqual(result["zxcvbn_status"], zxcvbn_guard.STATUS_TIMEOUT)
+        self.assertIsNone(result["zxcvbn_score"])
+        time.sleep(0.2)
+        self.assertEqual(zxcvbn_guard.evaluate(pwd, budget_ms=5)["zxcvbn_status"], zxcvbn_guard.STATUS_OK)
+
+    def test_03_skip(self):
+        result = zxcvbn_guard.evaluate("azerty", enabled=False)
+        self.assertEqual(result, {"zxcvbn_score": None, "zxcvbn_time": None,
+                                  "zxcvbn_status": zxcvbn_guard.STATUS_SKIPPED})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -13,6 +13,9 @@ document.addEventListener('DOMContentLoaded', () => {
     const btn = document.getElementById('sendBtn');
     const wrapper = document.getElementById('homeInputWrapper');
     const resultSolo = document.getElementById('resultSolo');
+    const liveMeter = document.getElementById('liveMeter');
+    const liveFill = document.getElementById('liveFill');
+    const liveText = document.getElementById('liveText');
 
     // Targeted Attack
     const targetInput = document.getElementById('target-pwd-input');
@@ -152,6 +155,94 @@ document.addEventListener('DOMContentLoaded', () => {
         }
     }
 
+    // Duels : un seul appel pour tous les mots de passe et modèles (calcul commun fait une fois côté serveur)
+    async function fetchComparison(passwords, models) {
+        try {
+            const response = await fetch("http://127.0.0.1:8000/compare", {
+                method: "POST",
+                headers: { 'Content-Type': "application/json" },
+                body: JSON.stringify({ passwords: passwords, model_types: models })
+            });
+            const data = await response.json();
+            console.log("🔍 Résultat API (Comparaison) :", data);
+            return data.results || null;
+        } catch (err) {
+            console.error('Erreur API:', err);
+            return null;
+        }
+    }
+
+    // Résultat d'un modèle de /compare au format de /test-password (pour renderCard)
+    function comparisonCard(result, model) {
+        if (!result || !result.models[model]) return null;
+        const m = result.models[model];
+        return {
+            password: result.password,
+            score: m.score,
+            is_strong: m.is_strong,
+            model_used: model,
+            model_version: result.model_version,
+            details: { ...result.details, ai_probability: m.ai_probability },
+            feedback: m.feedback
+        };
+    }
+
+    async function fetchTargetedAnalysis(password, profile, model) {
+        try {
+            const response = await fetch("http://127.0.0.1:8000/targeted-attack", {
+                method: "POST",
+                headers: { 'Content-Type': "application/json" },
+                body: JSON.stringify({ profile: profile, password: password, model_type: model })
+            });
+            const data = await response.json();
+            console.log("🔍 Résultat API (Attaque ciblée) :", data);
+            return data.results ? data.results[0] : null;
+        } catch (err) {
+            console.error('Erreur API:', err);
+            return null;
+        }
+    }
+
+    // Score en direct : le serveur garde l'état de la saisie, fusionne les rafales
+    // et ne lance le modèle que sur la saisie stabilisée
+    let liveSocket = null;
+    let liveSeq = 0;
+
+    function connectLiveScore() {
+        liveSocket = new WebSocket("ws://127.0.0.1:8000/ws/live-score");
+        liveSocket.onmessage = (event) => {
+            const msg = JSON.parse(event.data);
+            if (msg.seq < liveSeq) return; // Réponse à une saisie déjà dépassée
+            renderLiveMeter(msg);
+        };
+        liveSocket.onclose = () => { liveSocket = null; };
+    }
+
+    function sendLiveScore(value) {
+        if (!liveSocket) connectLiveScore();
+        liveSeq += 1;
+        const payload = JSON.stringify({ value: value, seq: liveSeq, model_type: modelSelect ? modelSelect.value : 'rf' });
+        if (liveSocket.readyState === WebSocket.OPEN) liveSocket.send(payload);
+        else liveSocket.addEventListener('open', () => liveSocket.send(payload), { once: true });
+    }
+
+    function renderLiveMeter(msg) {
+        if (!liveMeter || !input.value) return;
+        liveMeter.classList.remove('hidden');
+        if (msg.type === 'instant') {
+            // Avant le modèle : entropie seule
+            liveFill.style.width = `${Math.min(msg.entropy_bits, 100)}%`;
+            liveFill.style.backgroundColor = '#ffc107';
+            liveText.textContent = `${msg.entropy_bits} bits · ${msg.crack_time_display}` +
+                (msg.feedback.length ? ` · ${msg.feedback.join(', ')}` : '');
+        } else if (msg.type === 'score') {
+            const color = msg.score >= 60 ? '#00e676' : (msg.score >= 40 ? '#ffc107' : '#ff4d4d');
+            liveFill.style.width = `${msg.score}%`;
+            liveFill.style.backgroundColor = color;
+            liveText.textContent = `IA ${msg.score}/100` + (msg.feedback.length ? ` · ${msg.feedback[0]}` : '');
+        }
+    }
+
     // --- ANALYSE HOME ---
     async function runHomeAnalysis(password) {
         const selectedModel = modelSelect ? modelSelect.value : 'rf';
@@ -183,6 +274,8 @@ document.addEventListener('DOMContentLoaded', () => {
         input.addEventListener('input', () => {
             if (input.value.trim().length > 0) btn.classList.add('visible');
             else btn.classList.remove('visible');
+            if (input.value) sendLiveScore(input.value);
+            else if (liveMeter) liveMeter.classList.add('hidden');
         });
 
         input.addEventListener('keydown', (e) => {
@@ -203,6 +296,7 @@ document.addEventListener('DOMContentLoaded', () => {
             if (wrapper) wrapper.classList.add('moved-up');
             input.value = "";
             btn.classList.remove('visible');
+            if (liveMeter) liveMeter.classList.add('hidden');
             input.blur();
 
             // Appel de la fonction centrale
@@ -225,10 +319,9 @@ document.addEventListener('DOMContentLoaded', () => {
             dpResult1.classList.remove('hidden'); dpResult1.innerHTML = 'Calcul...';
             dpResult2.classList.remove('hidden'); dpResult2.innerHTML = 'Calcul...';
 
-            const [d1, d2] = await Promise.all([
-                fetchAnalysis(p1, model),
-                fetchAnalysis(p2, model)
-            ]);
+            const results = await fetchComparison([p1, p2], [model]);
+            const d1 = comparisonCard(results && results[0], model);
+            const d2 = comparisonCard(results && results[1], model);
 
             renderCard(dpResult1, d1, true); // true = mini
             renderCard(dpResult2, d2, true);
@@ -254,10 +347,9 @@ document.addEventListener('DOMContentLoaded', () => {
             diaResult1.classList.remove('hidden'); diaResult1.innerHTML = 'Calcul...';
             diaResult2.classList.remove('hidden'); diaResult2.innerHTML = 'Calcul...';
 
-            const [d1, d2] = await Promise.all([
-                fetchAnalysis(pwd, m1),
-                fetchAnalysis(pwd, m2)
-            ]);
+            const results = await fetchComparison([pwd], [m1, m2]);
+            const d1 = comparisonCard(results && results[0], m1);
+            const d2 = comparisonCard(results && results[0], m2);
 
             renderCard(diaResult1, d1, true);
             renderCard(diaResult2, d2, true);
@@ -287,52 +379,19 @@ document.addEventListener('DOMContentLoaded', () => {
             targetResult.innerHTML = '<div class="text-center text-danger-custom"><i class="fa-solid fa-radar fa-spin"></i> Simulation d\'attaque ciblée...</div>';
 
             const model = modelSelect ? modelSelect.value : 'rf';
-            let data = await fetchAnalysis(pwd, model);
+            // Profil de la victime : la recherche des variantes (Leet, inversé, formats de date) est faite par l'API
+            const profile = {
+                first_name: pFirst.value.trim() || null,
+                last_name: pLast.value.trim() || null,
+                birth_date: pDate.value || null,
+                keyword: pWord.value.trim() || null,
+                zip_birth: pZipBirth.value.trim() || null,
+                zip_home: pZipHome.value.trim() || null
+            };
+            const data = await fetchTargetedAnalysis(pwd, profile, model);
 
             if (!data) { targetResult.innerHTML = "Erreur API"; return; }
-
-            let compromised = [];
-            const checkList = [
-                { val: pFirst.value.trim(), name: "Prénom" },
-                { val: pLast.value.trim(), name: "Nom" },
-                { val: pWord.value.trim(), name: "Mot-clé" },
-                { val: pZipBirth.value.trim(), name: "CP Naissance" },
-                { val: pZipHome.value.trim(), name: "CP Domicile" }
-            ];
-
-            checkList.forEach(item => {
-                if (item.val && item.val.length >= 2) {
-                    const valLower = item.val.toLowerCase();
-                    const pwdLower = pwd.toLowerCase();
-                    if (pwdLower.includes(valLower)) compromised.push(item.name + " (" + item.val + ")");
-
-                    if (item.name.startsWith("CP")) {
-                        const dept = item.val.substring(0, 2);
-                        if (pwd.includes(dept) && !pwdLower.includes(valLower)) {
-                            const deptName = item.name.replace("CP ", "");
-                            compromised.push(`Département ${deptName} (${dept})`);
-                        }
-                    }
-                }
-            });
-
-            if (pDate.value) {
-                const dateObj = new Date(pDate.value);
-                const year = dateObj.getFullYear().toString();
-                const shortYear = year.slice(-2);
-                const day = String(dateObj.getDate()).padStart(2, '0');
-                const month = String(dateObj.getMonth() + 1).padStart(2, '0');
-                if (pwd.includes(year)) compromised.push(`Année (${year})`);
-                else if (pwd.includes(shortYear)) compromised.push(`Année courte (${shortYear})`);
-                if (pwd.includes(day + month)) compromised.push(`Anniversaire (${day}${month})`);
-            }
-
-            if (compromised.length > 0) {
-                data.score = 0; data.is_strong = false;
-                const alertMsg = `<b>🚨 DANGER CRITIQUE :</b> Ingénierie Sociale détectée !<br>Éléments trouvés : ${compromised.join(", ")}.`;
-                data.feedback.unshift(alertMsg);
-            }
-            renderCard(targetResult, data, false, compromised.length > 0);
+            renderCard(targetResult, data, false, data.osint.compromised);
         });
     }
 